@@ -0,0 +1,38 @@
+"""provider event stats columns
+
+Revision ID: 20261019_0003
+Revises: 20261019_0002
+Create Date: 2026-10-19 12:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0003"
+down_revision = "20261019_0002"
+branch_labels = None
+depends_on = None
+
+INTEGER_COLUMNS = ("attempts", "successes", "failures", "retries", "short_circuited", "timeouts", "payload_bytes")
+FLOAT_COLUMNS = ("latency_p50_ms", "latency_p95_ms", "latency_p99_ms", "rate_limit_wait_p95_ms")
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("provider_event") as batch:
+        for name in INTEGER_COLUMNS:
+            batch.add_column(sa.Column(name, sa.Integer(), nullable=True))
+        for name in FLOAT_COLUMNS:
+            batch.add_column(sa.Column(name, sa.Float(), nullable=True))
+        batch.add_column(sa.Column("last_error", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("provider_event") as batch:
+        batch.drop_column("last_error")
+        for name in reversed(FLOAT_COLUMNS):
+            batch.drop_column(name)
+        for name in reversed(INTEGER_COLUMNS):
+            batch.drop_column(name)
@@ -0,0 +1,35 @@
+"""job stage timings
+
+Revision ID: 20261019_0004
+Revises: 20261019_0003
+Create Date: 2026-10-19 15:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0004"
+down_revision = "20261019_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_stage",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_run_id", sa.Integer(), sa.ForeignKey("job_run.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("duration_ms", sa.Float(), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("offset_ms", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_job_stage_job_run_id", "job_stage", ["job_run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_stage_job_run_id", table_name="job_stage")
+    op.drop_table("job_stage")
@@ -1,50 +1,340 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+import heapq
+import logging
 import os
-from threading import Lock
-from typing import Any
+import sys
+from threading import Event, Lock, Thread
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping
 
+from app.core.metrics import HistogramFamily, ShardedCounter
+from app.core.settings import CACHE_MAX_SERIES_BYTES, CACHE_MAX_SERIES_ENTRIES, CACHE_MAX_SUMMARY_ENTRIES
+
+if TYPE_CHECKING:
+    from app.core.l2_cache import L2SnapshotCache
+
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_TTL_SECONDS = 60
 DEFAULT_STALE_THRESHOLD_SECONDS = 600
+DEFAULT_JANITOR_INTERVAL_SECONDS = 30
+MODULES = ("commodities", "mag7", "inflation")
+SUMMARY_NAMESPACE = "summary"
+CACHE_EVENTS = ("hits", "misses", "stale_serves", "l2_fills", "sets", "evictions", "expired")
+MAX_PENDING_FILLS = 1024
 
 
-@dataclass
+@dataclass(frozen=True)
 class CacheEntry:
     value: Any
     expires_at: datetime
     fetched_at: datetime
+    restored: bool = False
+    size_bytes: int = 0
+
+
+@dataclass(frozen=True)
+class NamespaceQuota:
+    max_entries: int | None = None
+    max_bytes: int | None = None
+
+    def allows(self, count: int, total_bytes: int) -> bool:
+        return (self.max_entries is None or count <= self.max_entries) and (
+            self.max_bytes is None or total_bytes <= self.max_bytes
+        )
+
+
+@dataclass
+class _NamespaceUsage:
+    """Entry sizes of one namespace, kept in step with the published generation by the writers.
+
+    `eviction_order` is a heap of (unexpired, last read, key) rows. Rows go stale when a key is read,
+    replaced or removed; they are re-checked when popped, and the heap is rebuilt once it runs dry or
+    holds mostly stale rows.
+    """
+
+    sizes: dict[str, int] = field(default_factory=dict)
+    total_bytes: int = 0
+    eviction_order: list[tuple[bool, float, str]] = field(default_factory=list)
+
+    def add(self, key: str, size_bytes: int) -> None:
+        self.total_bytes += size_bytes - self.sizes.get(key, 0)
+        self.sizes[key] = size_bytes
+
+    def discard(self, key: str) -> None:
+        self.total_bytes -= self.sizes.pop(key, 0)
+
+
+def namespace_for(key: str) -> str:
+    """`series:brent:1m` -> `series`; un-prefixed keys such as `mag7_summary` share one namespace."""
+    prefix, separator, _rest = key.partition(":")
+    return prefix if separator else SUMMARY_NAMESPACE
+
+
+def approximate_size(value: Any) -> int:
+    """Rough retained size: the container plus each item and its attribute values, one level deep."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            size += sys.getsizeof(item)
+            attributes = getattr(item, "__dict__", None)
+            if attributes:
+                size += sys.getsizeof(attributes) + sum(sys.getsizeof(field) for field in attributes.values())
+    return size
+
+
+def _default_quotas() -> dict[str, NamespaceQuota]:
+    return {SUMMARY_NAMESPACE: NamespaceQuota(max_entries=CACHE_MAX_SUMMARY_ENTRIES)}
+
+
+def _default_namespace_quota() -> NamespaceQuota:
+    return NamespaceQuota(max_entries=CACHE_MAX_SERIES_ENTRIES, max_bytes=CACHE_MAX_SERIES_BYTES)
+
+
+@dataclass(frozen=True)
+class CacheGeneration:
+    """Immutable view of the whole cache. Writers publish a new generation; readers never lock."""
+
+    number: int
+    entries: Mapping[str, CacheEntry]
+    last_update: datetime | None
+    last_success_by_module: Mapping[str, datetime | None] = field(
+        default_factory=lambda: MappingProxyType({module: None for module in MODULES})
+    )
+
+
+def _later(current: datetime | None, candidate: datetime | None) -> datetime | None:
+    if candidate is None:
+        return current
+    if current is None or candidate > current:
+        return candidate
+    return current
 
 
 class InMemoryTTLCache:
+    """TTL cache built from copy-on-write generations.
+
+    Reads are a single attribute load of the current generation, so they scale with cores and never
+    wait for the scheduler. Writes copy the (small) entry map under a writer-only lock. Expired
+    entries are never returned and are physically dropped by the janitor thread.
+
+    Each key namespace has its own entry/byte quota. When an insert pushes a namespace over quota,
+    expired entries and then the least recently read entries of that same namespace are evicted, so
+    series traffic can never push out module summaries.
+    """
+
     def __init__(
         self,
         ttl_seconds: int = DEFAULT_TTL_SECONDS,
         stale_threshold_seconds: int = DEFAULT_STALE_THRESHOLD_SECONDS,
+        quotas: dict[str, NamespaceQuota] | None = None,
+        default_quota: NamespaceQuota | None = None,
     ) -> None:
         self.ttl_seconds = ttl_seconds
         self.stale_threshold_seconds = stale_threshold_seconds
-        self._store: dict[str, CacheEntry] = {}
-        self._last_update: datetime | None = None
-        self._last_success_by_module: dict[str, datetime | None] = {
-            "commodities": None,
-            "mag7": None,
-            "inflation": None,
-        }
-        self._lock = Lock()
+        self.quotas = quotas if quotas is not None else _default_quotas()
+        self.default_quota = default_quota if default_quota is not None else _default_namespace_quota()
+        # Last-read times feed the LRU choice. Readers update them without a lock; a lost update
+        # only makes the eviction order slightly less exact.
+        self._last_access: dict[str, float] = {}
+        # (namespace, event) counters; sharded per thread so the read path stays lock-free.
+        self._events = ShardedCounter()
+        self._fill_latency = HistogramFamily()
+        self._miss_started: OrderedDict[str, float] = OrderedDict()
+        # Per-namespace sizes so a write checks its quota without scanning every entry.
+        self._usage: dict[str, _NamespaceUsage] = {}
+        self._generation = CacheGeneration(number=0, entries=MappingProxyType({}), last_update=None)
+        self._write_lock = Lock()
+        self._l2: L2SnapshotCache | None = None
+        self._janitor: Thread | None = None
+        self._janitor_stop = Event()
+        self._janitor_runs = 0
+        self._janitor_purged = 0
+
+    def generation(self) -> CacheGeneration:
+        return self._generation
+
+    def _publish(
+        self,
+        entries: dict[str, CacheEntry],
+        last_update: datetime | None,
+        last_success_by_module: dict[str, datetime | None],
+    ) -> None:
+        # Callers hold _write_lock. The assignment is the only point where readers see the change.
+        self._generation = CacheGeneration(
+            number=self._generation.number + 1,
+            entries=MappingProxyType(entries),
+            last_update=last_update,
+            last_success_by_module=MappingProxyType(last_success_by_module),
+        )
+
+    def attach_l2(self, l2: L2SnapshotCache | None) -> None:
+        """Fall back to a shared snapshot file on local misses (see app.core.l2_cache)."""
+        self._l2 = l2
 
     def get(self, key: str) -> CacheEntry | None:
         now = datetime.now(timezone.utc)
-        with self._lock:
-            entry = self._store.get(key)
-            if entry is None:
-                return None
-            if entry.expires_at <= now:
-                self._store.pop(key, None)
-                return None
-            return entry
+        generation = self._generation
+        namespace = namespace_for(key)
+        entry = generation.entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            entry = None
+        if entry is not None:
+            self._last_access[key] = time.monotonic()
+            if key not in self._generation.entries:
+                # A writer dropped the key after this reader loaded its generation; do not bring the
+                # access time back. A read racing the drop itself is left for the janitor.
+                self._last_access.pop(key, None)
+        elif self._l2 is not None:
+            entry = self._fill_from_l2(key, now)
+            if entry is not None:
+                self._events.inc((namespace, "l2_fills"))
+
+        if entry is None:
+            self._events.inc((namespace, "misses"))
+            if key not in self._miss_started:
+                self._miss_started[key] = time.perf_counter()
+                if len(self._miss_started) > MAX_PENDING_FILLS:
+                    # Misses that never fill (unknown keys, abandoned requests) age out oldest first
+                    # instead of crowding out tracking for new ones.
+                    try:
+                        self._miss_started.popitem(last=False)
+                    except KeyError:  # emptied by a concurrent clear()
+                        pass
+            return None
+        self._events.inc((namespace, "hits"))
+        if entry.restored or self._is_stale(generation, now):
+            self._events.inc((namespace, "stale_serves"))
+        return entry
+
+    def _fill_from_l2(self, key: str, now: datetime) -> CacheEntry | None:
+        snapshot = self._l2.current()
+        if snapshot is None or key not in snapshot:
+            return None
+        shared = snapshot.get(key)
+        expires_at = shared.fetched_at + timedelta(seconds=self.ttl_seconds)
+        if expires_at <= now:
+            return None
+        entry = CacheEntry(
+            value=shared.value,
+            expires_at=expires_at,
+            fetched_at=shared.fetched_at,
+            size_bytes=approximate_size(shared.value),
+        )
+        with self._write_lock:
+            current = self._generation
+            existing = current.entries.get(key)
+            if existing is not None and existing.fetched_at >= entry.fetched_at:
+                return existing
+            last_success = dict(current.last_success_by_module)
+            for module, value in snapshot.last_success_by_module.items():
+                last_success[module] = _later(last_success.get(module), value)
+            self._publish(
+                self._insert(current.entries, {key: entry}, now),
+                _later(current.last_update, snapshot.last_update),
+                last_success,
+            )
+        return entry
+
+    def quota_for(self, namespace: str) -> NamespaceQuota:
+        return self.quotas.get(namespace, self.default_quota)
+
+    def _insert(
+        self,
+        current: Mapping[str, CacheEntry],
+        added: Mapping[str, CacheEntry],
+        now: datetime,
+    ) -> dict[str, CacheEntry]:
+        # Callers hold _write_lock. Returns the new entry map with every touched namespace back under quota.
+        entries = {**current, **added}
+        touched = time.monotonic()
+        namespaces: set[str] = set()
+        for key, entry in added.items():
+            self._last_access[key] = touched
+            namespace = namespace_for(key)
+            usage = self._usage.setdefault(namespace, _NamespaceUsage())
+            usage.add(key, entry.size_bytes)
+            if usage.eviction_order:
+                heapq.heappush(usage.eviction_order, (True, touched, key))
+            namespaces.add(namespace)
+        for namespace in namespaces:
+            self._evict_over_quota(entries, namespace, added, now)
+        return entries
+
+    def _evict_over_quota(
+        self,
+        entries: dict[str, CacheEntry],
+        namespace: str,
+        added: Mapping[str, CacheEntry],
+        now: datetime,
+    ) -> None:
+        # Callers hold _write_lock.
+        quota = self.quota_for(namespace)
+        usage = self._usage[namespace]
+        if quota.allows(len(usage.sizes), usage.total_bytes):
+            return
+
+        # Expired entries go first, then least recently read. The entries being inserted are kept
+        # even if they alone exceed the byte quota; the caller asked for them.
+        heap = usage.eviction_order
+        if len(heap) > 2 * len(usage.sizes):
+            heap.clear()
+        evicted = 0
+        rebuilt = False
+        kept: list[tuple[bool, float, str]] = []
+        while not quota.allows(len(usage.sizes), usage.total_bytes):
+            if not heap:
+                if rebuilt:
+                    break
+                heap.extend(self._eviction_row(entries, name, now) for name in usage.sizes if name not in added)
+                heapq.heapify(heap)
+                rebuilt = True
+                continue
+            row = heapq.heappop(heap)
+            name = row[2]
+            if name not in usage.sizes:
+                continue
+            if name in added:
+                kept.append(row)
+                continue
+            current = self._eviction_row(entries, name, now)
+            if current != row:
+                heapq.heappush(heap, current)
+                continue
+            del entries[name]
+            usage.discard(name)
+            self._last_access.pop(name, None)
+            evicted += 1
+        for row in kept:
+            heapq.heappush(heap, row)
+        if evicted:
+            self._events.inc((namespace, "evictions"), evicted)
+
+    def _eviction_row(self, entries: Mapping[str, CacheEntry], name: str, now: datetime) -> tuple[bool, float, str]:
+        return entries[name].expires_at > now, self._last_access.get(name, 0.0), name
+
+    def entries(self) -> dict[str, CacheEntry]:
+        now = datetime.now(timezone.utc)
+        return {key: entry for key, entry in self._generation.entries.items() if entry.expires_at > now}
+
+    def _entry(self, value: Any, fetch_time: datetime, restored: bool, ttl_from_now: bool) -> CacheEntry:
+        # Restored entries keep their original fetched_at but get a full TTL from now, so they are
+        # served (with an honest age) until the scheduler replaces them. Followers loading the
+        # leader's rows use the same rule via ttl_from_now.
+        expires_from = datetime.now(timezone.utc) if restored or ttl_from_now else fetch_time
+        return CacheEntry(
+            value=value,
+            fetched_at=fetch_time,
+            expires_at=expires_from + timedelta(seconds=self.ttl_seconds),
+            restored=restored,
+            size_bytes=approximate_size(value),
+        )
 
     def set(
         self,
@@ -53,54 +343,198 @@ class InMemoryTTLCache:
         fetched_at: datetime | None = None,
         update_last_update: bool = True,
         module: str | None = None,
+        restored: bool = False,
+        ttl_from_now: bool = False,
     ) -> CacheEntry:
         fetch_time = fetched_at or datetime.now(timezone.utc)
-        entry = CacheEntry(
-            value=value,
-            fetched_at=fetch_time,
-            expires_at=fetch_time + timedelta(seconds=self.ttl_seconds),
-        )
-        with self._lock:
-            self._store[key] = entry
-            if update_last_update:
-                self._last_update = fetch_time
-                if module in self._last_success_by_module:
-                    self._last_success_by_module[module] = fetch_time
+        entry = self._entry(value, fetch_time, restored, ttl_from_now)
+        self._store({key: entry}, fetch_time, update_last_update, module)
         return entry
 
-    def stats(self) -> dict[str, int]:
+    def set_many(
+        self,
+        values: Mapping[str, Any],
+        fetched_at: datetime | None = None,
+        update_last_update: bool = True,
+        module: str | None = None,
+    ) -> dict[str, CacheEntry]:
+        """Like set() for several keys at once, published as a single generation."""
+        fetch_time = fetched_at or datetime.now(timezone.utc)
+        added = {key: self._entry(value, fetch_time, False, False) for key, value in values.items()}
+        if added:
+            self._store(added, fetch_time, update_last_update, module)
+        return added
+
+    def _store(
+        self,
+        added: dict[str, CacheEntry],
+        fetch_time: datetime,
+        update_last_update: bool,
+        module: str | None,
+    ) -> None:
+        with self._write_lock:
+            current = self._generation
+            last_update = current.last_update
+            last_success = dict(current.last_success_by_module)
+            if update_last_update:
+                last_update = _later(last_update, fetch_time)
+                if module in last_success:
+                    last_success[module] = _later(last_success[module], fetch_time)
+            self._publish(
+                self._insert(current.entries, added, datetime.now(timezone.utc)),
+                last_update,
+                last_success,
+            )
+        finished = time.perf_counter()
+        for key in added:
+            namespace = namespace_for(key)
+            self._events.inc((namespace, "sets"))
+            miss_started = self._miss_started.pop(key, None)
+            if miss_started is not None:
+                self._fill_latency.labels(namespace).observe(finished - miss_started)
+
+    def _remove(self, keys: list[str]) -> int:
+        # Callers hold _write_lock.
+        if not keys:
+            return 0
+        current = self._generation
+        dropped = set(keys)
+        remaining = {key: entry for key, entry in current.entries.items() if key not in dropped}
+        for key in dropped:
+            self._last_access.pop(key, None)
+            usage = self._usage.get(namespace_for(key))
+            if usage is not None:
+                usage.discard(key)
+        self._publish(remaining, current.last_update, dict(current.last_success_by_module))
+        return len(keys)
+
+    def delete(self, key: str) -> bool:
+        with self._write_lock:
+            return self._remove([key] if key in self._generation.entries else []) == 1
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._write_lock:
+            return self._remove([key for key in self._generation.entries if key.startswith(prefix)])
+
+    def purge_expired(self) -> int:
+        now = datetime.now(timezone.utc)
+        with self._write_lock:
+            expired = [key for key, entry in self._generation.entries.items() if entry.expires_at <= now]
+            purged = self._remove(expired)
+            for key in expired:
+                self._events.inc((namespace_for(key), "expired"))
+            live = self._generation.entries
+            # list() copies in one step; readers may add keys concurrently.
+            for key in [key for key in list(self._last_access) if key not in live]:
+                self._last_access.pop(key, None)
+            self._janitor_runs += 1
+            self._janitor_purged += purged
+        return purged
+
+    def start_janitor(self, interval_seconds: float = DEFAULT_JANITOR_INTERVAL_SECONDS) -> None:
+        if self._janitor is not None and self._janitor.is_alive():
+            return
+        self._janitor_stop.clear()
+        self._janitor = Thread(target=self._janitor_loop, args=(interval_seconds,), name="cache-janitor", daemon=True)
+        self._janitor.start()
+
+    def stop_janitor(self) -> None:
+        if self._janitor is None:
+            return
+        self._janitor_stop.set()
+        self._janitor.join(timeout=5)
+        self._janitor = None
+
+    def _janitor_loop(self, interval_seconds: float) -> None:
+        while not self._janitor_stop.wait(interval_seconds):
+            try:
+                self.purge_expired()
+            except Exception:
+                logger.exception("cache.janitor_failed", extra={"event": "cache.janitor_failed"})
+
+    def _namespace_row(self, namespace: str) -> dict[str, object]:
+        quota = self.quota_for(namespace)
+        row: dict[str, object] = {
+            "entries": 0,
+            "bytes": 0,
+            "max_entries": quota.max_entries,
+            "max_bytes": quota.max_bytes,
+        }
+        row.update({event: 0 for event in CACHE_EVENTS})
+        return row
+
+    def namespace_stats(self) -> dict[str, dict[str, object]]:
+        generation = self._generation
+        output: dict[str, dict[str, object]] = {}
+        for key, entry in generation.entries.items():
+            namespace = namespace_for(key)
+            row = output.get(namespace)
+            if row is None:
+                row = output[namespace] = self._namespace_row(namespace)
+            row["entries"] += 1
+            row["bytes"] += entry.size_bytes
+        for (namespace, event), value in self._events.values().items():
+            row = output.get(namespace)
+            if row is None:
+                row = output[namespace] = self._namespace_row(namespace)
+            row[event] = value
+        for (namespace,), histogram in self._fill_latency.items():
+            row = output.get(namespace)
+            if row is None:
+                row = output[namespace] = self._namespace_row(namespace)
+            row["miss_fill_seconds"] = histogram.summary()
+        for row in output.values():
+            lookups = row["hits"] + row["misses"]
+            row["hit_ratio"] = round(row["hits"] / lookups, 4) if lookups else None
+        return output
+
+    def event_counts(self) -> dict[tuple[str, str], int]:
+        return self._events.values()
+
+    def fill_latency(self) -> HistogramFamily:
+        return self._fill_latency
+
+    def stats(self) -> dict[str, object]:
         now = datetime.now(timezone.utc)
-        with self._lock:
-            expired_keys = [key for key, value in self._store.items() if value.expires_at <= now]
-            for key in expired_keys:
-                self._store.pop(key, None)
-            return {
-                "entries": len(self._store),
-                "ttl_seconds": self.ttl_seconds,
-                "stale_threshold_seconds": self.stale_threshold_seconds,
-            }
+        generation = self._generation
+        live = [entry for entry in generation.entries.values() if entry.expires_at > now]
+        namespaces = self.namespace_stats()
+        return {
+            "entries": len(live),
+            "bytes": sum(entry.size_bytes for entry in generation.entries.values()),
+            "evictions": sum(row["evictions"] for row in namespaces.values()),
+            "namespaces": namespaces,
+            "restored_entries": sum(1 for entry in live if entry.restored),
+            "expired_pending": len(generation.entries) - len(live),
+            "generation": generation.number,
+            "janitor_runs": self._janitor_runs,
+            "janitor_purged": self._janitor_purged,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_threshold_seconds": self.stale_threshold_seconds,
+        }
 
     def last_update(self) -> datetime | None:
-        with self._lock:
-            return self._last_update
+        return self._generation.last_update
+
+    def _is_stale(self, generation: CacheGeneration, now: datetime) -> bool:
+        if generation.last_update is None:
+            return True
+        return (now - generation.last_update).total_seconds() > self.stale_threshold_seconds
 
     def is_globally_stale(self) -> bool:
-        now = datetime.now(timezone.utc)
-        with self._lock:
-            if self._last_update is None:
-                return True
-            return (now - self._last_update).total_seconds() > self.stale_threshold_seconds
+        return self._is_stale(self._generation, datetime.now(timezone.utc))
 
     def last_success_by_module(self) -> dict[str, datetime | None]:
-        with self._lock:
-            return dict(self._last_success_by_module)
+        return dict(self._generation.last_success_by_module)
 
     def clear(self) -> None:
-        with self._lock:
-            self._store.clear()
-            self._last_update = None
-            for module in self._last_success_by_module:
-                self._last_success_by_module[module] = None
+        with self._write_lock:
+            self._publish({}, None, {module: None for module in MODULES})
+            self._last_access.clear()
+            self._usage.clear()
+            self._miss_started.clear()
+            self._events.clear()
+            self._fill_latency.clear()
 
 
 def _stale_threshold_from_env() -> int:
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from threading import Lock
+import time
+
+from app.core.settings import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_PER_TICKER, CIRCUIT_RESET_SECONDS
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class MissingDataError(RuntimeError):
+    """The provider answered but has no data for this ticker/series (unknown, delisted, empty).
+
+    The provider itself is healthy, so this is neither retried nor counted as a circuit failure.
+    """
+
+
+@dataclass
+class _Circuit:
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: float | None = None
+    opened_at_wall: datetime | None = None
+    probe_in_flight: bool = False
+    times_opened: int = 0
+    rejected: int = 0
+
+
+class CircuitBreakerRegistry:
+    """Consecutive-failure circuit breakers keyed by provider and, optionally, provider:ticker."""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout_seconds: float = CIRCUIT_RESET_SECONDS,
+        per_key: bool = CIRCUIT_PER_TICKER,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.per_key = per_key
+        self._lock = Lock()
+        self._circuits: dict[str, _Circuit] = {}
+
+    def _names(self, provider: str, key: str | None) -> list[str]:
+        if self.per_key and key:
+            return [provider, f"{provider}:{key}"]
+        return [provider]
+
+    def _reset_elapsed(self, circuit: _Circuit, now: float) -> bool:
+        return circuit.opened_at is None or now - circuit.opened_at >= self.reset_timeout_seconds
+
+    def is_open(self, provider: str, key: str | None = None) -> bool:
+        """Cheap peek that does not claim the half-open probe slot."""
+        now = time.monotonic()
+        with self._lock:
+            for name in self._names(provider, key):
+                circuit = self._circuits.get(name)
+                if circuit is None or circuit.state == CLOSED:
+                    continue
+                if circuit.state == HALF_OPEN and circuit.probe_in_flight:
+                    return True
+                if circuit.state == OPEN and not self._reset_elapsed(circuit, now):
+                    return True
+        return False
+
+    def before_call(self, provider: str, key: str | None = None) -> None:
+        """Raise CircuitOpenError while open; let exactly one probe through once the reset timeout passed."""
+        now = time.monotonic()
+        with self._lock:
+            circuits = [self._circuits.setdefault(name, _Circuit()) for name in self._names(provider, key)]
+            for name, circuit in zip(self._names(provider, key), circuits):
+                if circuit.state == OPEN and self._reset_elapsed(circuit, now):
+                    circuit.state = HALF_OPEN
+                    circuit.probe_in_flight = False
+                if circuit.state == OPEN or (circuit.state == HALF_OPEN and circuit.probe_in_flight):
+                    circuit.rejected += 1
+                    raise CircuitOpenError(f"Circuit open for {name}.")
+            for circuit in circuits:
+                if circuit.state == HALF_OPEN:
+                    circuit.probe_in_flight = True
+
+    def record_success(self, provider: str, key: str | None = None) -> None:
+        with self._lock:
+            for name in self._names(provider, key):
+                circuit = self._circuits.setdefault(name, _Circuit())
+                circuit.state = CLOSED
+                circuit.consecutive_failures = 0
+                circuit.opened_at = None
+                circuit.opened_at_wall = None
+                circuit.probe_in_flight = False
+
+    def release_probe(self, provider: str, key: str | None = None) -> None:
+        """Hand back a half-open probe slot whose call was cancelled before it had an outcome."""
+        with self._lock:
+            for name in self._names(provider, key):
+                circuit = self._circuits.get(name)
+                if circuit is not None:
+                    circuit.probe_in_flight = False
+
+    def record_failure(self, provider: str, key: str | None = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for name in self._names(provider, key):
+                circuit = self._circuits.setdefault(name, _Circuit())
+                circuit.consecutive_failures += 1
+                if circuit.state == HALF_OPEN or circuit.consecutive_failures >= self.failure_threshold:
+                    if circuit.state != OPEN:
+                        circuit.times_opened += 1
+                    circuit.state = OPEN
+                    circuit.opened_at = now
+                    circuit.opened_at_wall = datetime.now(timezone.utc)
+                    circuit.probe_in_flight = False
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        with self._lock:
+            return {
+                name: {
+                    "state": circuit.state,
+                    "consecutive_failures": circuit.consecutive_failures,
+                    "opened_at": circuit.opened_at_wall.isoformat() if circuit.opened_at_wall else None,
+                    "times_opened": circuit.times_opened,
+                    "rejected": circuit.rejected,
+                }
+                for name, circuit in self._circuits.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._circuits.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
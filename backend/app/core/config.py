@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field, replace
+import hashlib
+import logging
 from pathlib import Path
-from typing import List
+from threading import Lock
+import time
+from typing import Callable, List
 
 import yaml
 from pydantic import BaseModel, Field
 
+from app.core.settings import CONFIG_CHECK_INTERVAL_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
 
 class InstrumentConfig(BaseModel):
     id: str
@@ -33,8 +43,146 @@ def default_config_path() -> Path:
     return repo_root() / "config" / "instruments.example.yaml"
 
 
-def load_instruments(path: Path | None = None) -> list[InstrumentConfig]:
-    config_path = path or default_config_path()
-    data = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+def _parse_instruments(raw: str) -> list[InstrumentConfig]:
+    data = yaml.safe_load(raw) or {}
     parsed = InstrumentsFile(**data)
     return parsed.instruments
+
+
+@dataclass(frozen=True)
+class InstrumentSnapshot:
+    instruments: tuple[InstrumentConfig, ...]
+    mtime_ns: int
+    size: int
+    digest: str
+    by_id: dict[str, InstrumentConfig] = field(default_factory=dict)
+    by_module: dict[str, tuple[InstrumentConfig, ...]] = field(default_factory=dict)
+    by_ticker: dict[str, tuple[InstrumentConfig, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, instruments: list[InstrumentConfig], mtime_ns: int, size: int, digest: str) -> "InstrumentSnapshot":
+        by_module: dict[str, list[InstrumentConfig]] = {}
+        by_ticker: dict[str, list[InstrumentConfig]] = {}
+        for item in instruments:
+            by_module.setdefault(item.module, []).append(item)
+            by_ticker.setdefault(item.ticker, []).append(item)
+        return cls(
+            instruments=tuple(instruments),
+            mtime_ns=mtime_ns,
+            size=size,
+            digest=digest,
+            by_id={item.id: item for item in instruments},
+            by_module={module: tuple(items) for module, items in by_module.items()},
+            by_ticker={ticker: tuple(items) for ticker, items in by_ticker.items()},
+        )
+
+
+def changed_instruments(old: InstrumentSnapshot, new: InstrumentSnapshot) -> list[InstrumentConfig]:
+    """Old and new versions of every instrument that was added, removed or edited."""
+    changed: list[InstrumentConfig] = []
+    for instrument_id in old.by_id.keys() | new.by_id.keys():
+        before = old.by_id.get(instrument_id)
+        after = new.by_id.get(instrument_id)
+        if before == after:
+            continue
+        changed.extend(item for item in (before, after) if item is not None)
+    return changed
+
+
+class InstrumentRegistry:
+    """Parsed, indexed instrument config that is re-read only when the file changes on disk."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        check_interval_seconds: float = CONFIG_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self._path = path
+        self.check_interval_seconds = check_interval_seconds
+        self._lock = Lock()
+        self._snapshot: InstrumentSnapshot | None = None
+        self._next_check = 0.0
+        self._listeners: list[Callable[[list[InstrumentConfig]], None]] = []
+
+    @property
+    def path(self) -> Path:
+        return self._path or default_config_path()
+
+    def add_listener(self, listener: Callable[[list[InstrumentConfig]], None]) -> None:
+        self._listeners.append(listener)
+
+    def snapshot(self) -> InstrumentSnapshot:
+        current = self._snapshot
+        if current is not None and time.monotonic() < self._next_check:
+            return current
+        return self._reload_if_changed()
+
+    def instruments(self) -> list[InstrumentConfig]:
+        return list(self.snapshot().instruments)
+
+    def by_module(self, module: str) -> list[InstrumentConfig]:
+        return list(self.snapshot().by_module.get(module, ()))
+
+    def get(self, instrument_id: str, module: str | None = None) -> InstrumentConfig | None:
+        item = self.snapshot().by_id.get(instrument_id)
+        if item is None or (module is not None and item.module != module):
+            return None
+        return item
+
+    def by_ticker(self, ticker: str) -> list[InstrumentConfig]:
+        return list(self.snapshot().by_ticker.get(ticker, ()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._next_check = 0.0
+
+    def _reload_if_changed(self) -> InstrumentSnapshot:
+        changed: list[InstrumentConfig] = []
+        with self._lock:
+            current = self._snapshot
+            now = time.monotonic()
+            if current is not None and now < self._next_check:
+                return current
+            self._next_check = now + self.check_interval_seconds
+
+            path = self.path
+            try:
+                stat = path.stat()
+                if current is not None and (stat.st_mtime_ns, stat.st_size) == (current.mtime_ns, current.size):
+                    return current
+
+                raw = path.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                if current is not None and digest == current.digest:
+                    self._snapshot = replace(current, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    return self._snapshot
+
+                instruments = _parse_instruments(raw.decode("utf-8"))
+            except Exception:
+                if current is None:
+                    raise
+                # Keep serving the last valid config while the file is being edited or swapped in by
+                # an atomic rename (the path can briefly be missing).
+                logger.exception("config.reload_failed", extra={"event": "config.reload_failed", "path": str(path)})
+                return current
+
+            updated = InstrumentSnapshot.build(instruments, stat.st_mtime_ns, stat.st_size, digest)
+            self._snapshot = updated
+            if current is not None:
+                changed = changed_instruments(current, updated)
+
+        if changed:
+            logger.info("config.reloaded", extra={"event": "config.reloaded", "changed_count": len(changed)})
+            for listener in self._listeners:
+                listener(changed)
+        return updated
+
+
+instrument_registry = InstrumentRegistry()
+
+
+def load_instruments(path: Path | None = None) -> list[InstrumentConfig]:
+    if path is None:
+        return instrument_registry.instruments()
+    return _parse_instruments(path.read_text(encoding="utf-8"))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import time
+from typing import Iterator
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True)
+class Deadline:
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def covers(self, seconds: float) -> bool:
+        return self.remaining() > seconds
+
+
+_current: ContextVar[Deadline | None] = ContextVar("upstream_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[Deadline]:
+    """Bound every upstream call made inside the block; nested scopes never extend an outer budget."""
+    deadline = Deadline.after(seconds)
+    outer = _current.get()
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def call_timeout(cap_seconds: float) -> float:
+    """Per-call timeout: the remaining budget, capped. Raises DeadlineExceeded if nothing is left."""
+    deadline = _current.get()
+    if deadline is None:
+        return cap_seconds
+    remaining = deadline.remaining()
+    if remaining <= 0.0:
+        raise DeadlineExceeded("Upstream time budget exhausted.")
+    return min(cap_seconds, remaining)
+
+
+def wait_budget(cap_seconds: float) -> float:
+    """How long a caller may block (e.g. on the rate limiter) without overrunning the deadline."""
+    deadline = _current.get()
+    if deadline is None:
+        return cap_seconds
+    return min(cap_seconds, deadline.remaining())
+
+
+def can_retry_after(sleep_seconds: float, min_call_seconds: float) -> bool:
+    deadline = _current.get()
+    return deadline is None or deadline.covers(sleep_seconds + min_call_seconds)
+
+
+def is_timeout_error(exc: BaseException) -> bool:
+    if isinstance(exc, TimeoutError):
+        return True
+    if isinstance(getattr(exc, "reason", None), TimeoutError):
+        return True
+    return "timeout" in type(exc).__name__.lower() or "timed out" in str(exc).lower()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+import time
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from app.core.settings import L2_CACHE, L2_CACHE_DIR
+from app.models.summary import SparkPoint, SummaryItem
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"L2C1"
+HEADER = struct.Struct("<4sQI")
+POINTER_FILE = "CURRENT"
+KEEP_SNAPSHOTS = 3
+CHECK_INTERVAL_SECONDS = 1.0
+
+_CODECS: dict[str, TypeAdapter[Any]] = {
+    "summary": TypeAdapter(list[SummaryItem]),
+    "points": TypeAdapter(list[SparkPoint]),
+}
+
+
+def l2_cache_enabled() -> bool:
+    return L2_CACHE
+
+
+def default_l2_cache_dir() -> Path:
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "data" / "l2_cache"
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, list) and value and isinstance(value[0], SummaryItem):
+        return "summary"
+    return "points"
+
+
+def _parse_time(raw: str | None) -> datetime | None:
+    return datetime.fromisoformat(raw) if raw else None
+
+
+@dataclass(frozen=True)
+class L2Entry:
+    value: Any
+    fetched_at: datetime
+
+
+class _MappedSnapshot:
+    """One immutable snapshot file mapped read-only; only the requested payload is read and decoded."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an L2 cache snapshot: {path}")
+        index = json.loads(self._mmap[HEADER.size : HEADER.size + index_length])
+        self.path = path
+        self.version = version
+        self.size = len(self._mmap)
+        self.created_at = _parse_time(index["created_at"])
+        self.last_update = _parse_time(index["last_update"])
+        self.last_success_by_module = {
+            module: _parse_time(value) for module, value in index["last_success_by_module"].items()
+        }
+        self._entries: dict[str, dict[str, Any]] = index["entries"]
+        self._payload_start = HEADER.size + index_length
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> L2Entry | None:
+        meta = self._entries.get(key)
+        if meta is None:
+            return None
+        start = self._payload_start + meta["offset"]
+        value = _CODECS[meta["kind"]].validate_json(self._mmap[start : start + meta["length"]])
+        return L2Entry(value=value, fetched_at=datetime.fromisoformat(meta["fetched_at"]))
+
+    def keys(self) -> list[str]:
+        return list(self._entries)
+
+
+class L2SnapshotCache:
+    """Versioned snapshot files shared by all worker processes on one host.
+
+    The refreshing process serializes every cache entry into a new immutable file and flips the
+    CURRENT pointer with an atomic rename. Readers map the current file read-only and swap to a new
+    mapping by replacing a single reference, so lookups never take a lock.
+    """
+
+    def __init__(self, directory: Path, check_interval_seconds: float = CHECK_INTERVAL_SECONDS) -> None:
+        self.directory = directory
+        self.check_interval_seconds = check_interval_seconds
+        self._snapshot: _MappedSnapshot | None = None
+        self._pointer_signature: tuple[int, int] | None = None
+        self._next_check = 0.0
+        self._swaps = 0
+        self._published = 0
+
+    def _pointer_path(self) -> Path:
+        return self.directory / POINTER_FILE
+
+    def publish(
+        self,
+        entries: dict[str, tuple[Any, datetime]],
+        *,
+        last_update: datetime | None,
+        last_success_by_module: dict[str, datetime | None],
+    ) -> Path:
+        """Write a new snapshot and make it current. Returns the snapshot path."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        version = time.time_ns()
+        payloads: list[bytes] = []
+        index_entries: dict[str, dict[str, Any]] = {}
+        offset = 0
+        for key, (value, fetched_at) in entries.items():
+            kind = _kind(value)
+            payload = _CODECS[kind].dump_json(value)
+            index_entries[key] = {
+                "offset": offset,
+                "length": len(payload),
+                "kind": kind,
+                "fetched_at": fetched_at.isoformat(),
+            }
+            payloads.append(payload)
+            offset += len(payload)
+
+        index = json.dumps(
+            {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "last_update": last_update.isoformat() if last_update else None,
+                "last_success_by_module": {
+                    module: value.isoformat() if value else None for module, value in last_success_by_module.items()
+                },
+                "entries": index_entries,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        name = f"snapshot-{version}-{os.getpid()}.bin"
+        final_path = self.directory / name
+        temp_path = self.directory / f".{name}.tmp"
+        with temp_path.open("wb") as handle:
+            handle.write(HEADER.pack(MAGIC, version, len(index)))
+            handle.write(index)
+            for payload in payloads:
+                handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, final_path)
+
+        pointer_temp = self.directory / f".{POINTER_FILE}.{os.getpid()}.tmp"
+        pointer_temp.write_text(name, encoding="utf-8")
+        os.replace(pointer_temp, self._pointer_path())
+        self._published += 1
+        self._prune(keep=name)
+        return final_path
+
+    def _prune(self, keep: str) -> None:
+        # Readers that still map an unlinked file keep reading it; the space is freed when they swap.
+        snapshots = sorted(self.directory.glob("snapshot-*.bin"), key=lambda path: path.stat().st_mtime_ns)
+        for path in snapshots[:-KEEP_SNAPSHOTS]:
+            if path.name == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _refresh(self) -> _MappedSnapshot | None:
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._snapshot
+        self._next_check = now + self.check_interval_seconds
+        pointer = self._pointer_path()
+        try:
+            stat = pointer.stat()
+        except FileNotFoundError:
+            return self._snapshot
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._pointer_signature and self._snapshot is not None:
+            return self._snapshot
+        try:
+            name = pointer.read_text(encoding="utf-8").strip()
+            if self._snapshot is None or self._snapshot.path.name != name:
+                self._snapshot = _MappedSnapshot(self.directory / name)
+                self._swaps += 1
+            self._pointer_signature = signature
+        except (OSError, ValueError, struct.error):
+            logger.exception("l2_cache.map_failed", extra={"event": "l2_cache.map_failed"})
+        return self._snapshot
+
+    def current(self) -> _MappedSnapshot | None:
+        return self._refresh()
+
+    def get(self, key: str) -> L2Entry | None:
+        snapshot = self._refresh()
+        if snapshot is None:
+            return None
+        return snapshot.get(key)
+
+    def stats(self) -> dict[str, object]:
+        snapshot = self._snapshot
+        return {
+            "directory": str(self.directory),
+            "version": snapshot.version if snapshot is not None else None,
+            "entries": len(snapshot.keys()) if snapshot is not None else 0,
+            "bytes": snapshot.size if snapshot is not None else 0,
+            "created_at": snapshot.created_at.isoformat() if snapshot is not None and snapshot.created_at else None,
+            "swaps": self._swaps,
+            "published": self._published,
+        }
+
+
+_l2_cache: L2SnapshotCache | None = None
+
+
+def l2_cache() -> L2SnapshotCache:
+    global _l2_cache
+    if _l2_cache is None:
+        _l2_cache = L2SnapshotCache(Path(L2_CACHE_DIR) if L2_CACHE_DIR else default_l2_cache_dir())
+    return _l2_cache
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import socket
+from threading import Lock
+from uuid import uuid4
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.settings import LEADER_LEASE_SECONDS
+from app.db.repository import release_lease, try_acquire_lease
+from app.db.session import session_scope
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLease:
+    """DB-row lease so exactly one process across workers/replicas holds a named role."""
+
+    def __init__(self, name: str, lease_seconds: int = LEADER_LEASE_SECONDS) -> None:
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._lock = Lock()
+        self._is_leader = False
+        self._last_heartbeat_at: datetime | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        with self._lock:
+            return self._is_leader
+
+    def try_acquire(self) -> bool:
+        """Acquire or renew the lease. Any DB error is treated as lost leadership."""
+        now = datetime.now(timezone.utc)
+        try:
+            with session_scope() as session:
+                acquired = try_acquire_lease(
+                    session,
+                    self.name,
+                    self.holder,
+                    now,
+                    now + timedelta(seconds=self.lease_seconds),
+                )
+        except SQLAlchemyError:
+            logger.exception("leader.heartbeat_failed", extra={"event": "leader.heartbeat_failed", "lease": self.name})
+            acquired = False
+
+        with self._lock:
+            changed = acquired != self._is_leader
+            self._is_leader = acquired
+            if acquired:
+                self._last_heartbeat_at = now
+        if changed:
+            event = "leader.acquired" if acquired else "leader.lost"
+            logger.info(event, extra={"event": event, "lease": self.name, "holder": self.holder})
+        return acquired
+
+    def release(self) -> None:
+        with self._lock:
+            was_leader = self._is_leader
+            self._is_leader = False
+        if not was_leader:
+            return
+        try:
+            with session_scope() as session:
+                release_lease(session, self.name, self.holder)
+        except SQLAlchemyError:
+            logger.exception("leader.release_failed", extra={"event": "leader.release_failed", "lease": self.name})
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "lease": self.name,
+                "holder": self.holder,
+                "is_leader": self._is_leader,
+                "lease_seconds": self.lease_seconds,
+                "last_heartbeat_at": self._last_heartbeat_at.isoformat() if self._last_heartbeat_at else None,
+            }
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timezone
+import gc
+import os
+import sys
+from threading import Lock
+import tracemalloc
+from typing import Any
+
+from app.core.cache import cache, namespace_for
+from app.core.settings import MEMORY_TRACING
+
+TRACE_FRAMES = 10
+TOP_ALLOCATION_SITES = 25
+_IGNORED_TRACE_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+def deep_size(value: Any) -> int:
+    """Retained size of a cached value, following containers and model attributes.
+
+    Each object is counted once per call, so shared objects (interned strings, small ints, the
+    same datetime referenced twice) are not double counted; it is still an estimate.
+    """
+    seen: set[int] = set()
+    pending = [value]
+    total = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool, datetime)) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        attributes = getattr(item, "__dict__", None)
+        if attributes is not None:
+            pending.append(attributes)
+    return total
+
+
+def cache_footprint(top_keys: int) -> dict[str, object]:
+    namespaces: dict[str, dict[str, int]] = {}
+    keys: list[dict[str, object]] = []
+    for key, entry in cache.entries().items():
+        namespace = namespace_for(key)
+        retained = deep_size(entry.value)
+        row = namespaces.setdefault(namespace, {"entries": 0, "bytes": 0, "accounted_bytes": 0})
+        row["entries"] += 1
+        row["bytes"] += retained
+        row["accounted_bytes"] += entry.size_bytes
+        keys.append({"key": key, "namespace": namespace, "bytes": retained, "accounted_bytes": entry.size_bytes})
+    keys.sort(key=lambda row: row["bytes"], reverse=True)
+    return {
+        "total_bytes": sum(row["bytes"] for row in namespaces.values()),
+        "namespaces": namespaces,
+        "top_keys": keys[:top_keys],
+    }
+
+
+def _tracked_types() -> dict[type, str]:
+    # Imported lazily so this module does not pull the ORM in for callers that only need deep_size.
+    from app.core.cache import CacheEntry
+    from app.core.config import InstrumentConfig
+    from app.db.models import QuoteSnapshot, SeriesPoint
+    from app.models.summary import SparkPoint, SummaryItem
+
+    return {
+        SummaryItem: "SummaryItem",
+        SparkPoint: "SparkPoint",
+        InstrumentConfig: "InstrumentConfig",
+        CacheEntry: "CacheEntry",
+        QuoteSnapshot: "db.QuoteSnapshot",
+        SeriesPoint: "db.SeriesPoint",
+    }
+
+
+def object_counts() -> dict[str, int]:
+    """Live instances of the main model types; walks the whole GC heap, so keep it off hot paths."""
+    tracked = _tracked_types()
+    counts: Counter[str] = Counter({name: 0 for name in tracked.values()})
+    for obj in gc.get_objects():
+        name = tracked.get(type(obj))
+        if name is not None:
+            counts[name] += 1
+    return dict(counts)
+
+
+def process_memory() -> dict[str, int | None]:
+    rss = None
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            rss = int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = None
+    try:
+        import resource
+
+        # ru_maxrss is KiB on Linux.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        pass
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+class AllocationTracker:
+    """Diffs tracemalloc snapshots between refresh cycles when APP_MEMORY_TRACING is on.
+
+    tracemalloc slows every allocation down noticeably, so it is never started implicitly.
+    """
+
+    def __init__(self, enabled: bool = MEMORY_TRACING) -> None:
+        self.enabled = enabled
+        self._lock = Lock()
+        self._previous: tracemalloc.Snapshot | None = None
+        self._last_diff: list[dict[str, object]] = []
+        self._last_diff_at: datetime | None = None
+        self._cycles = 0
+
+    def start(self) -> None:
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    def stop(self) -> None:
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        with self._lock:
+            self._previous = None
+
+    def record_cycle(self) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_TRACE_FILES]
+        )
+        with self._lock:
+            previous, self._previous = self._previous, snapshot
+            self._cycles += 1
+            if previous is None:
+                return
+            stats = snapshot.compare_to(previous, "lineno")
+            self._last_diff = [
+                {
+                    "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff_bytes": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in stats[:TOP_ALLOCATION_SITES]
+            ]
+            self._last_diff_at = datetime.now(timezone.utc)
+
+    def snapshot(self) -> dict[str, object]:
+        if not tracemalloc.is_tracing():
+            return {"enabled": False}
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            return {
+                "enabled": True,
+                "traced_bytes": current,
+                "traced_peak_bytes": peak,
+                "cycles_seen": self._cycles,
+                "last_diff_at": self._last_diff_at.isoformat() if self._last_diff_at else None,
+                "top_allocation_sites": list(self._last_diff),
+            }
+
+
+def memory_report(top_keys: int) -> dict[str, object]:
+    return {
+        "process": process_memory(),
+        "cache": cache_footprint(top_keys),
+        "objects": object_counts(),
+        "tracing": allocation_tracker.snapshot(),
+    }
+
+
+allocation_tracker = AllocationTracker()
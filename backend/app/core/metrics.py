@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock, Thread, current_thread, local
+from typing import Iterable
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_INF_LABEL = 'le="+Inf"'
+
+
+class ShardedCounter:
+    """Labelled counters with one shard per thread, so hot paths increment without any lock.
+
+    A shard is registered once per thread; reads sum all shards. Values are exact because each
+    shard is only ever written by its own thread. Shards of threads that have exited are folded
+    into a base total, so short-lived worker threads do not grow the shard list.
+    """
+
+    def __init__(self) -> None:
+        self._local = local()
+        self._shards: dict[Thread, dict[tuple[str, ...], int]] = {}
+        self._base: dict[tuple[str, ...], int] = {}
+        self._register_lock = Lock()
+
+    def _shard(self) -> dict[tuple[str, ...], int]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._register_lock:
+                self._fold_finished()
+                self._shards[current_thread()] = shard
+            self._local.shard = shard
+        return shard
+
+    def _fold_finished(self) -> None:
+        # Callers hold _register_lock. A finished thread never writes again, so its shard is final.
+        for thread in [thread for thread in self._shards if not thread.is_alive()]:
+            for labels, value in self._shards.pop(thread).items():
+                self._base[labels] = self._base.get(labels, 0) + value
+
+    def inc(self, labels: tuple[str, ...], amount: int = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> dict[tuple[str, ...], int]:
+        with self._register_lock:
+            self._fold_finished()
+            totals = dict(self._base)
+            shards = list(self._shards.values())
+        for shard in shards:
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def clear(self) -> None:
+        with self._register_lock:
+            self._base.clear()
+            for shard in self._shards.values():
+                shard.clear()
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus layout) with interpolated quantiles."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def state(self) -> tuple[list[int], float, int]:
+        with self._lock:
+            return list(self._counts), self._sum, self._count
+
+    def merge(self, other: Histogram) -> None:
+        counts, total, count = other.state()
+        with self._lock:
+            self._counts = [left + right for left, right in zip(self._counts, counts)]
+            self._sum += total
+            self._count += count
+
+    def quantile(self, q: float) -> float | None:
+        counts, _total, count = self.state()
+        return _quantile(self.buckets, counts, count, q)
+
+    def summary(self) -> dict[str, float | int | None]:
+        counts, total, count = self.state()
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "p50": _quantile(self.buckets, counts, count, 0.5),
+            "p95": _quantile(self.buckets, counts, count, 0.95),
+            "p99": _quantile(self.buckets, counts, count, 0.99),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+
+def _quantile(buckets: tuple[float, ...], counts: list[int], count: int, q: float) -> float | None:
+    # Same estimate as PromQL histogram_quantile: linear interpolation inside the target bucket.
+    if count == 0:
+        return None
+    rank = q * count
+    cumulative = 0
+    for index, bucket_count in enumerate(counts):
+        previous = cumulative
+        cumulative += bucket_count
+        if cumulative >= rank and bucket_count:
+            if index == len(buckets):
+                return buckets[-1]
+            lower = buckets[index - 1] if index > 0 else 0.0
+            upper = buckets[index]
+            return round(lower + (upper - lower) * (rank - previous) / bucket_count, 6)
+    return buckets[-1]
+
+
+class HistogramFamily:
+    """Histograms keyed by a label tuple, created on first observation."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self._children: dict[tuple[str, ...], Histogram] = {}
+
+    def labels(self, *labels: str) -> Histogram:
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, Histogram(self.buckets))
+        return child
+
+    def items(self) -> list[tuple[tuple[str, ...], Histogram]]:
+        with self._lock:
+            return list(self._children.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_samples(
+    name: str,
+    kind: str,
+    help_text: str,
+    label_names: tuple[str, ...],
+    samples: dict[tuple[str, ...], float],
+) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{_label_text(label_names, labels)} {_number(value)}")
+    return lines
+
+
+def render_histograms(name: str, help_text: str, label_names: tuple[str, ...], family: HistogramFamily) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in sorted(family.items(), key=lambda item: item[0]):
+        counts, total, count = histogram.state()
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, counts):
+            cumulative += bucket_count
+            le = f'le="{bound}"'
+            lines.append(f"{name}_bucket{_label_text(label_names, labels, le)} {cumulative}")
+        lines.append(f"{name}_bucket{_label_text(label_names, labels, _INF_LABEL)} {count}")
+        lines.append(f"{name}_sum{_label_text(label_names, labels)} {_number(total)}")
+        lines.append(f"{name}_count{_label_text(label_names, labels)} {count}")
+    return lines
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+import cProfile
+from datetime import datetime, timezone
+import hmac
+import io
+import logging
+from pathlib import Path
+import pstats
+import re
+import sys
+from threading import Event, Lock, Thread, get_ident
+import time
+from typing import Iterator
+
+from app.core.request_metrics import ASGIApp, Message, Receive, Scope, Send
+from app.core.settings import PROFILE_CYCLES, PROFILE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL_SECONDS = 0.005
+MAX_STACK_DEPTH = 64
+TOP_FUNCTIONS = 40
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+REPORT_HEADER = b"x-profile-report"
+
+
+def default_profile_dir() -> Path:
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "data" / "profiles"
+
+
+def profile_dir() -> Path:
+    return Path(PROFILE_DIR) if PROFILE_DIR else default_profile_dir()
+
+
+def _report_name(prefix: str, label: str, suffix: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    safe_label = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_") or "root"
+    return f"{prefix}-{stamp}-{safe_label}{suffix}"
+
+
+def token_matches(expected: str | None, provided: str | None) -> bool:
+    if not expected or not provided:
+        return False
+    return hmac.compare_digest(expected.encode("utf-8"), provided.encode("utf-8"))
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval.
+
+    Sync route handlers run on threadpool workers, which a per-thread profiler such as cProfile
+    started in the event loop cannot see; sampling all threads covers them. Stacks from other
+    concurrent requests show up too, so profile on a quiet instance when possible.
+    """
+
+    def __init__(self, interval_seconds: float = SAMPLE_INTERVAL_SECONDS) -> None:
+        self.interval_seconds = interval_seconds
+        self._stacks: Counter[str] = Counter()
+        self._self_time: Counter[str] = Counter()
+        self._samples = 0
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._started = 0.0
+        self._duration = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        own_ident = get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                names: list[str] = []
+                while frame is not None and len(names) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    names.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                if not names:
+                    continue
+                self._self_time[names[0].rsplit(":", 1)[0]] += 1
+                self._stacks[";".join(reversed(names))] += 1
+            self._samples += 1
+
+    def report(self) -> str:
+        lines = [
+            f"# sampling profile: {self._samples} samples every {self.interval_seconds * 1000:.1f} ms "
+            f"over {self._duration * 1000:.1f} ms",
+            "# top functions by samples on top of stack",
+        ]
+        for name, count in self._self_time.most_common(TOP_FUNCTIONS):
+            lines.append(f"{count:8d}  {name}")
+        lines.append("# folded stacks (flamegraph.pl / speedscope input)")
+        for stack, count in self._stacks.most_common():
+            lines.append(f"{stack} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _write_report(name: str, content: str) -> Path:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class ProfilingMiddleware:
+    """Profiles a single request when it carries `X-Profile: 1` (or `?profile=1`) and a valid
+    `X-Admin-Token`. Only installed when an admin token is configured, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp, token: str) -> None:
+        self.app = app
+        self.token = token
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        flagged = False
+        provided = None
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                flagged = value in (b"1", b"true")
+            elif name == ADMIN_TOKEN_HEADER:
+                provided = value.decode("latin-1")
+        if not flagged:
+            query = scope.get("query_string", b"")
+            flagged = b"profile=1" in query.split(b"&")
+        return flagged and token_matches(self.token, provided)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = _report_name("request", scope.get("path", ""), ".txt")
+        profiler = SamplingProfiler()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REPORT_HEADER, name.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            path = _write_report(name, profiler.report())
+            logger.info("profiling.request_saved", extra={"event": "profiling.request_saved", "path": str(path)})
+
+
+class CycleProfiler:
+    """Runs the next N scheduler cycles under cProfile and writes .prof plus a text summary."""
+
+    def __init__(self, armed: int = 0) -> None:
+        self._lock = Lock()
+        self._remaining = armed
+        self._reports: list[str] = []
+
+    def arm(self, count: int) -> int:
+        with self._lock:
+            self._remaining = max(0, count)
+            return self._remaining
+
+    def remaining(self) -> int:
+        return self._remaining
+
+    def reports(self) -> list[str]:
+        with self._lock:
+            return list(self._reports)
+
+    def _claim(self) -> bool:
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    @contextmanager
+    def maybe_profile(self, label: str) -> Iterator[None]:
+        # Fast path: one int comparison when nothing is armed.
+        if self._remaining <= 0 or not self._claim():
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._save(profiler, label)
+
+    def _save(self, profiler: cProfile.Profile, label: str) -> None:
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        prof_path = directory / _report_name("cycle", label, ".prof")
+        profiler.dump_stats(str(prof_path))
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        text_path = _write_report(prof_path.with_suffix(".txt").name, buffer.getvalue())
+        with self._lock:
+            self._reports.extend([prof_path.name, text_path.name])
+        logger.info("profiling.cycle_saved", extra={"event": "profiling.cycle_saved", "path": str(prof_path)})
+
+
+cycle_profiler = CycleProfiler(armed=PROFILE_CYCLES)
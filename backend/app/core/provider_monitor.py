@@ -1,50 +1,199 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime, timezone
 from threading import Lock
 
+from app.core.metrics import DEFAULT_LATENCY_BUCKETS, Histogram, HistogramFamily
+from app.core.shared_state import SharedStateStore, shared_state_enabled, shared_store
+
+
+CALL_RING_SIZE = 32
+MAX_TRACKED_KEYS = 512
+RATE_LIMIT_WAIT_BUCKETS = (0.001,) + DEFAULT_LATENCY_BUCKETS
+CONNECT_BUCKETS = (0.001, 0.0025) + DEFAULT_LATENCY_BUCKETS
+
+
+def _empty_row() -> dict[str, object]:
+    return {
+        "attempts": 0,
+        "success": 0,
+        "fail": 0,
+        "retries": 0,
+        "short_circuited": 0,
+        "quarantined": 0,
+        "timeouts": 0,
+        "last_error": None,
+        "last_failure_at": None,
+    }
+
 
 class ProviderMonitor:
-    def __init__(self) -> None:
+    """Provider counters plus per-call latency, payload size, rate-limit waits, connection setup and
+    per-key outcomes.
+
+    Counters go to the shared store when one is configured. Histograms and the per-ticker/per-series
+    ring buffers are per process; each key keeps its last CALL_RING_SIZE calls and at most
+    MAX_TRACKED_KEYS keys are tracked, so memory stays bounded.
+    """
+
+    def __init__(self, store: SharedStateStore | None = None) -> None:
         self._lock = Lock()
-        self._stats: dict[str, dict[str, object]] = defaultdict(
-            lambda: {
-                "attempts": 0,
-                "success": 0,
-                "fail": 0,
-                "retries": 0,
-                "last_error": None,
-                "last_failure_at": None,
-            }
-        )
+        self._store = store
+        self._stats: dict[str, dict[str, object]] = defaultdict(_empty_row)
+        self._latency = HistogramFamily()
+        self._rate_limit_wait = HistogramFamily(RATE_LIMIT_WAIT_BUCKETS)
+        self._connect = HistogramFamily(CONNECT_BUCKETS)
+        self._payload_bytes: dict[str, int] = defaultdict(int)
+        self._connections: dict[str, dict[str, int]] = defaultdict(lambda: {"opened": 0, "reused": 0})
+        self._calls: OrderedDict[tuple[str, str], deque[dict[str, object]]] = OrderedDict()
 
-    def record_attempt(self, provider: str) -> None:
+    def _increment(self, provider: str, field: str) -> None:
         with self._lock:
-            self._stats[provider]["attempts"] = int(self._stats[provider]["attempts"]) + 1
+            self._stats[provider][field] = int(self._stats[provider][field]) + 1
+        if self._store is not None:
+            self._store.increment(provider, field)
+
+    def record_attempt(self, provider: str) -> None:
+        self._increment(provider, "attempts")
 
     def record_success(self, provider: str) -> None:
-        with self._lock:
-            self._stats[provider]["success"] = int(self._stats[provider]["success"]) + 1
+        self._increment(provider, "success")
 
     def record_failure(self, provider: str, error: str) -> None:
+        failed_at = datetime.now(timezone.utc).isoformat()
         with self._lock:
             row = self._stats[provider]
-            row["fail"] = int(row["fail"]) + 1
             row["last_error"] = error
-            row["last_failure_at"] = datetime.now(timezone.utc).isoformat()
+            row["last_failure_at"] = failed_at
+        self._increment(provider, "fail")
+        if self._store is not None:
+            self._store.set_attributes(provider, {"last_error": error, "last_failure_at": failed_at})
 
     def record_retry(self, provider: str) -> None:
+        self._increment(provider, "retries")
+
+    def record_short_circuit(self, provider: str) -> None:
+        self._increment(provider, "short_circuited")
+
+    def record_quarantined(self, provider: str) -> None:
+        self._increment(provider, "quarantined")
+
+    def record_timeout(self, provider: str) -> None:
+        self._increment(provider, "timeouts")
+
+    def record_call(
+        self,
+        provider: str,
+        key: str,
+        *,
+        duration_seconds: float,
+        outcome: str,
+        payload_bytes: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        """One upstream call attempt for a ticker/series: `ok`, `missing`, `error`, `timeout` or `throttled`."""
+        self._latency.labels(provider, outcome).observe(duration_seconds)
+        record = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "outcome": outcome,
+            "duration_ms": round(duration_seconds * 1000, 1),
+            "payload_bytes": payload_bytes,
+            "error": error,
+        }
+        with self._lock:
+            if payload_bytes:
+                self._payload_bytes[provider] += payload_bytes
+            ring = self._calls.get((provider, key))
+            if ring is None:
+                ring = self._calls[(provider, key)] = deque(maxlen=CALL_RING_SIZE)
+                if len(self._calls) > MAX_TRACKED_KEYS:
+                    self._calls.popitem(last=False)
+            else:
+                self._calls.move_to_end((provider, key))
+            ring.append(record)
+
+    def record_rate_limit_wait(self, provider: str, wait_seconds: float, granted: bool) -> None:
+        self._rate_limit_wait.labels(provider, "granted" if granted else "timed_out").observe(wait_seconds)
+
+    def record_connection(self, provider: str, setup_seconds: float) -> None:
+        """A new upstream connection or session; setup covers DNS, TCP and TLS where measurable."""
+        self._connect.labels(provider).observe(setup_seconds)
         with self._lock:
-            self._stats[provider]["retries"] = int(self._stats[provider]["retries"]) + 1
+            self._connections[provider]["opened"] += 1
+
+    def record_connection_reuse(self, provider: str) -> None:
+        with self._lock:
+            self._connections[provider]["reused"] += 1
+
+    def _call_metrics(self, provider: str) -> dict[str, object]:
+        latency = Histogram(self._latency.buckets)
+        waits = Histogram(self._rate_limit_wait.buckets)
+        for (name, _outcome), histogram in self._latency.items():
+            if name == provider:
+                latency.merge(histogram)
+        for (name, _outcome), histogram in self._rate_limit_wait.items():
+            if name == provider:
+                waits.merge(histogram)
+        setup = Histogram(self._connect.buckets)
+        for (name,), histogram in self._connect.items():
+            if name == provider:
+                setup.merge(histogram)
+        with self._lock:
+            payload_bytes = self._payload_bytes.get(provider, 0)
+            connections = dict(self._connections.get(provider, {"opened": 0, "reused": 0}))
+        return {
+            "latency_seconds": latency.summary(),
+            "rate_limit_wait_seconds": waits.summary(),
+            "payload_bytes": payload_bytes,
+            "connections": {**connections, "setup_seconds": setup.summary()},
+        }
 
     def snapshot(self) -> dict[str, dict[str, object]]:
+        if self._store is not None:
+            # Counters are aggregated across every worker sharing the store.
+            rows = {provider: {**_empty_row(), **values} for provider, values in self._store.provider_rows().items()}
+        else:
+            with self._lock:
+                rows = {provider: dict(values) for provider, values in self._stats.items()}
+        families = self._latency.items() + self._rate_limit_wait.items() + self._connect.items()
+        observed = {labels[0] for labels, _histogram in families}
+        for provider in observed - rows.keys():
+            rows[provider] = _empty_row()
+        for provider, row in rows.items():
+            row.update(self._call_metrics(provider))
+        return rows
+
+    def key_snapshot(self) -> dict[str, dict[str, dict[str, object]]]:
+        """Per ticker/series: outcome counts over the ring, latency of the ring, and the last call."""
         with self._lock:
-            return {provider: dict(values) for provider, values in self._stats.items()}
+            calls = {key: list(ring) for key, ring in self._calls.items()}
+        output: dict[str, dict[str, dict[str, object]]] = {}
+        for (provider, key), ring in calls.items():
+            outcomes: dict[str, int] = {}
+            for record in ring:
+                outcomes[str(record["outcome"])] = outcomes.get(str(record["outcome"]), 0) + 1
+            durations = sorted(float(record["duration_ms"]) for record in ring)
+            output.setdefault(provider, {})[key] = {
+                "calls": len(ring),
+                "outcomes": outcomes,
+                "max_duration_ms": durations[-1],
+                "median_duration_ms": durations[len(durations) // 2],
+                "last": ring[-1],
+            }
+        return output
 
     def clear(self) -> None:
         with self._lock:
             self._stats.clear()
+            self._payload_bytes.clear()
+            self._connections.clear()
+            self._calls.clear()
+        self._latency.clear()
+        self._rate_limit_wait.clear()
+        self._connect.clear()
+        if self._store is not None:
+            self._store.clear("provider_counter", "provider_attribute")
 
 
-provider_monitor = ProviderMonitor()
+provider_monitor = ProviderMonitor(store=shared_store() if shared_state_enabled() else None)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+import time
+
+from app.core.circuit_breaker import MissingDataError
+from app.core.settings import QUARANTINE_BASE_SECONDS, QUARANTINE_FAILURE_THRESHOLD, QUARANTINE_MAX_SECONDS
+
+
+class QuarantinedError(RuntimeError):
+    """The ticker/series is quarantined and was not fetched."""
+
+
+def counts_against_key(exc: BaseException) -> bool:
+    """Whether a failed fetch says something about the ticker itself.
+
+    Only a provider that answered without data for the key (MissingDataError) counts. Network
+    errors, throttling, timeouts, an open circuit or a spent deadline hit every key alike during an
+    outage, so they neither quarantine a ticker nor end its quarantine.
+    """
+    return isinstance(exc, MissingDataError) or isinstance(exc.__cause__, MissingDataError)
+
+
+@dataclass
+class _Record:
+    consecutive_failures: int = 0
+    strikes: int = 0
+    quarantined_until: float | None = None
+    quarantined_until_wall: datetime | None = None
+    probe_in_flight: bool = False
+    skipped: int = 0
+    last_error: str | None = None
+
+
+class TickerQuarantine:
+    """Per provider:key failure memory with escalating quarantine windows.
+
+    After `failure_threshold` consecutive failed fetches a key is skipped for `base_seconds`; once
+    the window passes exactly one probe is let through. A failed probe doubles the window (up to
+    `max_seconds`), a successful one forgets the key. Unlike the circuit breakers this never blocks
+    the provider, only the key that keeps failing. A threshold of 0 disables quarantine.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = QUARANTINE_FAILURE_THRESHOLD,
+        base_seconds: float = QUARANTINE_BASE_SECONDS,
+        max_seconds: float = QUARANTINE_MAX_SECONDS,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self._lock = Lock()
+        self._records: dict[str, _Record] = {}
+
+    def window_seconds(self, strikes: int) -> float:
+        return min(self.max_seconds, self.base_seconds * 2 ** max(0, strikes - 1))
+
+    def is_quarantined(self, provider: str, key: str) -> bool:
+        """Cheap peek that does not claim the probe slot."""
+        now = time.monotonic()
+        with self._lock:
+            record = self._records.get(f"{provider}:{key}")
+            if record is None or record.quarantined_until is None:
+                return False
+            return record.probe_in_flight or now < record.quarantined_until
+
+    def allow(self, provider: str, key: str) -> bool:
+        """False while quarantined; claims the single probe slot once the window has passed."""
+        now = time.monotonic()
+        with self._lock:
+            record = self._records.get(f"{provider}:{key}")
+            if record is None or record.quarantined_until is None:
+                return True
+            if record.probe_in_flight or now < record.quarantined_until:
+                record.skipped += 1
+                return False
+            record.probe_in_flight = True
+            return True
+
+    def record_success(self, provider: str, key: str) -> None:
+        with self._lock:
+            self._records.pop(f"{provider}:{key}", None)
+
+    def record_failure(self, provider: str, key: str, error: str) -> None:
+        if self.failure_threshold <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            record = self._records.setdefault(f"{provider}:{key}", _Record())
+            record.consecutive_failures += 1
+            record.last_error = error
+            record.probe_in_flight = False
+            if record.quarantined_until is not None or record.consecutive_failures >= self.failure_threshold:
+                record.strikes += 1
+                window = self.window_seconds(record.strikes)
+                record.quarantined_until = now + window
+                record.quarantined_until_wall = datetime.now(timezone.utc) + timedelta(seconds=window)
+
+    def record_error(self, provider: str, key: str, exc: BaseException) -> None:
+        """Count a failed fetch against the key, or just hand back the probe slot if it was not the key's fault."""
+        if isinstance(exc, QuarantinedError):
+            # Raised by allow() refusing this caller; the probe slot, if any, belongs to someone else.
+            return
+        if counts_against_key(exc):
+            self.record_failure(provider, key, str(exc))
+            return
+        with self._lock:
+            record = self._records.get(f"{provider}:{key}")
+            if record is not None:
+                record.probe_in_flight = False
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Quarantined keys only; keys that failed fewer than `failure_threshold` times are left out."""
+        with self._lock:
+            return {
+                name: {
+                    "consecutive_failures": record.consecutive_failures,
+                    "strikes": record.strikes,
+                    "quarantined_until": record.quarantined_until_wall.isoformat(),
+                    "probe_in_flight": record.probe_in_flight,
+                    "skipped": record.skipped,
+                    "last_error": record.last_error,
+                }
+                for name, record in self._records.items()
+                if record.quarantined_until_wall is not None
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+ticker_quarantine = TickerQuarantine()
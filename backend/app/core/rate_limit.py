@@ -1,8 +1,26 @@
 from __future__ import annotations
 
 from collections import defaultdict, deque
-from threading import Lock
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import heapq
+import itertools
+from threading import Condition, Lock
 import time
+from typing import Iterator
+
+from app.core.shared_state import SharedStateStore, shared_state_enabled, shared_store
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+AIMD_DECREASE_FACTOR = 0.5
+AIMD_INCREASE_STEP = 0.05
+AIMD_MIN_FACTOR = 0.1
+SHARED_POLL_MAX_SECONDS = 0.25
+BACKGROUND_RESERVE_FRACTION = 0.1
 
 
 class SlidingWindowRateLimiter:
@@ -28,4 +46,298 @@ class SlidingWindowRateLimiter:
             return True
 
 
-rate_limiter = SlidingWindowRateLimiter()
+_priority: ContextVar[int] = ContextVar("rate_limit_priority", default=PRIORITY_INTERACTIVE)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+@contextmanager
+def priority_scope(priority: int) -> Iterator[None]:
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    text = f"{type(exc).__name__} {exc}".lower()
+    return "429" in text or "too many requests" in text or "ratelimit" in text or "rate limit" in text
+
+
+@dataclass
+class _Bucket:
+    capacity: float
+    base_rate: float
+    tokens: float
+    updated_at: float
+    factor: float = 1.0
+    waiters: list[tuple[int, int]] = field(default_factory=list)
+    granted: int = 0
+    timed_out: int = 0
+    throttles: int = 0
+    total_wait_seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.base_rate * self.factor
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity * self.factor, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def seconds_until_token(self) -> float:
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class TokenBucketRateLimiter:
+    """Token bucket per key with blocking FIFO acquire, priorities and AIMD rate adaptation.
+
+    Lower priority values are served first; equal priorities are served in arrival order.
+    """
+
+    def __init__(self) -> None:
+        self._cond = Condition(Lock())
+        self._buckets: dict[str, _Bucket] = {}
+        self._sequence = itertools.count()
+
+    def _bucket(self, key: str, max_calls: int, period_seconds: int, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        base_rate = max_calls / period_seconds
+        if bucket is None:
+            bucket = _Bucket(capacity=float(max_calls), base_rate=base_rate, tokens=float(max_calls), updated_at=now)
+            self._buckets[key] = bucket
+        elif bucket.capacity != max_calls or bucket.base_rate != base_rate:
+            bucket.capacity = float(max_calls)
+            bucket.base_rate = base_rate
+        bucket.refill(now)
+        return bucket
+
+    def allow(self, key: str, max_calls: int, period_seconds: int) -> bool:
+        """Non-blocking acquire; never jumps ahead of queued waiters."""
+        return self.acquire(key, max_calls, period_seconds, timeout=0)
+
+    def acquire(
+        self,
+        key: str,
+        max_calls: int,
+        period_seconds: int,
+        timeout: float | None = None,
+        priority: int | None = None,
+    ) -> bool:
+        if max_calls <= 0 or period_seconds <= 0:
+            return True
+
+        started = time.monotonic()
+        ticket = (current_priority() if priority is None else priority, next(self._sequence))
+        with self._cond:
+            bucket = self._bucket(key, max_calls, period_seconds, started)
+            heapq.heappush(bucket.waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    is_head = bucket.waiters[0] == ticket
+                    if is_head and bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        bucket.granted += 1
+                        bucket.total_wait_seconds += now - started
+                        return True
+
+                    remaining = None if timeout is None else started + timeout - now
+                    if remaining is not None and remaining <= 0:
+                        bucket.timed_out += 1
+                        return False
+                    wait = bucket.seconds_until_token() if is_head else remaining
+                    if remaining is not None and wait is not None:
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                if bucket.waiters and bucket.waiters[0] == ticket:
+                    heapq.heappop(bucket.waiters)
+                else:
+                    bucket.waiters.remove(ticket)
+                    heapq.heapify(bucket.waiters)
+                self._cond.notify_all()
+
+    def record_throttle(self, key: str) -> None:
+        """Multiplicative decrease after the upstream signalled throttling (429 or similar)."""
+        with self._cond:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return
+            bucket.refill(time.monotonic())
+            bucket.throttles += 1
+            bucket.factor = max(AIMD_MIN_FACTOR, bucket.factor * AIMD_DECREASE_FACTOR)
+            bucket.tokens = min(bucket.tokens, bucket.capacity * bucket.factor)
+
+    def record_success(self, key: str) -> None:
+        """Additive increase back towards the configured rate."""
+        with self._cond:
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.factor >= 1.0:
+                return
+            bucket.refill(time.monotonic())
+            bucket.factor = min(1.0, bucket.factor + AIMD_INCREASE_STEP)
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        with self._cond:
+            now = time.monotonic()
+            output: dict[str, dict[str, object]] = {}
+            for key, bucket in self._buckets.items():
+                bucket.refill(now)
+                output[key] = {
+                    "tokens": round(bucket.tokens, 2),
+                    "capacity": bucket.capacity,
+                    "rate_per_second": round(bucket.rate, 4),
+                    "rate_factor": round(bucket.factor, 3),
+                    "waiting": len(bucket.waiters),
+                    "granted": bucket.granted,
+                    "timed_out": bucket.timed_out,
+                    "throttles": bucket.throttles,
+                    "avg_wait_ms": round(bucket.total_wait_seconds / bucket.granted * 1000, 2) if bucket.granted else 0.0,
+                }
+            return output
+
+    def clear(self) -> None:
+        with self._cond:
+            self._buckets.clear()
+            self._cond.notify_all()
+
+
+class SharedTokenBucketRateLimiter:
+    """Token bucket kept in the shared SQLite store so every worker process draws from one budget.
+
+    Ordering across processes is approximated: background callers leave a reserve of tokens that
+    only interactive callers may take.
+    """
+
+    def __init__(self, store: SharedStateStore) -> None:
+        self._store = store
+        self._lock = Lock()
+        self._local: dict[str, dict[str, float]] = defaultdict(
+            lambda: {"granted": 0, "timed_out": 0, "throttles": 0, "total_wait_seconds": 0.0}
+        )
+
+    def _try_take(self, key: str, max_calls: int, period_seconds: int, reserve_fraction: float) -> float:
+        """Take a token if available; otherwise return the seconds until one should be."""
+        base_rate = max_calls / period_seconds
+        now = time.time()
+        with self._store.transaction() as connection:
+            row = connection.execute(
+                "SELECT tokens, updated_at, factor FROM rate_bucket WHERE key = ?",
+                (key,),
+            ).fetchone()
+            tokens, updated_at, factor = row if row is not None else (float(max_calls), now, 1.0)
+            capacity = max_calls * factor
+            rate = base_rate * factor
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+            needed = min(1.0 + capacity * reserve_fraction, max(1.0, capacity))
+            wait = 0.0 if tokens >= needed else (needed - tokens) / rate
+            if wait == 0.0:
+                tokens -= 1.0
+            connection.execute(
+                """
+                INSERT INTO rate_bucket (key, tokens, updated_at, factor) VALUES (?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at
+                """,
+                (key, tokens, now, factor),
+            )
+        return wait
+
+    def allow(self, key: str, max_calls: int, period_seconds: int) -> bool:
+        return self.acquire(key, max_calls, period_seconds, timeout=0)
+
+    def acquire(
+        self,
+        key: str,
+        max_calls: int,
+        period_seconds: int,
+        timeout: float | None = None,
+        priority: int | None = None,
+    ) -> bool:
+        if max_calls <= 0 or period_seconds <= 0:
+            return True
+
+        effective_priority = current_priority() if priority is None else priority
+        reserve_fraction = BACKGROUND_RESERVE_FRACTION if effective_priority > PRIORITY_INTERACTIVE else 0.0
+        started = time.monotonic()
+        while True:
+            wait = self._try_take(key, max_calls, period_seconds, reserve_fraction)
+            now = time.monotonic()
+            if wait == 0.0:
+                with self._lock:
+                    self._local[key]["granted"] += 1
+                    self._local[key]["total_wait_seconds"] += now - started
+                return True
+            remaining = None if timeout is None else started + timeout - now
+            if remaining is not None and remaining <= 0:
+                with self._lock:
+                    self._local[key]["timed_out"] += 1
+                return False
+            sleep_seconds = min(wait, SHARED_POLL_MAX_SECONDS)
+            if remaining is not None:
+                sleep_seconds = min(sleep_seconds, remaining)
+            time.sleep(sleep_seconds)
+
+    def _update_factor(self, key: str, throttled: bool) -> None:
+        with self._store.transaction() as connection:
+            row = connection.execute("SELECT factor FROM rate_bucket WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            factor = row[0]
+            if throttled:
+                factor = max(AIMD_MIN_FACTOR, factor * AIMD_DECREASE_FACTOR)
+            elif factor < 1.0:
+                factor = min(1.0, factor + AIMD_INCREASE_STEP)
+            else:
+                return
+            connection.execute("UPDATE rate_bucket SET factor = ? WHERE key = ?", (factor, key))
+
+    def record_throttle(self, key: str) -> None:
+        with self._lock:
+            self._local[key]["throttles"] += 1
+        self._update_factor(key, throttled=True)
+
+    def record_success(self, key: str) -> None:
+        self._update_factor(key, throttled=False)
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        with self._store.transaction() as connection:
+            rows = connection.execute("SELECT key, tokens, factor FROM rate_bucket").fetchall()
+        with self._lock:
+            local_stats = {key: dict(values) for key, values in self._local.items()}
+        output: dict[str, dict[str, object]] = {}
+        for key, tokens, factor in rows:
+            stats = local_stats.get(key, {"granted": 0, "timed_out": 0, "throttles": 0, "total_wait_seconds": 0.0})
+            granted = int(stats["granted"])
+            output[key] = {
+                "tokens": round(tokens, 2),
+                "rate_factor": round(factor, 3),
+                "shared": True,
+                "granted": granted,
+                "timed_out": int(stats["timed_out"]),
+                "throttles": int(stats["throttles"]),
+                "avg_wait_ms": round(stats["total_wait_seconds"] / granted * 1000, 2) if granted else 0.0,
+            }
+        return output
+
+    def clear(self) -> None:
+        self._store.clear("rate_bucket")
+        with self._lock:
+            self._local.clear()
+
+
+def _build_rate_limiter() -> TokenBucketRateLimiter | SharedTokenBucketRateLimiter:
+    if shared_state_enabled():
+        return SharedTokenBucketRateLimiter(shared_store())
+    return TokenBucketRateLimiter()
+
+
+rate_limiter = _build_rate_limiter()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from threading import Lock
+import time
+from typing import Any, Awaitable, Callable
+
+from app.core.metrics import Histogram, HistogramFamily, ShardedCounter
+
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+RESPONSE_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+UNMATCHED_ROUTE = "unmatched"
+
+# Holds a one-element list per request so handlers running in the threadpool (which get a copy of
+# the context) can still report their cache outcome back to the middleware.
+_cache_outcome: ContextVar[list[str] | None] = ContextVar("request_cache_outcome", default=None)
+
+
+def mark_cache_outcome(cached: bool) -> None:
+    holder = _cache_outcome.get()
+    if holder is not None:
+        holder[0] = "hit" if cached else "miss"
+
+
+class RequestMetrics:
+    """Per-route latency and response size histograms plus an in-flight gauge."""
+
+    def __init__(self) -> None:
+        self.latency = HistogramFamily()
+        self.response_size = HistogramFamily(RESPONSE_SIZE_BUCKETS)
+        self.requests = ShardedCounter()
+        self._in_flight_lock = Lock()
+        self._in_flight = 0
+        self._in_flight_peak = 0
+
+    def started(self) -> None:
+        with self._in_flight_lock:
+            self._in_flight += 1
+            self._in_flight_peak = max(self._in_flight_peak, self._in_flight)
+
+    def finished(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        cache_outcome: str,
+        duration_seconds: float,
+        response_bytes: int,
+    ) -> None:
+        with self._in_flight_lock:
+            self._in_flight -= 1
+        status_text = str(status)
+        self.latency.labels(method, route, status_text, cache_outcome).observe(duration_seconds)
+        self.response_size.labels(method, route).observe(response_bytes)
+        self.requests.inc((method, route, status_text, cache_outcome))
+
+    def in_flight(self) -> int:
+        with self._in_flight_lock:
+            return self._in_flight
+
+    def snapshot(self) -> dict[str, object]:
+        routes: dict[str, dict[str, object]] = {}
+        for (method, route, status, cache_outcome), histogram in self.latency.items():
+            summary = histogram.summary()
+            row = routes.setdefault(f"{method} {route}", {"count": 0, "by_status": {}, "by_cache": {}})
+            row["count"] += summary["count"]
+            row["by_status"][status] = row["by_status"].get(status, 0) + summary["count"]
+            row["by_cache"][cache_outcome] = row["by_cache"].get(cache_outcome, 0) + summary["count"]
+        for (method, route), histogram in self.response_size.items():
+            row = routes.get(f"{method} {route}")
+            if row is not None:
+                size = histogram.summary()
+                row["avg_response_bytes"] = round(size["sum"] / size["count"]) if size["count"] else None
+        for key, row in routes.items():
+            method, route = key.split(" ", 1)
+            row["latency_seconds"] = self._route_quantiles(method, route)
+        with self._in_flight_lock:
+            in_flight, peak = self._in_flight, self._in_flight_peak
+        return {"in_flight": in_flight, "in_flight_peak": peak, "routes": routes}
+
+    def _route_quantiles(self, method: str, route: str) -> dict[str, float | None]:
+        # Merge the per-status/per-cache children so percentiles describe the whole endpoint.
+        merged = Histogram(self.latency.buckets)
+        for (child_method, child_route, _status, _cache), histogram in self.latency.items():
+            if child_method == method and child_route == route:
+                merged.merge(histogram)
+        summary = merged.summary()
+        return {"p50": summary["p50"], "p95": summary["p95"], "p99": summary["p99"]}
+
+    def clear(self) -> None:
+        self.latency.clear()
+        self.response_size.clear()
+        self.requests.clear()
+        with self._in_flight_lock:
+            self._in_flight_peak = self._in_flight
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware; avoids BaseHTTPMiddleware so responses are not buffered or wrapped."""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics | None = None) -> None:
+        self.app = app
+        self.metrics = metrics if metrics is not None else request_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        response_bytes = 0
+        outcome = ["none"]
+        token = _cache_outcome.set(outcome)
+        self.metrics.started()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _cache_outcome.reset(token)
+            route = scope.get("route")
+            self.metrics.finished(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                outcome[0],
+                time.perf_counter() - started,
+                response_bytes,
+            )
+
+
+request_metrics = RequestMetrics()
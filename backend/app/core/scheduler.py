@@ -4,18 +4,41 @@ import asyncio
 import logging
 import os
 from datetime import datetime, timezone
+from functools import partial
+
+from sqlalchemy.orm import Session
 
 from app.core.cache import cache
-from app.core.config import load_instruments
+from app.core.config import InstrumentConfig, load_instruments
+from app.core.deadline import deadline_scope
+from app.core.l2_cache import l2_cache, l2_cache_enabled
+from app.core.leader import LeaderLease
+from app.core.memory import allocation_tracker
+from app.core.profiling import cycle_profiler
+from app.core.quarantine import QuarantinedError
+from app.core.provider_monitor import provider_monitor
+from app.core.rate_limit import PRIORITY_BACKGROUND, priority_scope
+from app.core.stage_timing import StageTimer, activate, cycle_history, stage
+from app.core.settings import (
+    FOLLOWER_POLL_SECONDS,
+    LEADER_ELECTION,
+    LEADER_LEASE_SECONDS,
+    REFRESH_CYCLE_BUDGET_SECONDS,
+)
 from app.db.repository import (
     complete_job_run,
     create_job_run,
+    instrument_ids_by_key,
+    record_job_stages,
     record_provider_stats_snapshot,
     replace_series_points,
     store_summary_items,
     upsert_instruments,
 )
-from app.db.session import session_scope
+from app.db.write_behind import write_queue
+from app.models.summary import SparkPoint, SummaryItem
+from app.providers.fred import fred_client
+from app.services.cache_hydration import sync_cache_from_db
 from app.services.inflation_data import fetch_series_for_instrument as fetch_inflation_series_for_instrument
 from app.services.inflation_data import fetch_summary_for_instruments as fetch_inflation_summary_for_instruments
 from app.services.market_data import fetch_series_for_instrument as fetch_market_series_for_instrument
@@ -37,12 +60,124 @@ def _log_info(event: str, **fields: object) -> None:
     logger.info(event, extra={"event": event, **fields})
 
 
-def _log_exception(event: str, **fields: object) -> None:
-    logger.exception(event, extra={"event": event, **fields})
+def _log_exception(event: str, exc_info: BaseException | bool = True, **fields: object) -> None:
+    logger.exception(event, exc_info=exc_info, extra={"event": event, **fields})
+
+
+def _persist_summary_items(session: Session, items: list[SummaryItem], fetched_at: datetime) -> None:
+    instrument_ids = instrument_ids_by_key(session, [item.id for item in items])
+    store_summary_items(session, instrument_ids, items, fetched_at)
+
+
+def _persist_series(
+    session: Session,
+    instrument_key: str,
+    series_type: str,
+    points_by_range: dict[str, list[SparkPoint]],
+    fetched_at: datetime,
+) -> None:
+    instrument_id = instrument_ids_by_key(session, [instrument_key]).get(instrument_key)
+    if instrument_id is None:
+        return
+    for range_key, points in points_by_range.items():
+        replace_series_points(
+            session,
+            instrument_id=instrument_id,
+            series_type=series_type,
+            range_key=range_key,
+            points=points,
+            fetched_at=fetched_at,
+        )
+
+
+def _persist_job_run(
+    session: Session,
+    *,
+    started_at: datetime,
+    finished_at: datetime,
+    status: str,
+    ok_count: int,
+    fail_count: int,
+    notes: str | None,
+    provider_stats: dict[str, dict[str, object]],
+    timer: StageTimer | None = None,
+) -> None:
+    job_run = create_job_run(session, "cache_refresh", started_at)
+    complete_job_run(
+        session,
+        job_run,
+        finished_at=finished_at,
+        status=status,
+        ok_count=ok_count,
+        fail_count=fail_count,
+        notes=notes,
+    )
+    record_provider_stats_snapshot(session, created_at=finished_at, stats=provider_stats)
+    if timer is not None:
+        # Earlier writes of this cycle were queued first, so their persist stages are already in.
+        record_job_stages(session, job_run, timer.stages())
+
+
+def _publish_l2_snapshot() -> None:
+    entries = {key: (entry.value, entry.fetched_at) for key, entry in cache.entries().items()}
+    l2_cache().publish(
+        entries,
+        last_update=cache.last_update(),
+        last_success_by_module=cache.last_success_by_module(),
+    )
+
+
+async def _fetch_inflation(
+    instruments: list[InstrumentConfig],
+) -> tuple[tuple[list[SummaryItem], dict[str, str]], dict[tuple[str, str], list[SparkPoint] | BaseException]]:
+    """The inflation summary and every instrument x range series, requested concurrently."""
+
+    async def summary() -> tuple[list[SummaryItem], dict[str, str]]:
+        with stage("summary.inflation"):
+            return await fetch_inflation_summary_for_instruments(instruments)
+
+    async def series(instrument: InstrumentConfig, range_key: str) -> list[SparkPoint]:
+        with stage("series.inflation"):
+            return await fetch_inflation_series_for_instrument(instrument, range_key)
+
+    keys = [(instrument, range_key) for instrument in instruments for range_key in INFLATION_RANGES]
+    try:
+        summary_result, series_results = await asyncio.gather(
+            summary(),
+            asyncio.gather(*(series(instrument, range_key) for instrument, range_key in keys), return_exceptions=True),
+        )
+    finally:
+        # The cycle's event loop ends with it; its pooled FRED connections must not outlive it.
+        await fred_client.aclose()
+    return summary_result, {
+        (instrument.id, range_key): result for (instrument, range_key), result in zip(keys, series_results)
+    }
 
 
 def _refresh_once_sync() -> None:
-    instruments = load_instruments()
+    # Every upstream call in the cycle shares one time budget so a hung ticker cannot stall the loop.
+    # Scheduler fetches run at background priority so user-facing cache misses get rate-limit tokens first.
+    # Stage timings are collected on a per-cycle timer and kept in cycle_history once the cycle ends.
+    # cycle_profiler runs the cycle under cProfile only when armed via APP_PROFILE_CYCLES or the admin API.
+    timer = StageTimer()
+    with (
+        cycle_profiler.maybe_profile("cache_refresh"),
+        deadline_scope(REFRESH_CYCLE_BUDGET_SECONDS),
+        priority_scope(PRIORITY_BACKGROUND),
+        activate(timer),
+    ):
+        try:
+            _refresh_cycle(timer)
+        finally:
+            timer.finish()
+            cycle_history.add(timer)
+    # Outside the profiler so snapshotting does not show up in the cycle profile; a no-op unless tracing.
+    allocation_tracker.record_cycle()
+
+
+def _refresh_cycle(timer: StageTimer) -> None:
+    with stage("config_load"):
+        instruments = load_instruments()
     commodities = [item for item in instruments if item.module == "commodities"]
     mag7 = [item for item in instruments if item.module == "mag7"]
     inflation = [item for item in instruments if item.module == "inflation"]
@@ -59,154 +194,246 @@ def _refresh_once_sync() -> None:
         inflation_count=len(inflation),
     )
 
-    with session_scope() as session:
-        instrument_ids = upsert_instruments(session, instruments)
-        job_run = create_job_run(session, "cache_refresh", started_at)
-        ok_count = 0
-        fail_count = 0
-        notes_parts: list[str] = []
+    # Results are published to the cache as soon as they are fetched; persistence is handed to the
+    # write-behind queue so no DB transaction is held open across upstream calls.
+    write_queue.submit(
+        "instruments",
+        timer.timed("persist.instruments", partial(upsert_instruments, instruments=instruments)),
+    )
+    ok_count = 0
+    fail_count = 0
+    notes_parts: list[str] = []
 
+    with stage("summary.commodities"):
         commodity_items, commodity_errors = fetch_market_summary_for_instruments(commodities)
-        commodity_fresh = any(item.last is not None for item in commodity_items)
-        cache.set(
-            "commodities_summary",
-            commodity_items,
-            fetched_at=fetched_at,
-            update_last_update=commodity_fresh,
-            module="commodities",
-        )
-        store_summary_items(session, instrument_ids, commodity_items, fetched_at)
-        ok_count += len(commodity_items) - len(commodity_errors)
-        fail_count += len(commodity_errors)
-        if commodity_errors:
-            notes_parts.append(f"commodities_errors={len(commodity_errors)}")
-        _log_info(
-            "scheduler.refresh.module_summary",
-            module="commodities",
-            item_count=len(commodity_items),
-            error_count=len(commodity_errors),
-            fresh=commodity_fresh,
-        )
+    commodity_fresh = any(item.last is not None for item in commodity_items)
+    cache.set(
+        "commodities_summary",
+        commodity_items,
+        fetched_at=fetched_at,
+        update_last_update=commodity_fresh,
+        module="commodities",
+    )
+    write_queue.submit(
+        "summary:commodities",
+        timer.timed(
+            "persist.summary.commodities",
+            partial(_persist_summary_items, items=commodity_items, fetched_at=fetched_at),
+        ),
+    )
+    ok_count += len(commodity_items) - len(commodity_errors)
+    fail_count += len(commodity_errors)
+    if commodity_errors:
+        notes_parts.append(f"commodities_errors={len(commodity_errors)}")
+    _log_info(
+        "scheduler.refresh.module_summary",
+        module="commodities",
+        item_count=len(commodity_items),
+        error_count=len(commodity_errors),
+        fresh=commodity_fresh,
+    )
 
+    with stage("summary.mag7"):
         mag7_items, mag7_errors = fetch_market_summary_for_instruments(mag7)
-        mag7_fresh = any(item.last is not None for item in mag7_items)
-        cache.set("mag7_summary", mag7_items, fetched_at=fetched_at, update_last_update=mag7_fresh, module="mag7")
-        store_summary_items(session, instrument_ids, mag7_items, fetched_at)
-        ok_count += len(mag7_items) - len(mag7_errors)
-        fail_count += len(mag7_errors)
-        if mag7_errors:
-            notes_parts.append(f"mag7_errors={len(mag7_errors)}")
-        _log_info(
-            "scheduler.refresh.module_summary",
-            module="mag7",
-            item_count=len(mag7_items),
-            error_count=len(mag7_errors),
-            fresh=mag7_fresh,
-        )
+    mag7_fresh = any(item.last is not None for item in mag7_items)
+    cache.set("mag7_summary", mag7_items, fetched_at=fetched_at, update_last_update=mag7_fresh, module="mag7")
+    write_queue.submit(
+        "summary:mag7",
+        timer.timed(
+            "persist.summary.mag7",
+            partial(_persist_summary_items, items=mag7_items, fetched_at=fetched_at),
+        ),
+    )
+    ok_count += len(mag7_items) - len(mag7_errors)
+    fail_count += len(mag7_errors)
+    if mag7_errors:
+        notes_parts.append(f"mag7_errors={len(mag7_errors)}")
+    _log_info(
+        "scheduler.refresh.module_summary",
+        module="mag7",
+        item_count=len(mag7_items),
+        error_count=len(mag7_errors),
+        fresh=mag7_fresh,
+    )
 
-        inflation_items, inflation_errors = fetch_inflation_summary_for_instruments(inflation)
-        inflation_fresh = any(item.last is not None for item in inflation_items)
-        cache.set(
-            "inflation_summary",
-            inflation_items,
-            fetched_at=fetched_at,
-            update_last_update=inflation_fresh,
-            module="inflation",
-        )
-        store_summary_items(session, instrument_ids, inflation_items, fetched_at)
-        ok_count += len(inflation_items) - len(inflation_errors)
-        fail_count += len(inflation_errors)
-        if inflation_errors:
-            notes_parts.append(f"inflation_errors={len(inflation_errors)}")
-        _log_info(
-            "scheduler.refresh.module_summary",
-            module="inflation",
-            item_count=len(inflation_items),
-            error_count=len(inflation_errors),
-            fresh=inflation_fresh,
-        )
+    # FRED is async: the inflation summary and all inflation series go out together on one event loop
+    # for the cycle, and are published below in the usual order.
+    (inflation_items, inflation_errors), inflation_series = asyncio.run(_fetch_inflation(inflation))
+    inflation_fresh = any(item.last is not None for item in inflation_items)
+    cache.set(
+        "inflation_summary",
+        inflation_items,
+        fetched_at=fetched_at,
+        update_last_update=inflation_fresh,
+        module="inflation",
+    )
+    write_queue.submit(
+        "summary:inflation",
+        timer.timed(
+            "persist.summary.inflation",
+            partial(_persist_summary_items, items=inflation_items, fetched_at=fetched_at),
+        ),
+    )
+    ok_count += len(inflation_items) - len(inflation_errors)
+    fail_count += len(inflation_errors)
+    if inflation_errors:
+        notes_parts.append(f"inflation_errors={len(inflation_errors)}")
+    _log_info(
+        "scheduler.refresh.module_summary",
+        module="inflation",
+        item_count=len(inflation_items),
+        error_count=len(inflation_errors),
+        fresh=inflation_fresh,
+    )
 
-        for instrument in commodities:
-            for range_key in COMMODITY_RANGES:
-                try:
+    for instrument in commodities:
+        points_by_range: dict[str, list[SparkPoint]] = {}
+        for range_key in COMMODITY_RANGES:
+            try:
+                with stage("series.commodities"):
                     points = fetch_market_series_for_instrument(instrument, range_key)
-                    cache.set(f"series:{instrument.id}:{range_key}", points, fetched_at=fetched_at, update_last_update=False)
-                    instrument_id = instrument_ids.get(instrument.id)
-                    if instrument_id is not None:
-                        replace_series_points(
-                            session,
-                            instrument_id=instrument_id,
-                            series_type="commodities",
-                            range_key=range_key,
-                            points=points,
-                            fetched_at=fetched_at,
-                        )
-                except Exception:
-                    fail_count += 1
-                    _log_exception(
-                        "scheduler.refresh.series_failed",
-                        module="commodities",
-                        instrument_id=instrument.id,
-                        range_key=range_key,
-                    )
-
-        for instrument in inflation:
-            for range_key in INFLATION_RANGES:
-                try:
-                    points = fetch_inflation_series_for_instrument(instrument, range_key)
-                    cache.set(f"inflation_series:{instrument.id}:{range_key}", points, fetched_at=fetched_at, update_last_update=False)
-                    instrument_id = instrument_ids.get(instrument.id)
-                    if instrument_id is not None:
-                        replace_series_points(
-                            session,
-                            instrument_id=instrument_id,
-                            series_type="inflation",
-                            range_key=range_key,
-                            points=points,
-                            fetched_at=fetched_at,
-                        )
-                except Exception:
-                    fail_count += 1
-                    _log_exception(
-                        "scheduler.refresh.series_failed",
-                        module="inflation",
-                        instrument_id=instrument.id,
-                        range_key=range_key,
-                    )
-
-        record_provider_stats_snapshot(session, created_at=datetime.now(timezone.utc))
-        finished_at = datetime.now(timezone.utc)
-        status = "partial" if fail_count > 0 else "success"
-        complete_job_run(
-            session,
-            job_run,
+                points_by_range[range_key] = points
+            except QuarantinedError:
+                # Same ticker for every range; the last persisted series stays in place.
+                fail_count += 1
+                _log_info("scheduler.refresh.series_quarantined", module="commodities", instrument_id=instrument.id)
+                break
+            except Exception:
+                fail_count += 1
+                _log_exception(
+                    "scheduler.refresh.series_failed",
+                    module="commodities",
+                    instrument_id=instrument.id,
+                    range_key=range_key,
+                )
+        if points_by_range:
+            # One generation per instrument rather than one per range.
+            cache.set_many(
+                {f"series:{instrument.id}:{range_key}": points for range_key, points in points_by_range.items()},
+                fetched_at=fetched_at,
+                update_last_update=False,
+            )
+            write_queue.submit(
+                f"series:commodities:{instrument.id}",
+                timer.timed(
+                    "persist.series.commodities",
+                    partial(
+                        _persist_series,
+                        instrument_key=instrument.id,
+                        series_type="commodities",
+                        points_by_range=points_by_range,
+                        fetched_at=fetched_at,
+                    ),
+                ),
+            )
+
+    for instrument in inflation:
+        points_by_range = {}
+        quarantined = False
+        for range_key in INFLATION_RANGES:
+            result = inflation_series[(instrument.id, range_key)]
+            if isinstance(result, QuarantinedError):
+                quarantined = True
+            elif isinstance(result, BaseException):
+                fail_count += 1
+                _log_exception(
+                    "scheduler.refresh.series_failed",
+                    exc_info=result,
+                    module="inflation",
+                    instrument_id=instrument.id,
+                    range_key=range_key,
+                )
+            else:
+                points_by_range[range_key] = result
+        if quarantined:
+            # Same ticker for every range, fetched concurrently: counted once, and the last persisted
+            # series stays in place for the ranges the quarantine refused.
+            fail_count += 1
+            _log_info("scheduler.refresh.series_quarantined", module="inflation", instrument_id=instrument.id)
+        if points_by_range:
+            # One generation per instrument rather than one per range.
+            cache.set_many(
+                {f"inflation_series:{instrument.id}:{range_key}": points for range_key, points in points_by_range.items()},
+                fetched_at=fetched_at,
+                update_last_update=False,
+            )
+            write_queue.submit(
+                f"series:inflation:{instrument.id}",
+                timer.timed(
+                    "persist.series.inflation",
+                    partial(
+                        _persist_series,
+                        instrument_key=instrument.id,
+                        series_type="inflation",
+                        points_by_range=points_by_range,
+                        fetched_at=fetched_at,
+                    ),
+                ),
+            )
+
+    finished_at = datetime.now(timezone.utc)
+    status = "partial" if fail_count > 0 else "success"
+    write_queue.submit(
+        "job_run",
+        partial(
+            _persist_job_run,
+            started_at=started_at,
             finished_at=finished_at,
             status=status,
             ok_count=ok_count,
             fail_count=fail_count,
             notes=", ".join(notes_parts) if notes_parts else None,
-        )
-        duration_ms = int((finished_at - started_at).total_seconds() * 1000)
-        _log_info(
-            "scheduler.refresh.completed",
-            job_name="cache_refresh",
-            status=status,
-            ok_count=ok_count,
-            fail_count=fail_count,
-            duration_ms=duration_ms,
-        )
+            provider_stats=provider_monitor.snapshot(),
+            timer=timer,
+        ),
+    )
+    if l2_cache_enabled():
+        try:
+            with stage("l2_publish"):
+                _publish_l2_snapshot()
+        except Exception:
+            _log_exception("scheduler.refresh.l2_publish_failed", job_name="cache_refresh")
+    duration_ms = int((finished_at - started_at).total_seconds() * 1000)
+    _log_info(
+        "scheduler.refresh.completed",
+        job_name="cache_refresh",
+        status=status,
+        ok_count=ok_count,
+        fail_count=fail_count,
+        duration_ms=duration_ms,
+    )
 
 
 class CacheRefreshScheduler:
-    def __init__(self, interval_seconds: int = REFRESH_INTERVAL_SECONDS) -> None:
+    """Periodic cache refresh.
+
+    With leader election enabled only the process holding the `cache_refresh` lease calls the
+    providers; the others poll the job_run table and load each committed cycle into their own cache.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: int = REFRESH_INTERVAL_SECONDS,
+        leader_election: bool = LEADER_ELECTION,
+        lease_seconds: int = LEADER_LEASE_SECONDS,
+        follower_poll_seconds: int = FOLLOWER_POLL_SECONDS,
+    ) -> None:
         self.interval_seconds = interval_seconds
+        self.follower_poll_seconds = follower_poll_seconds
+        self.lease = LeaderLease("cache_refresh", lease_seconds) if leader_election else None
         self._task: asyncio.Task[None] | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
         self._stop_event = asyncio.Event()
+        self._last_synced_cycle: datetime | None = None
+        self._last_follower_sync_at: datetime | None = None
 
     async def start(self) -> None:
         if not scheduler_enabled() or self._task is not None:
             return
         self._stop_event.clear()
+        if self.lease is not None:
+            await asyncio.to_thread(self.lease.try_acquire)
+            self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="cache-refresh-lease")
         self._task = asyncio.create_task(self._run(), name="cache-refresh-scheduler")
 
     async def stop(self) -> None:
@@ -215,16 +442,55 @@ class CacheRefreshScheduler:
         self._stop_event.set()
         await self._task
         self._task = None
+        if self._heartbeat_task is not None:
+            await self._heartbeat_task
+            self._heartbeat_task = None
+        if self.lease is not None:
+            await asyncio.to_thread(self.lease.release)
+
+    def is_leader(self) -> bool:
+        return self.lease is None or self.lease.is_leader
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval_seconds,
+            "leader_election": self.lease is not None,
+            "is_leader": self.is_leader(),
+            "lease": self.lease.snapshot() if self.lease is not None else None,
+            "last_synced_cycle": self._last_synced_cycle.isoformat() if self._last_synced_cycle else None,
+            "last_follower_sync_at": (
+                self._last_follower_sync_at.isoformat() if self._last_follower_sync_at else None
+            ),
+        }
+
+    def _sync_from_leader(self) -> None:
+        self._last_synced_cycle = sync_cache_from_db(self._last_synced_cycle)
+        self._last_follower_sync_at = datetime.now(timezone.utc)
+
+    async def _heartbeat(self) -> None:
+        # Renew well inside the lease so one slow heartbeat does not hand leadership away.
+        interval = max(1.0, self.lease.lease_seconds / 3)
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=interval)
+            except TimeoutError:
+                await asyncio.to_thread(self.lease.try_acquire)
 
     async def _run(self) -> None:
         while not self._stop_event.is_set():
+            leader = self.is_leader()
             try:
-                await asyncio.to_thread(_refresh_once_sync)
+                if leader:
+                    await asyncio.to_thread(_refresh_once_sync)
+                else:
+                    await asyncio.to_thread(self._sync_from_leader)
             except Exception:
-                _log_exception("scheduler.refresh.loop_failed")
+                _log_exception("scheduler.refresh.loop_failed" if leader else "scheduler.follower_sync_failed")
 
+            timeout = self.interval_seconds if leader else self.follower_poll_seconds
             try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval_seconds)
+                await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
             except TimeoutError:
                 continue
 
@@ -16,10 +16,69 @@ def _int_env(name: str, default: int) -> int:
     return parsed
 
 
+def _bool_env(name: str, default: bool = False) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.lower() in {"1", "true", "yes", "on"}
+
+
+def cache_only_serving() -> bool:
+    """When on, routes answer from cache or DB only and never call upstream providers."""
+    return _bool_env("APP_CACHE_ONLY")
+
+
 YAHOO_MAX_CALLS = _int_env("APP_YAHOO_MAX_CALLS", 120)
 YAHOO_PERIOD_SECONDS = _int_env("APP_YAHOO_PERIOD_SECONDS", 60)
 FRED_MAX_CALLS = _int_env("APP_FRED_MAX_CALLS", 60)
 FRED_PERIOD_SECONDS = _int_env("APP_FRED_PERIOD_SECONDS", 60)
+RATE_LIMIT_MAX_WAIT_SECONDS = _int_env("APP_RATE_LIMIT_MAX_WAIT_SECONDS", 5)
 
 UPSTREAM_RETRY_ATTEMPTS = _int_env("APP_UPSTREAM_RETRY_ATTEMPTS", 3)
 UPSTREAM_RETRY_BASE_MS = _int_env("APP_UPSTREAM_RETRY_BASE_MS", 250)
+UPSTREAM_CALL_TIMEOUT_SECONDS = _int_env("APP_UPSTREAM_CALL_TIMEOUT_SECONDS", 10)
+REFRESH_CYCLE_BUDGET_SECONDS = _int_env("APP_REFRESH_CYCLE_BUDGET_SECONDS", 45)
+REQUEST_UPSTREAM_BUDGET_SECONDS = _int_env("APP_REQUEST_UPSTREAM_BUDGET_SECONDS", 8)
+UPSTREAM_CONCURRENCY = _int_env("APP_UPSTREAM_CONCURRENCY", 8)
+
+FRED_BASE_URL = os.getenv("APP_FRED_BASE_URL", "https://fred.stlouisfed.org").rstrip("/")
+HTTP_POOL_SIZE = _int_env("APP_HTTP_POOL_SIZE", 4)
+HTTP_IDLE_SECONDS = _int_env("APP_HTTP_IDLE_SECONDS", 30)
+YAHOO_SESSION_MAX_AGE_SECONDS = _int_env("APP_YAHOO_SESSION_MAX_AGE_SECONDS", 3600)
+
+CIRCUIT_FAILURE_THRESHOLD = _int_env("APP_CIRCUIT_FAILURE_THRESHOLD", 5)
+CIRCUIT_RESET_SECONDS = _int_env("APP_CIRCUIT_RESET_SECONDS", 30)
+CIRCUIT_PER_TICKER = _bool_env("APP_CIRCUIT_PER_TICKER")
+
+QUARANTINE_FAILURE_THRESHOLD = _int_env("APP_QUARANTINE_FAILURE_THRESHOLD", 3)
+QUARANTINE_BASE_SECONDS = _int_env("APP_QUARANTINE_BASE_SECONDS", 300)
+QUARANTINE_MAX_SECONDS = _int_env("APP_QUARANTINE_MAX_SECONDS", 21600)
+
+CACHE_JANITOR_INTERVAL_SECONDS = _int_env("APP_CACHE_JANITOR_INTERVAL_SECONDS", 30)
+CACHE_MAX_SUMMARY_ENTRIES = _int_env("APP_CACHE_MAX_SUMMARY_ENTRIES", 64)
+CACHE_MAX_SERIES_ENTRIES = _int_env("APP_CACHE_MAX_SERIES_ENTRIES", 2000)
+CACHE_MAX_SERIES_BYTES = _int_env("APP_CACHE_MAX_SERIES_MB", 64) * 1024 * 1024
+
+WRITE_QUEUE_MAX_PENDING = _int_env("APP_WRITE_QUEUE_MAX_PENDING", 1000)
+WRITE_BATCH_SIZE = _int_env("APP_WRITE_BATCH_SIZE", 200)
+
+LEADER_ELECTION = _bool_env("APP_LEADER_ELECTION")
+LEADER_LEASE_SECONDS = _int_env("APP_LEADER_LEASE_SECONDS", 90)
+FOLLOWER_POLL_SECONDS = _int_env("APP_FOLLOWER_POLL_SECONDS", 5)
+
+SHARED_STATE_BACKEND = os.getenv("APP_SHARED_STATE", "local").lower()
+SHARED_STATE_PATH = os.getenv("APP_SHARED_STATE_PATH")
+
+L2_CACHE = _bool_env("APP_L2_CACHE")
+L2_CACHE_DIR = os.getenv("APP_L2_CACHE_DIR")
+
+CONFIG_CHECK_INTERVAL_SECONDS = _int_env("APP_CONFIG_CHECK_INTERVAL_SECONDS", 5)
+
+ADMIN_TOKEN = os.getenv("APP_ADMIN_TOKEN") or None
+PROFILE_DIR = os.getenv("APP_PROFILE_DIR")
+PROFILE_CYCLES = _int_env("APP_PROFILE_CYCLES", 0)
+MEMORY_TRACING = _bool_env("APP_MEMORY_TRACING")
+
+PROVIDER_MODE = os.getenv("APP_PROVIDER_MODE", "live").lower()
+PROVIDER_ARCHIVE_DIR = os.getenv("APP_PROVIDER_ARCHIVE_DIR")
+REPLAY_LATENCY_MS = _int_env("APP_REPLAY_LATENCY_MS", 0)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+import sqlite3
+from threading import Lock, local
+from typing import Iterator
+
+from app.core.settings import SHARED_STATE_BACKEND, SHARED_STATE_PATH
+
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS rate_bucket (
+        key TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        factor REAL NOT NULL DEFAULT 1.0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS provider_counter (
+        provider TEXT NOT NULL,
+        field TEXT NOT NULL,
+        value INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (provider, field)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS provider_attribute (
+        provider TEXT NOT NULL,
+        field TEXT NOT NULL,
+        value TEXT,
+        PRIMARY KEY (provider, field)
+    )
+    """,
+)
+
+
+def shared_state_enabled() -> bool:
+    return SHARED_STATE_BACKEND == "sqlite"
+
+
+def default_shared_state_path() -> Path:
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "data" / "shared_state.db"
+
+
+class SharedStateStore:
+    """Small SQLite file that lets worker processes on one host coordinate limiter and monitor state.
+
+    Each thread keeps its own connection; writes use BEGIN IMMEDIATE so read-modify-write is atomic
+    across processes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = local()
+        self._schema_lock = Lock()
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    for statement in SCHEMA:
+                        connection.execute(statement)
+                    self._schema_ready = True
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def increment(self, provider: str, field: str, delta: int = 1) -> None:
+        with self.transaction() as connection:
+            connection.execute(
+                """
+                INSERT INTO provider_counter (provider, field, value) VALUES (?, ?, ?)
+                ON CONFLICT (provider, field) DO UPDATE SET value = value + excluded.value
+                """,
+                (provider, field, delta),
+            )
+
+    def set_attributes(self, provider: str, values: dict[str, str | None]) -> None:
+        with self.transaction() as connection:
+            connection.executemany(
+                """
+                INSERT INTO provider_attribute (provider, field, value) VALUES (?, ?, ?)
+                ON CONFLICT (provider, field) DO UPDATE SET value = excluded.value
+                """,
+                [(provider, field, value) for field, value in values.items()],
+            )
+
+    def provider_rows(self) -> dict[str, dict[str, object]]:
+        connection = self._connection()
+        output: dict[str, dict[str, object]] = {}
+        for provider, field, value in connection.execute("SELECT provider, field, value FROM provider_counter"):
+            output.setdefault(provider, {})[field] = value
+        for provider, field, value in connection.execute("SELECT provider, field, value FROM provider_attribute"):
+            output.setdefault(provider, {})[field] = value
+        return output
+
+    def clear(self, *tables: str) -> None:
+        with self.transaction() as connection:
+            for table in tables or ("rate_bucket", "provider_counter", "provider_attribute"):
+                connection.execute(f"DELETE FROM {table}")
+
+
+_store: SharedStateStore | None = None
+
+
+def shared_store() -> SharedStateStore:
+    global _store
+    if _store is None:
+        _store = SharedStateStore(Path(SHARED_STATE_PATH) if SHARED_STATE_PATH else default_shared_state_path())
+    return _store
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from threading import Lock
+import time
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+HISTORY_SIZE = 50
+
+_stage_path: ContextVar[str] = ContextVar("stage_path", default="")
+
+
+class StageTimer:
+    """Named, possibly nested stage timings for one scheduler cycle.
+
+    Stages with the same name accumulate (total time and call count), so per-instrument work such
+    as series fetches shows up as one stage. Nested stages are qualified by their parent, e.g.
+    `summary.commodities.metrics`. The writer thread records persistence stages on the same timer.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self._origin = time.perf_counter()
+        self._lock = Lock()
+        self._stages: dict[str, dict[str, float]] = {}
+        self.finished_at: datetime | None = None
+        self.duration_ms: float | None = None
+
+    def _record(self, name: str, started: float, elapsed: float) -> None:
+        with self._lock:
+            row = self._stages.get(name)
+            if row is None:
+                self._stages[name] = {
+                    "duration_ms": elapsed * 1000,
+                    "calls": 1,
+                    "offset_ms": (started - self._origin) * 1000,
+                }
+            else:
+                row["duration_ms"] += elapsed * 1000
+                row["calls"] += 1
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        parent = _stage_path.get()
+        qualified = f"{parent}.{name}" if parent else name
+        token = _stage_path.set(qualified)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(qualified, started, time.perf_counter() - started)
+            _stage_path.reset(token)
+
+    def timed(self, name: str, fn: Callable[..., T]) -> Callable[..., T]:
+        def run(*args: object, **kwargs: object) -> T:
+            with self.measure(name):
+                return fn(*args, **kwargs)
+
+        return run
+
+    def finish(self) -> None:
+        self.finished_at = datetime.now(timezone.utc)
+        self.duration_ms = round((time.perf_counter() - self._origin) * 1000, 2)
+
+    def stages(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "duration_ms": round(row["duration_ms"], 2),
+                    "calls": int(row["calls"]),
+                    "offset_ms": round(row["offset_ms"], 2),
+                }
+                for name, row in sorted(self._stages.items(), key=lambda item: item[1]["offset_ms"])
+            }
+
+    def summary(self) -> dict[str, object]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": self.duration_ms,
+            "stages": self.stages(),
+        }
+
+
+_current_timer: ContextVar[StageTimer | None] = ContextVar("current_stage_timer", default=None)
+
+
+@contextmanager
+def activate(timer: StageTimer) -> Iterator[StageTimer]:
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block against the active cycle timer; a no-op outside a scheduler cycle."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.measure(name):
+        yield
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return round(ordered[index], 2)
+
+
+class CycleHistory:
+    """Timers of the most recent cycles; persistence stages keep landing on them after the cycle."""
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        self._lock = Lock()
+        self._timers: deque[StageTimer] = deque(maxlen=size)
+
+    def add(self, timer: StageTimer) -> None:
+        with self._lock:
+            self._timers.append(timer)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            timers = list(self._timers)
+        return summarize_cycles([timer.summary() for timer in timers])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._timers.clear()
+
+
+def summarize_cycles(cycles: list[dict[str, object]]) -> dict[str, object]:
+    """Rolling summary over cycle dicts shaped like StageTimer.summary(), oldest first."""
+    if not cycles:
+        return {"cycles": 0, "last_cycle": None, "cycle_duration_ms": None, "stages": {}}
+    by_stage: dict[str, list[float]] = {}
+    for cycle in cycles:
+        for name, row in cycle["stages"].items():
+            by_stage.setdefault(name, []).append(row["duration_ms"])
+    durations = [cycle["duration_ms"] for cycle in cycles if cycle["duration_ms"] is not None]
+    return {
+        "cycles": len(cycles),
+        "last_cycle": cycles[-1],
+        "cycle_duration_ms": _rolling(durations),
+        "stages": {name: _rolling(values) for name, values in by_stage.items()},
+    }
+
+
+def _rolling(values: list[float]) -> dict[str, float | int] | None:
+    if not values:
+        return None
+    return {
+        "samples": len(values),
+        "p50": _percentile(values, 0.5),
+        "p95": _percentile(values, 0.95),
+        "max": round(max(values), 2),
+    }
+
+
+cycle_history = CycleHistory()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import os
+from threading import Lock
+import time
+from typing import Iterator
+
+
+def _process_age_seconds() -> float | None:
+    # Wall time since the OS started this process (Linux only); covers interpreter and import cost.
+    try:
+        with open("/proc/self/stat", encoding="utf-8") as handle:
+            fields = handle.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", encoding="utf-8") as handle:
+            uptime_seconds = float(handle.read().split()[0])
+        start_ticks = int(fields[19])
+        return uptime_seconds - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupMetrics:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._phases: dict[str, float] = {}
+        self._details: dict[str, object] = {}
+        self._ready_at: datetime | None = None
+        self._since_process_start_ms: float | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            with self._lock:
+                self._phases[name] = elapsed_ms
+
+    def record(self, name: str, value: object) -> None:
+        with self._lock:
+            self._details[name] = value
+
+    def mark_ready(self) -> None:
+        age = _process_age_seconds()
+        with self._lock:
+            self._ready_at = datetime.now(timezone.utc)
+            self._since_process_start_ms = round(age * 1000, 2) if age is not None else None
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "phases_ms": dict(self._phases),
+                "total_ms": round(sum(self._phases.values()), 2),
+                "since_process_start_ms": self._since_process_start_ms,
+                "ready_at": self._ready_at.isoformat() if self._ready_at else None,
+                **self._details,
+            }
+
+
+startup_metrics = StartupMetrics()
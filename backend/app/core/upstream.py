@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from functools import partial
+from threading import Lock
+from typing import Awaitable, Callable, TypeVar
+
+from app.core.settings import REQUEST_UPSTREAM_BUDGET_SECONDS, UPSTREAM_CONCURRENCY
+
+T = TypeVar("T")
+
+# The deadline inside the call stops retries cooperatively; this only covers a call that overruns it.
+GRACE_SECONDS = 2.0
+
+
+class UpstreamTimeout(Exception):
+    """A request handler gave up waiting for an upstream fill; mapped to 504 in app.main."""
+
+
+class UpstreamExecutor:
+    """Runs provider fills for async route handlers: blocking ones on a dedicated, bounded pool,
+    coroutine ones (FRED) as tasks on the event loop.
+
+    Handlers await the fill instead of occupying one of the server's threadpool workers, so a burst
+    of cache misses queues here while cache hits keep being served on the event loop. Concurrent
+    misses for the same key share one in-flight fill (single flight).
+    """
+
+    def __init__(self, max_workers: int = UPSTREAM_CONCURRENCY) -> None:
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> dict[str, int]:
+        return {"fills": 0, "coalesced": 0, "timeouts": 0, "in_flight": 0, "in_flight_peak": 0}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="upstream")
+            return self._executor
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+            if name == "in_flight":
+                self._stats["in_flight_peak"] = max(self._stats["in_flight_peak"], self._stats["in_flight"])
+
+    async def run(
+        self,
+        key: str,
+        fn: Callable[..., T],
+        *args: object,
+        timeout: float = REQUEST_UPSTREAM_BUDGET_SECONDS + GRACE_SECONDS,
+        **kwargs: object,
+    ) -> T:
+        def start() -> asyncio.Future:
+            # copy_context: deadline, priority and cache-outcome context vars must reach the worker.
+            context = contextvars.copy_context()
+            return asyncio.get_running_loop().run_in_executor(self._pool(), context.run, partial(fn, *args, **kwargs))
+
+        return await self._single_flight(key, start, timeout)
+
+    async def run_async(
+        self,
+        key: str,
+        fn: Callable[..., Awaitable[T]],
+        *args: object,
+        timeout: float = REQUEST_UPSTREAM_BUDGET_SECONDS + GRACE_SECONDS,
+        **kwargs: object,
+    ) -> T:
+        """Like run(), for a coroutine function; the task inherits the caller's context vars."""
+        return await self._single_flight(key, lambda: asyncio.ensure_future(fn(*args, **kwargs)), timeout)
+
+    async def _single_flight(self, key: str, start: Callable[[], asyncio.Future], timeout: float):
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count("coalesced")
+        else:
+            future = start()
+            self._inflight[key] = future
+            self._count("fills")
+            self._count("in_flight")
+            future.add_done_callback(partial(self._finished, key))
+        try:
+            # shield: one waiter timing out must not cancel the fill the other waiters share.
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except TimeoutError as exc:
+            self._count("timeouts")
+            raise UpstreamTimeout(f"Upstream fill for {key} did not finish within {timeout:.0f}s.") from exc
+
+    def _finished(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        self._count("in_flight", -1)
+        if not future.cancelled():
+            # Mark a failure as retrieved; every waiter has already received it.
+            future.exception()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"max_workers": self.max_workers, **self._stats}
+
+    def clear(self) -> None:
+        with self._lock:
+            in_flight = self._stats["in_flight"]
+            self._stats = self._empty_stats()
+            self._stats["in_flight"] = in_flight
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+upstream_executor = UpstreamExecutor()
@@ -1,3 +1,3 @@
-from app.db.session import get_session, init_db, reset_database_engine, session_scope
+from app.db.session import get_engine, get_session, init_db, reset_database_engine, session_scope
 
-__all__ = ["get_session", "init_db", "reset_database_engine", "session_scope"]
+__all__ = ["get_engine", "get_session", "init_db", "reset_database_engine", "session_scope"]
@@ -1,20 +1,67 @@
 from __future__ import annotations
 
 from pathlib import Path
+import re
 
-from alembic import command
-from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.db.session import get_engine
 
 
 BACKEND_ROOT = Path(__file__).resolve().parents[2]
 ALEMBIC_INI = BACKEND_ROOT / "alembic.ini"
+VERSIONS_DIR = BACKEND_ROOT / "alembic" / "versions"
+
+_REVISION_RE = re.compile(r"^revision\s*=\s*[\"']([^\"']+)[\"']", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision\s*=\s*(.+)$", re.MULTILINE)
+_QUOTED_RE = re.compile(r"[\"']([^\"']+)[\"']")
+
 
+def _alembic_config():
+    from alembic.config import Config
 
-def _alembic_config() -> Config:
     config = Config(str(ALEMBIC_INI))
     config.set_main_option("script_location", str(BACKEND_ROOT / "alembic"))
     return config
 
 
-def upgrade_to_head() -> None:
+def head_revisions() -> set[str]:
+    """Head revision ids read straight from the version files, without loading Alembic."""
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_RE.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION_RE.search(source)
+        if down_revision is not None:
+            parents.update(_QUOTED_RE.findall(down_revision.group(1)))
+    return revisions - parents
+
+
+def current_revisions() -> set[str]:
+    try:
+        with get_engine().connect() as connection:
+            rows = connection.execute(text("SELECT version_num FROM alembic_version")).scalars()
+            return set(rows)
+    except DBAPIError:
+        return set()
+
+
+def is_at_head() -> bool:
+    heads = head_revisions()
+    return bool(heads) and current_revisions() == heads
+
+
+def upgrade_to_head() -> bool:
+    """Upgrade the schema to head. Returns False when the stored revision already matched head."""
+    if is_at_head():
+        return False
+
+    from alembic import command
+
     command.upgrade(_alembic_config(), "head")
+    return True
@@ -69,6 +69,17 @@ class JobRun(Base):
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
+class JobStage(Base):
+    __tablename__ = "job_stage"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_run_id: Mapped[int] = mapped_column(ForeignKey("job_run.id", ondelete="CASCADE"), index=True)
+    name: Mapped[str] = mapped_column(String(128))
+    duration_ms: Mapped[float] = mapped_column(Float)
+    calls: Mapped[int] = mapped_column(Integer, default=1)
+    offset_ms: Mapped[float] = mapped_column(Float)
+
+
 class ProviderEvent(Base):
     __tablename__ = "provider_event"
 
@@ -77,3 +88,25 @@ class ProviderEvent(Base):
     event_type: Mapped[str] = mapped_column(String(32), index=True)
     message: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    attempts: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    successes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    failures: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    retries: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    short_circuited: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    timeouts: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    payload_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    latency_p50_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    latency_p95_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    latency_p99_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rate_limit_wait_p95_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_lease"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128))
+    acquired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -2,13 +2,26 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import delete
+from sqlalchemy import and_, case, delete, func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.provider_monitor import provider_monitor
-from app.db.models import Instrument, JobRun, ProviderEvent, QuoteSnapshot, SeriesPoint
+from app.db.models import (
+    Instrument,
+    JobRun,
+    JobStage,
+    ProviderEvent,
+    QuoteSnapshot,
+    SchedulerLease,
+    SeriesPoint,
+)
 from app.models.summary import SparkPoint, SummaryItem
 
+# Summary sparklines are stored as they were served, beside the real series; no range route reads them.
+SPARKLINE_SERIES_TYPE = "sparkline"
+SPARKLINE_RANGE_KEY = "summary"
+
 
 def upsert_instruments(session: Session, instruments) -> dict[str, int]:
     existing = {
@@ -43,6 +56,11 @@ def upsert_instruments(session: Session, instruments) -> dict[str, int]:
     return mapping
 
 
+def instrument_ids_by_key(session: Session, instrument_keys: list[str]) -> dict[str, int]:
+    rows = session.query(Instrument.instrument_key, Instrument.id).filter(Instrument.instrument_key.in_(instrument_keys))
+    return {key: row_id for key, row_id in rows}
+
+
 def store_summary_items(
     session: Session,
     instrument_ids: dict[str, int],
@@ -67,6 +85,14 @@ def store_summary_items(
                 is_stale=item.is_stale,
             )
         )
+        replace_series_points(
+            session,
+            instrument_id=instrument_id,
+            series_type=SPARKLINE_SERIES_TYPE,
+            range_key=SPARKLINE_RANGE_KEY,
+            points=item.sparkline,
+            fetched_at=fetched_at,
+        )
 
 
 def replace_series_points(
@@ -77,6 +103,9 @@ def replace_series_points(
     points: list[SparkPoint],
     fetched_at: datetime,
 ) -> None:
+    # Sessions do not autoflush; rows added by an earlier replace in the same write batch must be
+    # in the table before the delete, or both sets would survive.
+    session.flush()
     session.execute(
         delete(SeriesPoint).where(
             SeriesPoint.instrument_id == instrument_id,
@@ -121,18 +150,156 @@ def complete_job_run(
     job_run.notes = notes
 
 
-def record_provider_stats_snapshot(session: Session, created_at: datetime) -> None:
-    stats = provider_monitor.snapshot()
+def record_job_stages(session: Session, job_run: JobRun, stages: dict[str, dict[str, float]]) -> None:
+    session.flush()
+    for name, row in stages.items():
+        session.add(
+            JobStage(
+                job_run_id=job_run.id,
+                name=name,
+                duration_ms=row["duration_ms"],
+                calls=int(row["calls"]),
+                offset_ms=row["offset_ms"],
+            )
+        )
+
+
+def recent_job_stages(session: Session, job_name: str, limit: int) -> list[tuple[JobRun, list[JobStage]]]:
+    runs = (
+        session.query(JobRun)
+        .filter(JobRun.job_name == job_name, JobRun.finished_at.isnot(None))
+        .order_by(JobRun.id.desc())
+        .limit(limit)
+        .all()
+    )
+    if not runs:
+        return []
+    stages: dict[int, list[JobStage]] = {run.id: [] for run in runs}
+    for row in (
+        session.query(JobStage).filter(JobStage.job_run_id.in_(stages)).order_by(JobStage.offset_ms)
+    ):
+        stages[row.job_run_id].append(row)
+    return [(run, stages[run.id]) for run in reversed(runs)]
+
+
+def _as_ms(seconds: object) -> float | None:
+    return round(float(seconds) * 1000, 2) if seconds is not None else None
+
+
+def record_provider_stats_snapshot(
+    session: Session,
+    created_at: datetime,
+    stats: dict[str, dict[str, object]] | None = None,
+) -> None:
+    if stats is None:
+        stats = provider_monitor.snapshot()
     for provider, values in stats.items():
+        latency = values.get("latency_seconds") or {}
+        waits = values.get("rate_limit_wait_seconds") or {}
         session.add(
             ProviderEvent(
                 provider=provider,
                 event_type="stats_snapshot",
-                message=(
-                    f"attempts={values.get('attempts', 0)} "
-                    f"success={values.get('success', 0)} fail={values.get('fail', 0)} "
-                    f"retries={values.get('retries', 0)}"
-                ),
                 created_at=created_at,
+                attempts=int(values.get("attempts", 0)),
+                successes=int(values.get("success", 0)),
+                failures=int(values.get("fail", 0)),
+                retries=int(values.get("retries", 0)),
+                short_circuited=int(values.get("short_circuited", 0)),
+                timeouts=int(values.get("timeouts", 0)),
+                payload_bytes=int(values.get("payload_bytes", 0)),
+                latency_p50_ms=_as_ms(latency.get("p50")),
+                latency_p95_ms=_as_ms(latency.get("p95")),
+                latency_p99_ms=_as_ms(latency.get("p99")),
+                rate_limit_wait_p95_ms=_as_ms(waits.get("p95")),
+                last_error=values.get("last_error"),
             )
         )
+
+
+def latest_quote_snapshots(session: Session, instrument_keys: list[str] | None = None) -> dict[str, QuoteSnapshot]:
+    latest_query = session.query(QuoteSnapshot.instrument_id, func.max(QuoteSnapshot.fetched_at).label("fetched_at"))
+    if instrument_keys is not None:
+        latest_query = latest_query.join(Instrument, QuoteSnapshot.instrument_id == Instrument.id).filter(
+            Instrument.instrument_key.in_(instrument_keys)
+        )
+    latest = latest_query.group_by(QuoteSnapshot.instrument_id).subquery()
+    rows = (
+        session.query(Instrument.instrument_key, QuoteSnapshot)
+        .join(QuoteSnapshot, QuoteSnapshot.instrument_id == Instrument.id)
+        .join(
+            latest,
+            and_(
+                latest.c.instrument_id == QuoteSnapshot.instrument_id,
+                latest.c.fetched_at == QuoteSnapshot.fetched_at,
+            ),
+        )
+    )
+    return {instrument_key: snapshot for instrument_key, snapshot in rows}
+
+
+def load_series_points(
+    session: Session,
+    *,
+    instrument_key: str | None = None,
+    series_type: str | None = None,
+    range_key: str | None = None,
+) -> dict[tuple[str, str, str], list[tuple[datetime, float, datetime]]]:
+    query = session.query(
+        Instrument.instrument_key,
+        SeriesPoint.series_type,
+        SeriesPoint.range_key,
+        SeriesPoint.point_time,
+        SeriesPoint.value,
+        SeriesPoint.fetched_at,
+    ).join(Instrument, SeriesPoint.instrument_id == Instrument.id)
+    if instrument_key is not None:
+        query = query.filter(Instrument.instrument_key == instrument_key)
+    if series_type is not None:
+        query = query.filter(SeriesPoint.series_type == series_type)
+    if range_key is not None:
+        query = query.filter(SeriesPoint.range_key == range_key)
+    rows = query.order_by(SeriesPoint.point_time)
+    output: dict[tuple[str, str, str], list[tuple[datetime, float, datetime]]] = {}
+    for instrument_key, series_type, range_key, point_time, value, fetched_at in rows:
+        output.setdefault((instrument_key, series_type, range_key), []).append((point_time, value, fetched_at))
+    return output
+
+
+def latest_completed_job_run_at(session: Session, job_name: str) -> datetime | None:
+    return (
+        session.query(func.max(JobRun.finished_at))
+        .filter(JobRun.job_name == job_name, JobRun.finished_at.isnot(None))
+        .scalar()
+    )
+
+
+def try_acquire_lease(session: Session, name: str, holder: str, now: datetime, expires_at: datetime) -> bool:
+    """Take or renew a lease. A single conditional UPDATE keeps acquisition atomic across processes."""
+    result = session.execute(
+        update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            (SchedulerLease.holder == holder) | (SchedulerLease.expires_at <= now),
+        )
+        .values(
+            holder=holder,
+            acquired_at=case((SchedulerLease.holder == holder, SchedulerLease.acquired_at), else_=now),
+            heartbeat_at=now,
+            expires_at=expires_at,
+        )
+    )
+    if result.rowcount == 1:
+        return True
+    if session.get(SchedulerLease, name) is not None:
+        return False
+    try:
+        with session.begin_nested():
+            session.add(SchedulerLease(name=name, holder=holder, acquired_at=now, heartbeat_at=now, expires_at=expires_at))
+    except IntegrityError:
+        return False
+    return True
+
+
+def release_lease(session: Session, name: str, holder: str) -> None:
+    session.execute(delete(SchedulerLease).where(SchedulerLease.name == name, SchedulerLease.holder == holder))
@@ -36,6 +36,11 @@ def _ensure_engine() -> tuple[Engine, sessionmaker[Session]]:
     return _engine, _sessionmaker
 
 
+def get_engine() -> Engine:
+    engine, _ = _ensure_engine()
+    return engine
+
+
 def init_db() -> None:
     engine, _ = _ensure_engine()
     Base.metadata.create_all(bind=engine)
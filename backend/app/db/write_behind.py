@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import queue
+from threading import Event, Lock, Thread
+import time
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.settings import WRITE_BATCH_SIZE, WRITE_QUEUE_MAX_PENDING
+from app.db.session import session_scope
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUT_TIMEOUT_SECONDS = 1.0
+IDLE_POLL_SECONDS = 0.5
+
+
+@dataclass
+class PendingWrite:
+    label: str
+    apply: Callable[[Session], None]
+    enqueued_at: float
+
+
+class WriteBehindQueue:
+    """Bounded queue of DB writes drained by a dedicated writer thread in batched transactions."""
+
+    def __init__(
+        self,
+        max_pending: int = WRITE_QUEUE_MAX_PENDING,
+        batch_size: int = WRITE_BATCH_SIZE,
+        put_timeout_seconds: float = DEFAULT_PUT_TIMEOUT_SECONDS,
+    ) -> None:
+        self.max_pending = max_pending
+        self.batch_size = max(1, batch_size)
+        self.put_timeout_seconds = put_timeout_seconds
+        self._queue: queue.Queue[PendingWrite] = queue.Queue(maxsize=max_pending)
+        self._lock = Lock()
+        self._drain_lock = Lock()
+        self._stop_event = Event()
+        self._thread: Thread | None = None
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> dict[str, object]:
+        return {
+            "submitted": 0,
+            "written": 0,
+            "failed": 0,
+            "dropped": 0,
+            "blocked_submits": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "high_water": 0,
+            "last_batch_size": 0,
+            "last_batch_ms": None,
+            "last_queue_wait_ms": None,
+            "last_error": None,
+        }
+
+    def submit(self, label: str, apply: Callable[[Session], None]) -> bool:
+        write = PendingWrite(label=label, apply=apply, enqueued_at=time.monotonic())
+        try:
+            self._queue.put_nowait(write)
+        except queue.Full:
+            with self._lock:
+                self._stats["blocked_submits"] = int(self._stats["blocked_submits"]) + 1
+            try:
+                self._queue.put(write, timeout=self.put_timeout_seconds)
+            except queue.Full:
+                with self._lock:
+                    self._stats["dropped"] = int(self._stats["dropped"]) + 1
+                logger.warning("write_behind.dropped", extra={"event": "write_behind.dropped", "label": label})
+                return False
+
+        depth = self._queue.qsize()
+        with self._lock:
+            self._stats["submitted"] = int(self._stats["submitted"]) + 1
+            self._stats["high_water"] = max(int(self._stats["high_water"]), depth)
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="write-behind-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        """Stop the writer after it has flushed everything already queued."""
+        thread = self._thread
+        if thread is None:
+            self._drain()
+            return
+        self._stop_event.set()
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            # Still inside a batch; draining here would race it. The writer drains the rest itself
+            # once the batch finishes, unless the process exits first (it is a daemon thread).
+            logger.warning(
+                "write_behind.stop_timeout",
+                extra={"event": "write_behind.stop_timeout", "pending": self._queue.qsize()},
+            )
+            return
+        self._thread = None
+        self._drain()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued write is applied. Returns False on timeout."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            self._drain()
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            output = dict(self._stats)
+        output["pending"] = self._queue.qsize()
+        output["max_pending"] = self.max_pending
+        output["batch_size"] = self.batch_size
+        output["running"] = self._thread is not None and self._thread.is_alive()
+        return output
+
+    def clear(self) -> None:
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+        with self._lock:
+            self._stats = self._empty_stats()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                first = self._queue.get(timeout=IDLE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            self._write_batch(self._collect_batch(first))
+        self._drain()
+
+    def _drain(self) -> None:
+        with self._drain_lock:
+            while True:
+                try:
+                    first = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                self._write_batch(self._collect_batch(first))
+
+    def _collect_batch(self, first: PendingWrite) -> list[PendingWrite]:
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: list[PendingWrite]) -> None:
+        started = time.monotonic()
+        queue_wait_ms = int((started - batch[0].enqueued_at) * 1000)
+        written = 0
+        failed = 0
+        last_error: str | None = None
+        batch_failed = False
+        try:
+            with session_scope() as session:
+                for write in batch:
+                    write.apply(session)
+            written = len(batch)
+        except Exception as exc:
+            # One bad write must not discard the rest of the batch: retry each write on its own.
+            batch_failed = True
+            last_error = str(exc)
+            logger.exception(
+                "write_behind.batch_failed",
+                extra={"event": "write_behind.batch_failed", "batch_size": len(batch)},
+            )
+            for write in batch:
+                try:
+                    with session_scope() as session:
+                        write.apply(session)
+                    written += 1
+                except Exception as write_exc:
+                    failed += 1
+                    last_error = str(write_exc)
+                    logger.exception(
+                        "write_behind.write_failed",
+                        extra={"event": "write_behind.write_failed", "label": write.label},
+                    )
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+        batch_ms = int((time.monotonic() - started) * 1000)
+        with self._lock:
+            self._stats["written"] = int(self._stats["written"]) + written
+            self._stats["failed"] = int(self._stats["failed"]) + failed
+            self._stats["batches"] = int(self._stats["batches"]) + 1
+            if batch_failed:
+                self._stats["failed_batches"] = int(self._stats["failed_batches"]) + 1
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_batch_ms"] = batch_ms
+            self._stats["last_queue_wait_ms"] = queue_wait_ms
+            if last_error is not None:
+                self._stats["last_error"] = last_error
+
+
+write_queue = WriteBehindQueue()
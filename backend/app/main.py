@@ -1,39 +1,100 @@
 from contextlib import asynccontextmanager
+import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from app.core.cache import cache
+from app.core.circuit_breaker import circuit_breakers
+from app.core.config import instrument_registry
+from app.core.l2_cache import l2_cache, l2_cache_enabled
+from app.core.memory import allocation_tracker
+from app.core.profiling import ProfilingMiddleware
 from app.core.provider_monitor import provider_monitor
+from app.core.quarantine import ticker_quarantine
+from app.core.rate_limit import rate_limiter
+from app.core.request_metrics import RequestMetricsMiddleware, request_metrics
 from app.core.scheduler import scheduler
+from app.core.settings import ADMIN_TOKEN, CACHE_JANITOR_INTERVAL_SECONDS, cache_only_serving
+from app.core.shared_state import shared_state_enabled, shared_store
+from app.core.startup import startup_metrics
 from app.core.time import to_stockholm
+from app.core.upstream import UpstreamTimeout, upstream_executor
 from app.db.migrations import upgrade_to_head
 from app.db.session import database_url
+from app.db.write_behind import write_queue
+from app.providers.archive import MODE_LIVE, provider_archive, provider_mode
+from app.providers.fred import fred_client
+from app.providers.yahoo_finance import yahoo_session
+from app.routes.admin import router as admin_router
 from app.routes.config import router as config_router
 from app.routes.commodities import router as commodities_router
 from app.routes.inflation import router as inflation_router
 from app.routes.mag7 import router as mag7_router
+from app.routes.metrics import router as metrics_router
+from app.routes.scheduler import router as scheduler_router
+from app.services.cache_hydration import hydrate_cache_from_db, invalidate_instruments, last_hydration
+
+
+logger = logging.getLogger(__name__)
+
+instrument_registry.add_listener(invalidate_instruments)
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    upgrade_to_head()
-    await scheduler.start()
+    allocation_tracker.start()
+    if l2_cache_enabled():
+        cache.attach_l2(l2_cache())
+    with startup_metrics.phase("migrations"):
+        startup_metrics.record("migrations_applied", upgrade_to_head())
+    with startup_metrics.phase("cache_hydration"):
+        try:
+            hydrate_cache_from_db()
+        except Exception:
+            logger.exception("startup.cache_hydration_failed", extra={"event": "startup.cache_hydration_failed"})
+    with startup_metrics.phase("scheduler_start"):
+        cache.start_janitor(CACHE_JANITOR_INTERVAL_SECONDS)
+        write_queue.start()
+        await scheduler.start()
+    startup_metrics.mark_ready()
     try:
         yield
     finally:
         await scheduler.stop()
+        write_queue.stop()
+        cache.stop_janitor()
+        allocation_tracker.stop()
+        upstream_executor.shutdown()
+        await fred_client.aclose()
+        yahoo_session.clear()
 
 
 app = FastAPI(title="Ekonomi Dashboard API", version="0.1.0", lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
+if ADMIN_TOKEN:
+    # Outermost, so a profiled request includes the metrics middleware; absent entirely otherwise.
+    app.add_middleware(ProfilingMiddleware, token=ADMIN_TOKEN)
+
+
+@app.exception_handler(UpstreamTimeout)
+async def upstream_timeout_handler(_request: Request, exc: UpstreamTimeout) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
 
 app.include_router(commodities_router)
 app.include_router(mag7_router)
 app.include_router(inflation_router)
 app.include_router(config_router)
+app.include_router(metrics_router)
+app.include_router(scheduler_router)
+app.include_router(admin_router)
 
 
 @app.get("/api/health")
 def health():
+    # Plain def on purpose: the rate limiter and provider snapshots can hit SQLite (BEGIN IMMEDIATE
+    # with a busy timeout under APP_SHARED_STATE=sqlite), which must not block the event loop.
     last_update = cache.last_update()
     last_success_by_module = {
         module: to_stockholm(value) for module, value in cache.last_success_by_module().items()
@@ -43,9 +104,28 @@ def health():
         "data_source": "yahoo_finance",
         "provider": {"name": "yfinance"},
         "cache": cache.stats(),
+        "serving": {"cache_only": cache_only_serving()},
+        "requests": request_metrics.snapshot(),
         "is_stale": cache.is_globally_stale(),
         "last_update": to_stockholm(last_update),
         "last_success_by_module": last_success_by_module,
         "provider_stats": provider_monitor.snapshot(),
+        "provider_calls": provider_monitor.key_snapshot(),
+        "provider_mode": provider_mode(),
+        "provider_archive": provider_archive().stats() if provider_mode() != MODE_LIVE else None,
+        "upstream_executor": upstream_executor.stats(),
+        "provider_sessions": {"fred": fred_client.stats(), "yahoo_finance": yahoo_session.stats()},
+        "circuit_breakers": circuit_breakers.snapshot(),
+        "quarantine": ticker_quarantine.snapshot(),
+        "rate_limits": rate_limiter.snapshot(),
+        "shared_state": {
+            "backend": "sqlite" if shared_state_enabled() else "local",
+            "path": str(shared_store().path) if shared_state_enabled() else None,
+        },
         "database": {"enabled": True, "url": database_url()},
+        "l2_cache": l2_cache().stats() if l2_cache_enabled() else None,
+        "scheduler": scheduler.snapshot(),
+        "write_queue": write_queue.stats(),
+        "warm_start": last_hydration(),
+        "startup": startup_metrics.snapshot(),
     }
@@ -24,4 +24,5 @@ class SummaryItem(BaseModel):
     y1_pct: Optional[float] = None
     timestamp_local: Optional[datetime] = None
     is_stale: bool = True
+    stale_reason: Optional[str] = None
     sparkline: List[SparkPoint] = Field(default_factory=list)
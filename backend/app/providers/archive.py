@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import gzip
+import io
+from pathlib import Path
+import re
+from threading import Lock
+import time
+
+from app.core.settings import PROVIDER_ARCHIVE_DIR, PROVIDER_MODE, REPLAY_LATENCY_MS
+
+MODE_LIVE = "live"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = (MODE_LIVE, MODE_RECORD, MODE_REPLAY)
+
+
+class ReplayMissError(RuntimeError):
+    """Replay mode was asked for a payload that was never recorded."""
+
+
+def default_archive_dir() -> Path:
+    backend_root = Path(__file__).resolve().parents[2]
+    return backend_root / "data" / "provider_archive"
+
+
+def _safe_key(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.=-]+", "_", key)
+
+
+class ProviderArchive:
+    """Raw upstream payloads on disk, one gzip file per recording: `<provider>/<key>/<utc time>.gz`.
+
+    Replay walks a key's recordings in the order they were made, one per call, and keeps serving
+    the newest once it runs out, so a recorded session plays back the way the data moved.
+    """
+
+    def __init__(self, directory: Path, latency_ms: float = 0.0) -> None:
+        self.directory = directory
+        self.latency_ms = latency_ms
+        self._lock = Lock()
+        self._cursors: dict[tuple[str, str], int] = {}
+        self._stats = {"recorded": 0, "replayed": 0, "missing": 0}
+
+    def _key_dir(self, provider: str, key: str) -> Path:
+        return self.directory / provider / _safe_key(key)
+
+    def save(self, provider: str, key: str, payload: bytes, recorded_at: datetime | None = None) -> Path:
+        moment = recorded_at or datetime.now(timezone.utc)
+        directory = self._key_dir(provider, key)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{moment.strftime('%Y%m%dT%H%M%S%fZ')}.gz"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(gzip.compress(payload, mtime=0))
+        temporary.replace(path)
+        with self._lock:
+            self._stats["recorded"] += 1
+        return path
+
+    def recordings(self, provider: str, key: str) -> list[Path]:
+        directory = self._key_dir(provider, key)
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob("*.gz"))
+
+    def replay(self, provider: str, key: str) -> bytes:
+        recordings = self.recordings(provider, key)
+        with self._lock:
+            if not recordings:
+                self._stats["missing"] += 1
+                raise ReplayMissError(f"No recorded {provider} payload for {key} in {self.directory}.")
+            position = self._cursors.get((provider, key), 0)
+            self._cursors[(provider, key)] = position + 1
+            self._stats["replayed"] += 1
+        payload = gzip.decompress(recordings[min(position, len(recordings) - 1)].read_bytes())
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return payload
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._cursors.clear()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {"directory": str(self.directory), **self._stats}
+
+
+def encode_frame(dataframe: object) -> bytes:
+    # CSV rather than pickle: independent of the pandas version, and the index keeps its UTC offset.
+    return dataframe.to_csv().encode("utf-8")
+
+
+def decode_frame(payload: bytes) -> object:
+    import pandas as pd
+
+    frame = pd.read_csv(io.BytesIO(payload), index_col=0, float_precision="round_trip")
+    frame.index = pd.to_datetime(frame.index, utc=True)
+    return frame
+
+
+_archive: ProviderArchive | None = None
+_archive_lock = Lock()
+
+
+def provider_mode() -> str:
+    return PROVIDER_MODE if PROVIDER_MODE in MODES else MODE_LIVE
+
+
+def provider_archive() -> ProviderArchive:
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            directory = Path(PROVIDER_ARCHIVE_DIR) if PROVIDER_ARCHIVE_DIR else default_archive_dir()
+            _archive = ProviderArchive(directory, latency_ms=REPLAY_LATENCY_MS)
+        return _archive
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -7,20 +8,31 @@ from io import StringIO
 import random
 import time
 from urllib.parse import urlencode
-from urllib.request import urlopen
 
+from app.core.circuit_breaker import CircuitOpenError, MissingDataError, circuit_breakers
+from app.core.deadline import DeadlineExceeded, call_timeout, can_retry_after, is_timeout_error, wait_budget
 from app.core.provider_monitor import provider_monitor
-from app.core.rate_limit import rate_limiter
+from app.core.quarantine import QuarantinedError, ticker_quarantine
+from app.core.rate_limit import is_throttle_error, rate_limiter
 from app.core.settings import (
+    FRED_BASE_URL,
     FRED_MAX_CALLS,
     FRED_PERIOD_SECONDS,
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+    UPSTREAM_CALL_TIMEOUT_SECONDS,
     UPSTREAM_RETRY_ATTEMPTS,
     UPSTREAM_RETRY_BASE_MS,
 )
+from app.providers.archive import MODE_RECORD, MODE_REPLAY, provider_archive, provider_mode
+from app.providers.http_pool import AsyncKeepAliveClient, UpstreamHTTPError
 
 
-FRED_GRAPH_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+FRED_GRAPH_CSV_PATH = "/graph/fredgraph.csv"
 PROVIDER_NAME = "fred"
+MIN_CALL_BUDGET_SECONDS = 1.0
+
+# Shared by every series fetch, so the calls of a cycle or a burst of misses reuse pooled connections.
+fred_client = AsyncKeepAliveClient(FRED_BASE_URL, PROVIDER_NAME)
 
 
 @dataclass
@@ -29,19 +41,44 @@ class FredPoint:
     value: float
 
 
-def fetch_series(series_id: str) -> list[FredPoint]:
+async def fetch_series(series_id: str) -> list[FredPoint]:
+    # The HTTP exchange is awaited on the event loop. The rate-limit wait and the monitor and limiter
+    # bookkeeping run on a worker thread: they block, and write SQLite when APP_SHARED_STATE=sqlite.
+    await asyncio.to_thread(_admit, series_id)
+    try:
+        payload = await _with_retry(series_id, urlencode({"id": series_id}))
+        points = _parse_points(series_id, payload)
+    except BaseException as exc:
+        # Also on cancellation, which would otherwise keep a claimed probe slot forever.
+        ticker_quarantine.record_error(PROVIDER_NAME, series_id, exc)
+        raise
+    await asyncio.to_thread(provider_monitor.record_success, PROVIDER_NAME)
+    ticker_quarantine.record_success(PROVIDER_NAME, series_id)
+    return points
+
+
+def _admit(series_id: str) -> None:
     provider_monitor.record_attempt(PROVIDER_NAME)
-    if not rate_limiter.allow(PROVIDER_NAME, FRED_MAX_CALLS, FRED_PERIOD_SECONDS):
-        message = "FRED rate limit reached."
-        provider_monitor.record_failure(PROVIDER_NAME, message)
-        raise RuntimeError(message)
-
-    query = urlencode({"id": series_id})
-    payload = _with_retry(
-        lambda: _download_payload(query),
-        series_id=series_id,
-    )
+    # Before the circuit check and the rate limiter: a quarantined series costs neither a token nor a retry.
+    if not ticker_quarantine.allow(PROVIDER_NAME, series_id):
+        provider_monitor.record_quarantined(PROVIDER_NAME)
+        raise QuarantinedError(f"FRED series {series_id} is quarantined after repeated failures.")
+    try:
+        if circuit_breakers.is_open(PROVIDER_NAME, series_id):
+            message = f"FRED circuit open for {series_id}."
+            provider_monitor.record_short_circuit(PROVIDER_NAME)
+            provider_monitor.record_failure(PROVIDER_NAME, message)
+            raise CircuitOpenError(message)
+        if not _acquire_rate_limit():
+            message = "FRED rate limit reached."
+            provider_monitor.record_failure(PROVIDER_NAME, message)
+            raise RuntimeError(message)
+    except Exception as exc:
+        ticker_quarantine.record_error(PROVIDER_NAME, series_id, exc)
+        raise
+
 
+def _parse_points(series_id: str, payload: str) -> list[FredPoint]:
     points: list[FredPoint] = []
     reader = csv.DictReader(StringIO(payload))
     for row in reader:
@@ -57,29 +94,113 @@ def fetch_series(series_id: str) -> list[FredPoint]:
         except ValueError:
             continue
         points.append(FredPoint(t=parsed, value=numeric))
-    provider_monitor.record_success(PROVIDER_NAME)
     return points
 
 
-def _download_payload(query: str) -> str:
-    with urlopen(f"{FRED_GRAPH_CSV_URL}?{query}", timeout=20) as response:
-        return response.read().decode("utf-8")
+async def _fetch_payload(series_id: str, query: str, timeout: float) -> str:
+    # APP_PROVIDER_MODE: live downloads, record also archives the CSV, replay serves archived CSV.
+    mode = provider_mode()
+    if mode == MODE_REPLAY:
+        return (await asyncio.to_thread(provider_archive().replay, PROVIDER_NAME, series_id)).decode("utf-8")
+    payload = await _download_payload(query, timeout)
+    if mode == MODE_RECORD:
+        await asyncio.to_thread(provider_archive().save, PROVIDER_NAME, series_id, payload.encode("utf-8"))
+    return payload
+
+
+async def _download_payload(query: str, timeout: float) -> str:
+    return (await fred_client.get(f"{FRED_GRAPH_CSV_PATH}?{query}", timeout)).decode("utf-8")
+
+
+def _is_client_error(exc: BaseException) -> bool:
+    return isinstance(exc, UpstreamHTTPError) and 400 <= exc.status < 500 and exc.status != 429
+
+
+def _acquire_rate_limit() -> bool:
+    # Wait for a token (FIFO, by priority) instead of failing while one frees up shortly.
+    started = time.perf_counter()
+    granted = rate_limiter.acquire(
+        PROVIDER_NAME,
+        FRED_MAX_CALLS,
+        FRED_PERIOD_SECONDS,
+        timeout=wait_budget(RATE_LIMIT_MAX_WAIT_SECONDS),
+    )
+    provider_monitor.record_rate_limit_wait(PROVIDER_NAME, time.perf_counter() - started, granted)
+    return granted
 
 
-def _with_retry(callable_fn, series_id: str) -> str:
+def _record_missing(series_id: str, duration: float, exc: Exception) -> None:
+    # FRED answered that this series is wrong or gone: no retry, and not a circuit failure that would
+    # block every other series.
+    provider_monitor.record_call(PROVIDER_NAME, series_id, duration_seconds=duration, outcome="missing", error=str(exc))
+    circuit_breakers.record_success(PROVIDER_NAME, series_id)
+    provider_monitor.record_failure(PROVIDER_NAME, str(exc))
+
+
+def _record_failed_attempt(series_id: str, duration: float, exc: Exception) -> None:
+    circuit_breakers.record_failure(PROVIDER_NAME, series_id)
+    outcome = "error"
+    if is_throttle_error(exc):
+        rate_limiter.record_throttle(PROVIDER_NAME)
+        outcome = "throttled"
+    if is_timeout_error(exc):
+        provider_monitor.record_timeout(PROVIDER_NAME)
+        outcome = "timeout"
+    provider_monitor.record_call(PROVIDER_NAME, series_id, duration_seconds=duration, outcome=outcome, error=str(exc))
+
+
+def _record_ok(series_id: str, duration: float, payload_bytes: int) -> None:
+    provider_monitor.record_call(
+        PROVIDER_NAME,
+        series_id,
+        duration_seconds=duration,
+        outcome="ok",
+        payload_bytes=payload_bytes,
+    )
+    circuit_breakers.record_success(PROVIDER_NAME, series_id)
+    rate_limiter.record_success(PROVIDER_NAME)
+
+
+async def _with_retry(series_id: str, query: str) -> str:
     last_error: Exception | None = None
     attempts = max(1, UPSTREAM_RETRY_ATTEMPTS)
     for attempt in range(attempts):
         try:
-            return callable_fn()
-        except Exception as exc:  # pragma: no cover - upstream/network failures are hard to deterministically trigger.
+            timeout = call_timeout(UPSTREAM_CALL_TIMEOUT_SECONDS)
+        except DeadlineExceeded as exc:
+            await asyncio.to_thread(provider_monitor.record_timeout, PROVIDER_NAME)
+            last_error = exc
+            break
+        try:
+            circuit_breakers.before_call(PROVIDER_NAME, series_id)
+        except CircuitOpenError as exc:
+            await asyncio.to_thread(provider_monitor.record_short_circuit, PROVIDER_NAME)
+            last_error = exc
+            break
+        started = time.perf_counter()
+        try:
+            result = await _fetch_payload(series_id, query, timeout)
+        except asyncio.CancelledError:
+            circuit_breakers.release_probe(PROVIDER_NAME, series_id)
+            raise
+        except Exception as exc:
+            duration = time.perf_counter() - started
+            if _is_client_error(exc):
+                await asyncio.to_thread(_record_missing, series_id, duration, exc)
+                raise MissingDataError(f"FRED has no data for {series_id}: {exc}") from exc
+            await asyncio.to_thread(_record_failed_attempt, series_id, duration, exc)
             last_error = exc
             if attempt + 1 >= attempts:
                 break
-            provider_monitor.record_retry(PROVIDER_NAME)
             base_seconds = UPSTREAM_RETRY_BASE_MS / 1000.0
             sleep_seconds = base_seconds * (2**attempt) + random.uniform(0, base_seconds)
-            time.sleep(sleep_seconds)
+            if not can_retry_after(sleep_seconds, MIN_CALL_BUDGET_SECONDS):
+                break
+            await asyncio.to_thread(provider_monitor.record_retry, PROVIDER_NAME)
+            await asyncio.sleep(sleep_seconds)
+        else:
+            await asyncio.to_thread(_record_ok, series_id, time.perf_counter() - started, len(result))
+            return result
 
-    provider_monitor.record_failure(PROVIDER_NAME, str(last_error))
-    raise RuntimeError(f"FRED request failed for {series_id}: {last_error}")
+    await asyncio.to_thread(provider_monitor.record_failure, PROVIDER_NAME, str(last_error))
+    raise RuntimeError(f"FRED request failed for {series_id}: {last_error}") from last_error
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+import sys
+from threading import Lock
+import time
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+from app.core.provider_monitor import provider_monitor
+from app.core.settings import HTTP_IDLE_SECONDS, HTTP_POOL_SIZE
+
+MAX_REDIRECTS = 3
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Same User-Agent urlopen sent, so upstreams see no difference from before pooling.
+USER_AGENT = f"Python-urllib/{sys.version_info.major}.{sys.version_info.minor}"
+# httpcore trace events that mark a new connection being set up (TCP connect, then TLS for https).
+_CONNECT_STARTED = "connection.connect_tcp.started"
+_CONNECT_READY = ("connection.connect_tcp.complete", "connection.start_tls.complete")
+
+
+class UpstreamHTTPError(RuntimeError):
+    """Non-2xx answer from an upstream; the text keeps urllib's `HTTP Error <status>` shape."""
+
+    def __init__(self, status: int, reason: str, url: str) -> None:
+        super().__init__(f"HTTP Error {status}: {reason} ({url})")
+        self.status = status
+
+
+class AsyncKeepAliveClient:
+    """Async GET client for one upstream origin that keeps idle connections open between calls.
+
+    Requests go through an `httpx.AsyncClient`, whose pool keeps up to `max_idle` finished
+    connections and closes them after `idle_seconds` idle, so consecutive and concurrent calls
+    reuse connections instead of TLS-handshaking each time. httpx connections belong to the event
+    loop that opened them, so there is one client per running loop (the app's, and the one a
+    scheduler cycle fans out on). Every new connection reports its setup time to the provider
+    monitor; redirects are followed only within the origin.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        provider: str,
+        max_idle: int = HTTP_POOL_SIZE,
+        idle_seconds: float = HTTP_IDLE_SECONDS,
+    ) -> None:
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported upstream URL: {base_url}")
+        self.base_url = base_url.rstrip("/")
+        self.provider = provider
+        self.max_idle = max_idle
+        self.idle_seconds = idle_seconds
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port or (443 if parts.scheme == "https" else 80)
+        self._ssl_context: ssl.SSLContext | None = None
+        self._lock = Lock()
+        self._clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._stats = {"opened": 0, "reused": 0}
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is not None and not client.is_closed:
+                return client
+            # A loop that ended without aclose() (a one-off asyncio.run) leaves its client behind.
+            for stale in [other for other in self._clients if other.is_closed()]:
+                del self._clients[stale]
+            if self._scheme == "https" and self._ssl_context is None:
+                # Loading the CA bundle is the expensive part; do it once, not per client.
+                self._ssl_context = ssl.create_default_context()
+            client = self._clients[loop] = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"User-Agent": USER_AGENT, "Accept-Encoding": "identity"},
+                limits=httpx.Limits(max_keepalive_connections=self.max_idle, keepalive_expiry=self.idle_seconds),
+                verify=self._ssl_context or True,
+            )
+            return client
+
+    async def get(self, path: str, timeout: float) -> bytes:
+        client = self._client()
+        for _redirect in range(MAX_REDIRECTS + 1):
+            response = await self._get_once(client, path, timeout)
+            location = response.headers.get("Location")
+            if response.status_code in REDIRECT_STATUSES and location:
+                target = urlsplit(urljoin(f"{self.base_url}{path}", location))
+                if (target.scheme, target.hostname, target.port or self._port) != (self._scheme, self._host, self._port):
+                    raise UpstreamHTTPError(
+                        response.status_code, f"redirect to another origin: {location}", f"{self.base_url}{path}"
+                    )
+                path = f"{target.path}?{target.query}" if target.query else target.path
+                continue
+            if response.status_code >= 400:
+                raise UpstreamHTTPError(response.status_code, response.reason_phrase, f"{self.base_url}{path}")
+            return response.content
+        raise UpstreamHTTPError(response.status_code, "too many redirects", f"{self.base_url}{path}")
+
+    async def _get_once(self, client: httpx.AsyncClient, path: str, timeout: float) -> httpx.Response:
+        connect: dict[str, float] = {}
+
+        async def trace(event_name: str, _info: dict[str, object]) -> None:
+            if event_name == _CONNECT_STARTED:
+                connect["started"] = time.perf_counter()
+            elif event_name in _CONNECT_READY:
+                connect["ready"] = time.perf_counter()
+
+        try:
+            response = await client.get(path, timeout=timeout, extensions={"trace": trace})
+        finally:
+            # A connection set up for a request that then failed still counts as opened.
+            if "ready" in connect:
+                provider_monitor.record_connection(self.provider, connect["ready"] - connect["started"])
+                with self._lock:
+                    self._stats["opened"] += 1
+        if "started" not in connect:
+            provider_monitor.record_connection_reuse(self.provider)
+            with self._lock:
+                self._stats["reused"] += 1
+        return response
+
+    async def aclose(self) -> None:
+        """Close the running loop's client and its pooled connections."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            clients = sum(1 for loop, client in self._clients.items() if not loop.is_closed() and not client.is_closed)
+            return {"base_url": self.base_url, "clients": clients, **self._stats}
@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import random
+import sys
+from threading import Lock
 import time
-from typing import Iterable
-
-import yfinance as yf
+from typing import Callable, Iterable, Iterator
 
+from app.core.circuit_breaker import CircuitOpenError, MissingDataError, circuit_breakers
+from app.core.deadline import DeadlineExceeded, call_timeout, can_retry_after, is_timeout_error, wait_budget
 from app.core.provider_monitor import provider_monitor
-from app.core.rate_limit import rate_limiter
+from app.core.quarantine import QuarantinedError, ticker_quarantine
+from app.core.rate_limit import is_throttle_error, rate_limiter
 from app.core.settings import (
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+    UPSTREAM_CALL_TIMEOUT_SECONDS,
     UPSTREAM_RETRY_ATTEMPTS,
     UPSTREAM_RETRY_BASE_MS,
     YAHOO_MAX_CALLS,
     YAHOO_PERIOD_SECONDS,
+    YAHOO_SESSION_MAX_AGE_SECONDS,
 )
+from app.providers.archive import MODE_RECORD, MODE_REPLAY, decode_frame, encode_frame, provider_archive, provider_mode
 
 
 RANGE_TO_PERIOD = {
@@ -25,6 +34,133 @@ RANGE_TO_PERIOD = {
     "1y": "1y",
 }
 PROVIDER_NAME = "yahoo_finance"
+MIN_CALL_BUDGET_SECONDS = 1.0
+TICKER_CACHE_SIZE = 256
+_AUTH_ERROR_MARKERS = ("401", "unauthorized", "invalid crumb", "invalid cookie")
+# yfinance errors meaning Yahoo answered but has nothing for the symbol; matched by name so fakes need not define them.
+_MISSING_DATA_ERRORS = frozenset({"YFPricesMissingError", "YFTzMissingError", "YFTickerMissingError", "YFInvalidPeriodError"})
+
+_yf_module = None
+
+
+def _yf():
+    # yfinance pulls in pandas/numpy; defer that cost to the first upstream call instead of app import.
+    global _yf_module
+    if _yf_module is None:
+        import yfinance
+
+        _yf_module = yfinance
+    return _yf_module
+
+
+def _new_http_session() -> object:
+    # yfinance only accepts curl_cffi sessions (it impersonates a browser to get a crumb).
+    from curl_cffi import requests as curl_requests
+
+    return curl_requests.Session(impersonate="chrome")
+
+
+def is_auth_error(exc: BaseException) -> bool:
+    text = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in text for marker in _AUTH_ERROR_MARKERS)
+
+
+class YahooSession:
+    """One long-lived HTTP session and a bounded cache of `yf.Ticker` objects for every Yahoo call.
+
+    A bare `yf.Ticker(symbol)` builds its own curl session and looks the exchange timezone up again;
+    sharing the session keeps connections alive across calls, and cached tickers keep their
+    timezone. yfinance holds the cookie/crumb for the session it last fetched them with, so they
+    are dropped along with the session when it reaches `max_age_seconds` or Yahoo rejects it.
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = YAHOO_SESSION_MAX_AGE_SECONDS,
+        max_tickers: int = TICKER_CACHE_SIZE,
+        session_factory: Callable[[], object] = _new_http_session,
+    ) -> None:
+        self.max_age_seconds = max_age_seconds
+        self.max_tickers = max_tickers
+        self._session_factory = session_factory
+        self._lock = Lock()
+        self._session: object | None = None
+        self._created_at = 0.0
+        # Each ticker carries a lock: yfinance keeps per-call state on the Ticker object.
+        self._tickers: OrderedDict[str, tuple[object, Lock]] = OrderedDict()
+        self._stats = {"sessions_created": 0, "expired": 0, "auth_refreshes": 0, "ticker_reuses": 0}
+
+    def _current_session(self) -> object:
+        age = time.monotonic() - self._created_at
+        if self._session is not None and self.max_age_seconds and age > self.max_age_seconds:
+            self._stats["expired"] += 1
+            self._drop_session()
+        if self._session is None:
+            started = time.perf_counter()
+            self._session = self._session_factory()
+            self._created_at = time.monotonic()
+            self._stats["sessions_created"] += 1
+            provider_monitor.record_connection(PROVIDER_NAME, time.perf_counter() - started)
+        return self._session
+
+    def _drop_session(self) -> None:
+        session, self._session = self._session, None
+        self._tickers.clear()
+        _clear_cached_crumb()
+        close = getattr(session, "close", None)
+        if close is not None:
+            close()
+
+    @contextmanager
+    def ticker(self, symbol: str) -> Iterator[object]:
+        with self._lock:
+            session = self._current_session()
+            cached = self._tickers.get(symbol)
+            if cached is not None:
+                self._tickers.move_to_end(symbol)
+                self._stats["ticker_reuses"] += 1
+            else:
+                cached = self._tickers[symbol] = (_yf().Ticker(symbol, session=session), Lock())
+                if len(self._tickers) > self.max_tickers:
+                    self._tickers.popitem(last=False)
+        provider_monitor.record_connection_reuse(PROVIDER_NAME)
+        ticker, ticker_lock = cached
+        with ticker_lock:
+            yield ticker
+
+    def invalidate(self) -> None:
+        """Yahoo rejected the cookie/crumb; the next call starts a fresh session."""
+        with self._lock:
+            if self._session is not None:
+                self._stats["auth_refreshes"] += 1
+                self._drop_session()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            age = round(time.monotonic() - self._created_at, 1) if self._session is not None else None
+            return {"session_age_seconds": age, "tickers_cached": len(self._tickers), **self._stats}
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._drop_session()
+
+
+def _clear_cached_crumb() -> None:
+    # The crumb lives on yfinance's process-wide YfData singleton, outside any Ticker or session.
+    data_class = getattr(sys.modules.get("yfinance.data"), "YfData", None)
+    if data_class is None:
+        return
+    data = data_class()
+    lock = getattr(data, "_cookie_lock", None)
+    if lock is None:
+        return
+    with lock:
+        data._cookie = None
+        data._crumb = None
+
+
+yahoo_session = YahooSession()
 
 
 @dataclass
@@ -41,6 +177,34 @@ class QuoteSnapshot:
     history: list[HistoryPoint]
 
 
+def _download_history(ticker: str, period: str, interval: str, timeout: float) -> object:
+    # APP_PROVIDER_MODE: live calls yfinance, record also archives the raw frame, replay serves archived frames.
+    key = f"{ticker}:{period}:{interval}"
+    mode = provider_mode()
+    if mode == MODE_REPLAY:
+        return _require_rows(ticker, decode_frame(provider_archive().replay(PROVIDER_NAME, key)))
+    # raise_errors: by default yfinance logs network errors and returns an empty frame, which would
+    # look like a healthy call to the retry loop and the circuit breaker.
+    try:
+        with yahoo_session.ticker(ticker) as yf_ticker:
+            dataframe = yf_ticker.history(
+                period=period, interval=interval, auto_adjust=False, timeout=timeout, raise_errors=True
+            )
+    except Exception as exc:
+        if type(exc).__name__ in _MISSING_DATA_ERRORS:
+            raise MissingDataError(f"No data returned from Yahoo Finance for {ticker}: {exc}") from exc
+        raise
+    if mode == MODE_RECORD and dataframe is not None:
+        provider_archive().save(PROVIDER_NAME, key, encode_frame(dataframe))
+    return _require_rows(ticker, dataframe)
+
+
+def _require_rows(ticker: str, dataframe: object) -> object:
+    if dataframe is None or getattr(dataframe, "empty", False):
+        raise MissingDataError(f"No data returned from Yahoo Finance for {ticker}.")
+    return dataframe
+
+
 def _to_utc(value: object) -> datetime | None:
     if value is None:
         return None
@@ -76,6 +240,16 @@ def _extract_history_points(dataframe: object) -> list[HistoryPoint]:
     return points
 
 
+def _payload_size(dataframe: object) -> int | None:
+    memory_usage = getattr(dataframe, "memory_usage", None)
+    if memory_usage is None:
+        return None
+    try:
+        return int(memory_usage(index=True).sum())
+    except Exception:
+        return None
+
+
 def fetch_quotes_with_history(
     tickers: Iterable[str],
     period: str = "1y",
@@ -86,17 +260,20 @@ def fetch_quotes_with_history(
 
     for ticker in tickers:
         try:
-            if not rate_limiter.allow(PROVIDER_NAME, YAHOO_MAX_CALLS, YAHOO_PERIOD_SECONDS):
+            _ensure_not_quarantined(ticker)
+            _ensure_circuit_closed(ticker)
+            if not _acquire_rate_limit():
                 raise RuntimeError("Yahoo Finance rate limit reached.")
 
             dataframe = _with_retry(
-                lambda: yf.Ticker(ticker).history(period=period, interval=interval, auto_adjust=False),
+                lambda timeout: _download_history(ticker, period, interval, timeout),
                 ticker=ticker,
             )
             history = _extract_history_points(dataframe)
             if not history:
                 errors[ticker] = "No data returned from Yahoo Finance."
                 provider_monitor.record_failure(PROVIDER_NAME, errors[ticker])
+                ticker_quarantine.record_failure(PROVIDER_NAME, ticker, errors[ticker])
                 continue
             latest = history[-1]
             prev_close = history[-2].close if len(history) > 1 else None
@@ -107,9 +284,13 @@ def fetch_quotes_with_history(
                 history=history,
             )
             provider_monitor.record_success(PROVIDER_NAME)
+            ticker_quarantine.record_success(PROVIDER_NAME, ticker)
+        except QuarantinedError as exc:
+            errors[ticker] = str(exc)
         except Exception as exc:
             errors[ticker] = str(exc)
             provider_monitor.record_failure(PROVIDER_NAME, str(exc))
+            ticker_quarantine.record_error(PROVIDER_NAME, ticker, exc)
     return snapshots, errors
 
 
@@ -118,17 +299,66 @@ def fetch_history(ticker: str, range_key: str) -> list[HistoryPoint]:
     if period is None:
         raise ValueError(f"Unsupported range: {range_key}")
 
-    if not rate_limiter.allow(PROVIDER_NAME, YAHOO_MAX_CALLS, YAHOO_PERIOD_SECONDS):
-        message = "Yahoo Finance rate limit reached."
-        provider_monitor.record_failure(PROVIDER_NAME, message)
-        raise RuntimeError(message)
+    _ensure_not_quarantined(ticker)
+    try:
+        try:
+            _ensure_circuit_closed(ticker)
+        except RuntimeError as exc:
+            provider_monitor.record_failure(PROVIDER_NAME, str(exc))
+            raise
+        if not _acquire_rate_limit():
+            message = "Yahoo Finance rate limit reached."
+            provider_monitor.record_failure(PROVIDER_NAME, message)
+            raise RuntimeError(message)
 
-    dataframe = _with_retry(
-        lambda: yf.Ticker(ticker).history(period=period, interval="1d", auto_adjust=False),
-        ticker=ticker,
-    )
+        dataframe = _with_retry(
+            lambda timeout: _download_history(ticker, period, "1d", timeout),
+            ticker=ticker,
+        )
+    except MissingDataError as exc:
+        # Yahoo answered without rows for this ticker; callers get an empty series as before, but it
+        # counts towards quarantine like any other missing-data answer.
+        provider_monitor.record_failure(PROVIDER_NAME, str(exc))
+        ticker_quarantine.record_failure(PROVIDER_NAME, ticker, str(exc))
+        return []
+    except Exception as exc:
+        ticker_quarantine.record_error(PROVIDER_NAME, ticker, exc)
+        raise
     provider_monitor.record_success(PROVIDER_NAME)
-    return _extract_history_points(dataframe)
+    points = _extract_history_points(dataframe)
+    if points:
+        ticker_quarantine.record_success(PROVIDER_NAME, ticker)
+    else:
+        # Rows but no usable closes says as much about the ticker as no rows at all.
+        ticker_quarantine.record_failure(PROVIDER_NAME, ticker, "No data returned from Yahoo Finance.")
+    return points
+
+
+def _ensure_not_quarantined(ticker: str) -> None:
+    # Before the circuit check and the rate limiter: a quarantined ticker costs neither a token nor a retry.
+    if not ticker_quarantine.allow(PROVIDER_NAME, ticker):
+        provider_monitor.record_quarantined(PROVIDER_NAME)
+        raise QuarantinedError(f"Yahoo Finance ticker {ticker} is quarantined after repeated failures.")
+
+
+def _ensure_circuit_closed(ticker: str) -> None:
+    # Checked before spending a rate-limit token; the probe slot itself is claimed in _with_retry.
+    if circuit_breakers.is_open(PROVIDER_NAME, ticker):
+        provider_monitor.record_short_circuit(PROVIDER_NAME)
+        raise CircuitOpenError(f"Yahoo Finance circuit open for {ticker}.")
+
+
+def _acquire_rate_limit() -> bool:
+    # Wait for a token (FIFO, by priority) instead of failing while one frees up shortly.
+    started = time.perf_counter()
+    granted = rate_limiter.acquire(
+        PROVIDER_NAME,
+        YAHOO_MAX_CALLS,
+        YAHOO_PERIOD_SECONDS,
+        timeout=wait_budget(RATE_LIMIT_MAX_WAIT_SECONDS),
+    )
+    provider_monitor.record_rate_limit_wait(PROVIDER_NAME, time.perf_counter() - started, granted)
+    return granted
 
 
 def _with_retry(callable_fn, ticker: str) -> object:
@@ -137,14 +367,58 @@ def _with_retry(callable_fn, ticker: str) -> object:
     attempts = max(1, UPSTREAM_RETRY_ATTEMPTS)
     for attempt in range(attempts):
         try:
-            return callable_fn()
-        except Exception as exc:  # pragma: no cover - upstream/network failures are hard to deterministically trigger.
+            timeout = call_timeout(UPSTREAM_CALL_TIMEOUT_SECONDS)
+        except DeadlineExceeded as exc:
+            provider_monitor.record_timeout(PROVIDER_NAME)
+            last_error = exc
+            break
+        try:
+            circuit_breakers.before_call(PROVIDER_NAME, ticker)
+        except CircuitOpenError as exc:
+            provider_monitor.record_short_circuit(PROVIDER_NAME)
+            raise RuntimeError(f"Yahoo request failed for {ticker}: {exc}") from exc
+        started = time.perf_counter()
+        try:
+            result = callable_fn(timeout)
+        except MissingDataError as exc:
+            # Yahoo answered: a retry returns the same nothing and the provider is healthy.
+            provider_monitor.record_call(
+                PROVIDER_NAME, ticker, duration_seconds=time.perf_counter() - started, outcome="missing", error=str(exc)
+            )
+            circuit_breakers.record_success(PROVIDER_NAME, ticker)
+            raise
+        except Exception as exc:
+            duration = time.perf_counter() - started
+            circuit_breakers.record_failure(PROVIDER_NAME, ticker)
+            outcome = "error"
+            if is_throttle_error(exc):
+                rate_limiter.record_throttle(PROVIDER_NAME)
+                outcome = "throttled"
+            if is_timeout_error(exc):
+                provider_monitor.record_timeout(PROVIDER_NAME)
+                outcome = "timeout"
+            if is_auth_error(exc):
+                yahoo_session.invalidate()
+            provider_monitor.record_call(PROVIDER_NAME, ticker, duration_seconds=duration, outcome=outcome, error=str(exc))
             last_error = exc
             if attempt + 1 >= attempts:
                 break
-            provider_monitor.record_retry(PROVIDER_NAME)
             base_seconds = UPSTREAM_RETRY_BASE_MS / 1000.0
             sleep_seconds = base_seconds * (2**attempt) + random.uniform(0, base_seconds)
+            if not can_retry_after(sleep_seconds, MIN_CALL_BUDGET_SECONDS):
+                break
+            provider_monitor.record_retry(PROVIDER_NAME)
             time.sleep(sleep_seconds)
+        else:
+            provider_monitor.record_call(
+                PROVIDER_NAME,
+                ticker,
+                duration_seconds=time.perf_counter() - started,
+                outcome="ok",
+                payload_bytes=_payload_size(result),
+            )
+            circuit_breakers.record_success(PROVIDER_NAME, ticker)
+            rate_limiter.record_success(PROVIDER_NAME)
+            return result
 
-    raise RuntimeError(f"Yahoo request failed for {ticker}: {last_error}")
+    raise RuntimeError(f"Yahoo request failed for {ticker}: {last_error}") from last_error
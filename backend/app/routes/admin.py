@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from app.core import settings
+from app.core.memory import memory_report
+from app.core.profiling import cycle_profiler, profile_dir, token_matches
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    # Admin endpoints do not exist unless APP_ADMIN_TOKEN is set.
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token_matches(settings.ADMIN_TOKEN, x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.post("/profile/cycles", dependencies=[Depends(require_admin)])
+def arm_cycle_profiling(count: int = Query(default=1, ge=0, le=20)):
+    return {"armed_cycles": cycle_profiler.arm(count), "directory": str(profile_dir())}
+
+
+@router.get("/profile/reports", dependencies=[Depends(require_admin)])
+def profile_reports():
+    directory = profile_dir()
+    files = sorted(path.name for path in directory.iterdir() if path.is_file()) if directory.is_dir() else []
+    return {"directory": str(directory), "armed_cycles": cycle_profiler.remaining(), "reports": files}
+
+
+@router.get("/memory", dependencies=[Depends(require_admin)])
+def memory(top_keys: int = Query(default=20, ge=0, le=500)):
+    return memory_report(top_keys)
@@ -5,20 +5,54 @@ from datetime import datetime, timezone
 from fastapi import APIRouter
 from fastapi import HTTPException
 from fastapi import Query
+from starlette.concurrency import run_in_threadpool
 
-from app.core.cache import cache
-from app.core.config import load_instruments
-from app.routes.response_utils import age_seconds_since, normalize_summary_items, stale_reason_for_items, to_stockholm_timestamp
+from app.core.cache import CacheEntry, cache
+from app.core.config import InstrumentConfig, instrument_registry
+from app.core.deadline import deadline_scope
+from app.core.quarantine import QuarantinedError
+from app.core.request_metrics import mark_cache_outcome
+from app.core.settings import REQUEST_UPSTREAM_BUDGET_SECONDS, cache_only_serving
+from app.core.upstream import upstream_executor
+from app.routes.response_utils import (
+    age_seconds_since,
+    normalize_summary_items,
+    series_quarantined,
+    stale_reason_for_items,
+    stale_reason_for_series,
+    to_stockholm_timestamp,
+)
+from app.services.cache_hydration import restore_series, restore_summary
 from app.services.market_data import fetch_series_for_instrument, fetch_summary_for_instruments
 
 router = APIRouter(prefix="/api/commodities", tags=["commodities"])
 
 
+def _fill_summary(cache_key: str) -> CacheEntry:
+    # Runs on the upstream pool; concurrent misses for the key share this one fill.
+    instruments = instrument_registry.by_module("commodities")
+    with deadline_scope(REQUEST_UPSTREAM_BUDGET_SECONDS):
+        items, _errors = fetch_summary_for_instruments(instruments)
+    has_fresh_values = any(item.last is not None for item in items)
+    return cache.set(
+        cache_key,
+        items,
+        fetched_at=datetime.now(timezone.utc),
+        update_last_update=has_fresh_values,
+        module="commodities",
+    )
+
+
 @router.get("/summary")
-def commodities_summary():
+async def commodities_summary():
     cache_key = "commodities_summary"
     cached = cache.get(cache_key)
+    if cached is None and cache_only_serving():
+        cached = await run_in_threadpool(restore_summary, "commodities")
+        if cached is None:
+            raise HTTPException(status_code=503, detail="No cached or persisted commodities data available.")
     if cached is not None:
+        mark_cache_outcome(True)
         global_stale = cache.is_globally_stale()
         items = normalize_summary_items(cached.value, force_stale=global_stale)
         return {
@@ -26,17 +60,16 @@ def commodities_summary():
             "meta": {
                 "source": "yahoo_finance",
                 "cached": True,
+                "restored": cached.restored,
                 "fetched_at": to_stockholm_timestamp(cached.fetched_at),
-                "stale_reason": stale_reason_for_items(items, global_stale),
+                "stale_reason": stale_reason_for_items(items, global_stale, restored=cached.restored),
                 "age_seconds": age_seconds_since(cached.fetched_at),
             },
         }
 
-    instruments = [i for i in load_instruments() if i.module == "commodities"]
-    items, _errors = fetch_summary_for_instruments(instruments)
-    fetched_at = datetime.now(timezone.utc)
-    has_fresh_values = any(item.last is not None for item in items)
-    cache.set(cache_key, items, fetched_at=fetched_at, update_last_update=has_fresh_values, module="commodities")
+    mark_cache_outcome(False)
+    entry = await upstream_executor.run(cache_key, _fill_summary, cache_key)
+    items, fetched_at = entry.value, entry.fetched_at
     global_stale = cache.is_globally_stale()
     normalized_items = normalize_summary_items(items, force_stale=global_stale)
     return {
@@ -44,6 +77,7 @@ def commodities_summary():
         "meta": {
             "source": "yahoo_finance",
             "cached": False,
+            "restored": False,
             "fetched_at": to_stockholm_timestamp(fetched_at),
             "stale_reason": stale_reason_for_items(normalized_items, global_stale),
             "age_seconds": age_seconds_since(fetched_at),
@@ -51,11 +85,39 @@ def commodities_summary():
     }
 
 
+def _fill_series(cache_key: str, instrument: InstrumentConfig, range_key: str) -> CacheEntry:
+    try:
+        with deadline_scope(REQUEST_UPSTREAM_BUDGET_SECONDS):
+            points = fetch_series_for_instrument(instrument, range_key)
+    except QuarantinedError as exc:
+        # The ticker is not fetched while quarantined; serve its last persisted series instead.
+        restored = restore_series("commodities", instrument.id, range_key)
+        if restored is None:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+        return restored
+    return cache.set(
+        cache_key,
+        points,
+        fetched_at=datetime.now(timezone.utc),
+        update_last_update=bool(points),
+        module="commodities",
+    )
+
+
 @router.get("/series")
-def commodities_series(id: str, range: str = Query(default="1m", pattern="^(1m|3m|1y)$")):
+async def commodities_series(id: str, range: str = Query(default="1m", pattern="^(1m|3m|1y)$")):
     cache_key = f"series:{id}:{range}"
+    # Resolved once, off the event loop: a due config check stats and may re-parse the YAML file.
+    instrument = await run_in_threadpool(instrument_registry.get, id, "commodities")
     cached = cache.get(cache_key)
+    if cached is None and cache_only_serving():
+        if instrument is None:
+            raise HTTPException(status_code=404, detail=f"Unknown commodity id: {id}")
+        cached = await run_in_threadpool(restore_series, "commodities", id, range)
+        if cached is None:
+            raise HTTPException(status_code=503, detail=f"No cached or persisted series available for {id}.")
     if cached is not None:
+        mark_cache_outcome(True)
         global_stale = cache.is_globally_stale()
         return {
             "id": id,
@@ -64,20 +126,23 @@ def commodities_series(id: str, range: str = Query(default="1m", pattern="^(1m|3
             "meta": {
                 "source": "yahoo_finance",
                 "cached": True,
+                "restored": cached.restored,
                 "fetched_at": to_stockholm_timestamp(cached.fetched_at),
-                "stale_reason": "global_threshold" if global_stale else "none",
+                "stale_reason": stale_reason_for_series(
+                    global_stale,
+                    restored=cached.restored,
+                    quarantined=series_quarantined("yahoo_finance", instrument),
+                ),
                 "age_seconds": age_seconds_since(cached.fetched_at),
             },
         }
 
-    instruments = [i for i in load_instruments() if i.module == "commodities"]
-    instrument = next((item for item in instruments if item.id == id), None)
     if instrument is None:
         raise HTTPException(status_code=404, detail=f"Unknown commodity id: {id}")
 
-    points = fetch_series_for_instrument(instrument, range)
-    fetched_at = datetime.now(timezone.utc)
-    cache.set(cache_key, points, fetched_at=fetched_at, update_last_update=bool(points), module="commodities")
+    mark_cache_outcome(False)
+    entry = await upstream_executor.run(cache_key, _fill_series, cache_key, instrument, range)
+    points, fetched_at = entry.value, entry.fetched_at
     global_stale = cache.is_globally_stale()
     return {
         "id": id,
@@ -86,8 +151,13 @@ def commodities_series(id: str, range: str = Query(default="1m", pattern="^(1m|3
         "meta": {
             "source": "yahoo_finance",
             "cached": False,
+            "restored": entry.restored,
             "fetched_at": to_stockholm_timestamp(fetched_at),
-            "stale_reason": "global_threshold" if global_stale else "none",
+            "stale_reason": stale_reason_for_series(
+                global_stale,
+                restored=entry.restored,
+                quarantined=series_quarantined("yahoo_finance", instrument),
+            ),
             "age_seconds": age_seconds_since(fetched_at),
         },
     }
@@ -5,20 +5,54 @@ from datetime import datetime, timezone
 from fastapi import APIRouter
 from fastapi import HTTPException
 from fastapi import Query
+from starlette.concurrency import run_in_threadpool
 
-from app.core.cache import cache
-from app.core.config import load_instruments
-from app.routes.response_utils import age_seconds_since, normalize_summary_items, stale_reason_for_items, to_stockholm_timestamp
+from app.core.cache import CacheEntry, cache
+from app.core.config import InstrumentConfig, instrument_registry
+from app.core.deadline import deadline_scope
+from app.core.quarantine import QuarantinedError
+from app.core.request_metrics import mark_cache_outcome
+from app.core.settings import REQUEST_UPSTREAM_BUDGET_SECONDS, cache_only_serving
+from app.core.upstream import upstream_executor
+from app.routes.response_utils import (
+    age_seconds_since,
+    normalize_summary_items,
+    series_quarantined,
+    stale_reason_for_items,
+    stale_reason_for_series,
+    to_stockholm_timestamp,
+)
+from app.services.cache_hydration import restore_series, restore_summary
 from app.services.inflation_data import fetch_series_for_instrument, fetch_summary_for_instruments
 
 router = APIRouter(prefix="/api/inflation", tags=["inflation"])
 
 
+async def _fill_summary(cache_key: str) -> CacheEntry:
+    # Awaited on the event loop (FRED is async); concurrent misses for the key share this one fill.
+    instruments = await run_in_threadpool(instrument_registry.by_module, "inflation")
+    with deadline_scope(REQUEST_UPSTREAM_BUDGET_SECONDS):
+        items, _errors = await fetch_summary_for_instruments(instruments)
+    has_fresh_values = any(item.last is not None for item in items)
+    return cache.set(
+        cache_key,
+        items,
+        fetched_at=datetime.now(timezone.utc),
+        update_last_update=has_fresh_values,
+        module="inflation",
+    )
+
+
 @router.get("/summary")
-def inflation_summary():
+async def inflation_summary():
     cache_key = "inflation_summary"
     cached = cache.get(cache_key)
+    if cached is None and cache_only_serving():
+        cached = await run_in_threadpool(restore_summary, "inflation")
+        if cached is None:
+            raise HTTPException(status_code=503, detail="No cached or persisted inflation data available.")
     if cached is not None:
+        mark_cache_outcome(True)
         global_stale = cache.is_globally_stale()
         items = normalize_summary_items(cached.value, force_stale=global_stale)
         return {
@@ -26,17 +60,16 @@ def inflation_summary():
             "meta": {
                 "source": "fred",
                 "cached": True,
+                "restored": cached.restored,
                 "fetched_at": to_stockholm_timestamp(cached.fetched_at),
-                "stale_reason": stale_reason_for_items(items, global_stale),
+                "stale_reason": stale_reason_for_items(items, global_stale, restored=cached.restored),
                 "age_seconds": age_seconds_since(cached.fetched_at),
             },
         }
 
-    instruments = [i for i in load_instruments() if i.module == "inflation"]
-    items, _errors = fetch_summary_for_instruments(instruments)
-    fetched_at = datetime.now(timezone.utc)
-    has_fresh_values = any(item.last is not None for item in items)
-    cache.set(cache_key, items, fetched_at=fetched_at, update_last_update=has_fresh_values, module="inflation")
+    mark_cache_outcome(False)
+    entry = await upstream_executor.run_async(cache_key, _fill_summary, cache_key)
+    items, fetched_at = entry.value, entry.fetched_at
     global_stale = cache.is_globally_stale()
     normalized_items = normalize_summary_items(items, force_stale=global_stale)
     return {
@@ -44,6 +77,7 @@ def inflation_summary():
         "meta": {
             "source": "fred",
             "cached": False,
+            "restored": False,
             "fetched_at": to_stockholm_timestamp(fetched_at),
             "stale_reason": stale_reason_for_items(normalized_items, global_stale),
             "age_seconds": age_seconds_since(fetched_at),
@@ -51,11 +85,39 @@ def inflation_summary():
     }
 
 
+async def _fill_series(cache_key: str, instrument: InstrumentConfig, range_key: str) -> CacheEntry:
+    try:
+        with deadline_scope(REQUEST_UPSTREAM_BUDGET_SECONDS):
+            points = await fetch_series_for_instrument(instrument, range_key)
+    except QuarantinedError as exc:
+        # The ticker is not fetched while quarantined; serve its last persisted series instead.
+        restored = await run_in_threadpool(restore_series, "inflation", instrument.id, range_key)
+        if restored is None:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+        return restored
+    return cache.set(
+        cache_key,
+        points,
+        fetched_at=datetime.now(timezone.utc),
+        update_last_update=bool(points),
+        module="inflation",
+    )
+
+
 @router.get("/series")
-def inflation_series(id: str, range: str = Query(default="1y", pattern="^(1m|3m|6m|1y)$")):
+async def inflation_series(id: str, range: str = Query(default="1y", pattern="^(1m|3m|6m|1y)$")):
     cache_key = f"inflation_series:{id}:{range}"
+    # Resolved once, off the event loop: a due config check stats and may re-parse the YAML file.
+    instrument = await run_in_threadpool(instrument_registry.get, id, "inflation")
     cached = cache.get(cache_key)
+    if cached is None and cache_only_serving():
+        if instrument is None:
+            raise HTTPException(status_code=404, detail=f"Unknown inflation id: {id}")
+        cached = await run_in_threadpool(restore_series, "inflation", id, range)
+        if cached is None:
+            raise HTTPException(status_code=503, detail=f"No cached or persisted series available for {id}.")
     if cached is not None:
+        mark_cache_outcome(True)
         global_stale = cache.is_globally_stale()
         return {
             "id": id,
@@ -64,20 +126,23 @@ def inflation_series(id: str, range: str = Query(default="1y", pattern="^(1m|3m|
             "meta": {
                 "source": "fred",
                 "cached": True,
+                "restored": cached.restored,
                 "fetched_at": to_stockholm_timestamp(cached.fetched_at),
-                "stale_reason": "global_threshold" if global_stale else "none",
+                "stale_reason": stale_reason_for_series(
+                    global_stale,
+                    restored=cached.restored,
+                    quarantined=series_quarantined("fred", instrument),
+                ),
                 "age_seconds": age_seconds_since(cached.fetched_at),
             },
         }
 
-    instruments = [i for i in load_instruments() if i.module == "inflation"]
-    instrument = next((item for item in instruments if item.id == id), None)
     if instrument is None:
         raise HTTPException(status_code=404, detail=f"Unknown inflation id: {id}")
 
-    points = fetch_series_for_instrument(instrument, range)
-    fetched_at = datetime.now(timezone.utc)
-    cache.set(cache_key, points, fetched_at=fetched_at, update_last_update=bool(points), module="inflation")
+    mark_cache_outcome(False)
+    entry = await upstream_executor.run_async(cache_key, _fill_series, cache_key, instrument, range)
+    points, fetched_at = entry.value, entry.fetched_at
     global_stale = cache.is_globally_stale()
     return {
         "id": id,
@@ -86,8 +151,13 @@ def inflation_series(id: str, range: str = Query(default="1y", pattern="^(1m|3m|
         "meta": {
             "source": "fred",
             "cached": False,
+            "restored": entry.restored,
             "fetched_at": to_stockholm_timestamp(fetched_at),
-            "stale_reason": "global_threshold" if global_stale else "none",
+            "stale_reason": stale_reason_for_series(
+                global_stale,
+                restored=entry.restored,
+                quarantined=series_quarantined("fred", instrument),
+            ),
             "age_seconds": age_seconds_since(fetched_at),
         },
     }
@@ -3,20 +3,52 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from fastapi import APIRouter
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 
-from app.core.cache import cache
-from app.core.config import load_instruments
-from app.routes.response_utils import age_seconds_since, normalize_summary_items, stale_reason_for_items, to_stockholm_timestamp
+from app.core.cache import CacheEntry, cache
+from app.core.config import instrument_registry
+from app.core.deadline import deadline_scope
+from app.core.request_metrics import mark_cache_outcome
+from app.core.settings import REQUEST_UPSTREAM_BUDGET_SECONDS, cache_only_serving
+from app.core.upstream import upstream_executor
+from app.routes.response_utils import (
+    age_seconds_since,
+    normalize_summary_items,
+    stale_reason_for_items,
+    to_stockholm_timestamp,
+)
+from app.services.cache_hydration import restore_summary
 from app.services.market_data import fetch_summary_for_instruments
 
 router = APIRouter(prefix="/api/mag7", tags=["mag7"])
 
 
+def _fill_summary(cache_key: str) -> CacheEntry:
+    # Runs on the upstream pool; concurrent misses for the key share this one fill.
+    instruments = instrument_registry.by_module("mag7")
+    with deadline_scope(REQUEST_UPSTREAM_BUDGET_SECONDS):
+        items, _errors = fetch_summary_for_instruments(instruments)
+    has_fresh_values = any(item.last is not None for item in items)
+    return cache.set(
+        cache_key,
+        items,
+        fetched_at=datetime.now(timezone.utc),
+        update_last_update=has_fresh_values,
+        module="mag7",
+    )
+
+
 @router.get("/summary")
-def mag7_summary():
+async def mag7_summary():
     cache_key = "mag7_summary"
     cached = cache.get(cache_key)
+    if cached is None and cache_only_serving():
+        cached = await run_in_threadpool(restore_summary, "mag7")
+        if cached is None:
+            raise HTTPException(status_code=503, detail="No cached or persisted mag7 data available.")
     if cached is not None:
+        mark_cache_outcome(True)
         global_stale = cache.is_globally_stale()
         items = normalize_summary_items(cached.value, force_stale=global_stale)
         return {
@@ -24,17 +56,16 @@ def mag7_summary():
             "meta": {
                 "source": "yahoo_finance",
                 "cached": True,
+                "restored": cached.restored,
                 "fetched_at": to_stockholm_timestamp(cached.fetched_at),
-                "stale_reason": stale_reason_for_items(items, global_stale),
+                "stale_reason": stale_reason_for_items(items, global_stale, restored=cached.restored),
                 "age_seconds": age_seconds_since(cached.fetched_at),
             },
         }
 
-    instruments = [i for i in load_instruments() if i.module == "mag7"]
-    items, _errors = fetch_summary_for_instruments(instruments)
-    fetched_at = datetime.now(timezone.utc)
-    has_fresh_values = any(item.last is not None for item in items)
-    cache.set(cache_key, items, fetched_at=fetched_at, update_last_update=has_fresh_values, module="mag7")
+    mark_cache_outcome(False)
+    entry = await upstream_executor.run(cache_key, _fill_summary, cache_key)
+    items, fetched_at = entry.value, entry.fetched_at
     global_stale = cache.is_globally_stale()
     normalized_items = normalize_summary_items(items, force_stale=global_stale)
     return {
@@ -42,6 +73,7 @@ def mag7_summary():
         "meta": {
             "source": "yahoo_finance",
             "cached": False,
+            "restored": False,
             "fetched_at": to_stockholm_timestamp(fetched_at),
             "stale_reason": stale_reason_for_items(normalized_items, global_stale),
             "age_seconds": age_seconds_since(fetched_at),
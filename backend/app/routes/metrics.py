@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import cache
+from app.core.metrics import render_histograms, render_samples
+from app.core.request_metrics import request_metrics
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_lines() -> list[str]:
+    namespaces = cache.namespace_stats()
+    events = cache.event_counts()
+    lines: list[str] = []
+    for event in ("hits", "misses", "stale_serves", "l2_fills", "sets", "evictions", "expired"):
+        lines += render_samples(
+            f"app_cache_{event}_total",
+            "counter",
+            f"Cache {event.replace('_', ' ')} per key namespace.",
+            ("namespace",),
+            {(namespace,): value for (namespace, name), value in events.items() if name == event},
+        )
+    lines += render_samples(
+        "app_cache_entries",
+        "gauge",
+        "Cache entries per key namespace, including expired entries not yet purged.",
+        ("namespace",),
+        {(namespace,): row["entries"] for namespace, row in namespaces.items()},
+    )
+    lines += render_samples(
+        "app_cache_bytes",
+        "gauge",
+        "Approximate cache size in bytes per key namespace.",
+        ("namespace",),
+        {(namespace,): row["bytes"] for namespace, row in namespaces.items()},
+    )
+    lines += render_histograms(
+        "app_cache_miss_fill_seconds",
+        "Time from a cache miss until the key is set again.",
+        ("namespace",),
+        cache.fill_latency(),
+    )
+    return lines
+
+
+def _request_lines() -> list[str]:
+    lines = render_samples(
+        "app_http_requests_total",
+        "counter",
+        "HTTP requests by route template, status and cache outcome.",
+        ("method", "route", "status", "cache"),
+        request_metrics.requests.values(),
+    )
+    lines += render_samples(
+        "app_http_requests_in_flight",
+        "gauge",
+        "HTTP requests currently being served.",
+        (),
+        {(): request_metrics.in_flight()},
+    )
+    lines += render_histograms(
+        "app_http_request_duration_seconds",
+        "HTTP request latency by route template, status and cache outcome.",
+        ("method", "route", "status", "cache"),
+        request_metrics.latency,
+    )
+    lines += render_histograms(
+        "app_http_response_size_bytes",
+        "HTTP response body size by route template.",
+        ("method", "route"),
+        request_metrics.response_size,
+    )
+    return lines
+
+
+def render_prometheus() -> str:
+    return "\n".join(_request_lines() + _cache_lines()) + "\n"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -3,6 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from datetime import timezone
 
+from app.core.config import InstrumentConfig
+from app.core.quarantine import ticker_quarantine
 from app.core.time import to_stockholm
 from app.models.summary import SummaryItem
 
@@ -28,9 +30,27 @@ def age_seconds_since(value: datetime) -> int:
     return max(0, int((now - value).total_seconds()))
 
 
-def stale_reason_for_items(items: list[SummaryItem], global_stale: bool) -> str:
+def stale_reason_for_items(items: list[SummaryItem], global_stale: bool, restored: bool = False) -> str:
     if global_stale:
         return "global_threshold"
+    if restored:
+        return "restored"
+    if any(item.stale_reason == "quarantined" for item in items):
+        return "quarantined"
     if any(item.is_stale for item in items):
         return "provider_error"
     return "none"
+
+
+def stale_reason_for_series(global_stale: bool, restored: bool = False, quarantined: bool = False) -> str:
+    if global_stale:
+        return "global_threshold"
+    if quarantined:
+        return "quarantined"
+    if restored:
+        return "restored"
+    return "none"
+
+
+def series_quarantined(provider: str, instrument: InstrumentConfig | None) -> bool:
+    return instrument is not None and ticker_quarantine.is_quarantined(provider, instrument.ticker)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import APIRouter
+
+from app.core.scheduler import scheduler
+from app.core.stage_timing import HISTORY_SIZE, cycle_history, summarize_cycles
+from app.db.repository import recent_job_stages
+from app.db.session import session_scope
+
+router = APIRouter(prefix="/api/scheduler", tags=["scheduler"])
+
+
+def _persisted_cycles() -> list[dict[str, object]]:
+    with session_scope() as session:
+        return [
+            {
+                "started_at": run.started_at.isoformat(),
+                "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+                "duration_ms": round((run.finished_at - run.started_at).total_seconds() * 1000, 2),
+                "stages": {
+                    stage.name: {"duration_ms": stage.duration_ms, "calls": stage.calls, "offset_ms": stage.offset_ms}
+                    for stage in stages
+                },
+            }
+            for run, stages in recent_job_stages(session, "cache_refresh", HISTORY_SIZE)
+        ]
+
+
+@router.get("/stats")
+def scheduler_stats():
+    stats = cycle_history.snapshot()
+    source = "memory"
+    if not stats["cycles"]:
+        # Followers (and freshly started processes) have no local cycles; read the leader's rows.
+        source = "database"
+        try:
+            stats = summarize_cycles(_persisted_cycles())
+        except SQLAlchemyError:
+            source = "unavailable"
+    return {"source": source, "scheduler": scheduler.snapshot(), **stats}
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cache import CacheEntry, cache
+from app.core.config import InstrumentConfig, instrument_registry, load_instruments
+from app.db.models import QuoteSnapshot
+from app.db.repository import (
+    SPARKLINE_RANGE_KEY,
+    SPARKLINE_SERIES_TYPE,
+    latest_completed_job_run_at,
+    latest_quote_snapshots,
+    load_series_points,
+)
+from app.db.session import session_scope
+from app.models.summary import SparkPoint, SummaryItem
+
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_KEYS = {
+    "commodities": "commodities_summary",
+    "mag7": "mag7_summary",
+    "inflation": "inflation_summary",
+}
+SERIES_CACHE_PREFIXES = {
+    "commodities": "series",
+    "inflation": "inflation_series",
+}
+
+_last_hydration: dict[str, object] | None = None
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    # SQLite drops tzinfo on DateTime(timezone=True); values are always written as UTC.
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _summary_item(
+    instrument: InstrumentConfig,
+    snapshot: QuoteSnapshot | None,
+    sparkline: list[SparkPoint],
+) -> SummaryItem:
+    if snapshot is None:
+        return SummaryItem(
+            id=instrument.id,
+            name=instrument.name_sv,
+            unit=instrument.unit_label,
+            price_type=instrument.price_type,
+            is_stale=True,
+            sparkline=[],
+        )
+    return SummaryItem(
+        id=instrument.id,
+        name=instrument.name_sv,
+        unit=instrument.unit_label,
+        price_type=instrument.price_type,
+        last=snapshot.last,
+        day_abs=snapshot.day_abs,
+        day_pct=snapshot.day_pct,
+        w1_pct=snapshot.w1_pct,
+        ytd_pct=snapshot.ytd_pct,
+        y1_pct=snapshot.y1_pct,
+        timestamp_local=_as_utc(snapshot.timestamp_local),
+        is_stale=snapshot.is_stale,
+        sparkline=sparkline,
+    )
+
+
+def _as_points(rows: list[tuple[datetime, float, datetime]]) -> list[SparkPoint]:
+    return [SparkPoint(t=_as_utc(t), v=v) for t, v, _ in rows]
+
+
+def _cache_summary(
+    module: str,
+    module_instruments: list[InstrumentConfig],
+    snapshots: dict[str, QuoteSnapshot],
+    series: dict[tuple[str, str, str], list[tuple[datetime, float, datetime]]],
+    restored: bool = True,
+) -> CacheEntry | None:
+    ordered = sorted(module_instruments, key=lambda item: item.sort_order)
+    module_snapshots = [snapshots.get(item.id) for item in ordered]
+    fetched_times = [_as_utc(row.fetched_at) for row in module_snapshots if row is not None]
+    if not fetched_times:
+        return None
+
+    items = [
+        _summary_item(
+            instrument,
+            snapshot,
+            _as_points(series.get((instrument.id, SPARKLINE_SERIES_TYPE, SPARKLINE_RANGE_KEY), [])),
+        )
+        for instrument, snapshot in zip(ordered, module_snapshots)
+    ]
+    return cache.set(
+        SUMMARY_CACHE_KEYS[module],
+        items,
+        fetched_at=max(fetched_times),
+        update_last_update=any(item.last is not None for item in items),
+        module=module,
+        restored=restored,
+        ttl_from_now=True,
+    )
+
+
+def _cache_series(
+    cache_key: str,
+    rows: list[tuple[datetime, float, datetime]],
+    restored: bool = True,
+) -> CacheEntry:
+    return cache.set(
+        cache_key,
+        _as_points(rows),
+        fetched_at=max(_as_utc(fetched_at) for _, _, fetched_at in rows),
+        update_last_update=False,
+        restored=restored,
+        ttl_from_now=True,
+    )
+
+
+def restore_summary(module: str) -> CacheEntry | None:
+    """Load one module summary from the latest persisted snapshots into the cache."""
+    module_instruments = instrument_registry.by_module(module)
+    if module not in SUMMARY_CACHE_KEYS or not module_instruments:
+        return None
+    try:
+        with session_scope() as session:
+            snapshots = latest_quote_snapshots(session, [item.id for item in module_instruments])
+            series = load_series_points(session, series_type=SPARKLINE_SERIES_TYPE, range_key=SPARKLINE_RANGE_KEY)
+            return _cache_summary(module, module_instruments, snapshots, series)
+    except SQLAlchemyError:
+        logger.exception("cache.restore_failed", extra={"event": "cache.restore_failed", "module": module})
+        return None
+
+
+def restore_series(module: str, instrument_id: str, range_key: str) -> CacheEntry | None:
+    """Load one persisted series into the cache."""
+    prefix = SERIES_CACHE_PREFIXES.get(module)
+    if prefix is None:
+        return None
+    try:
+        with session_scope() as session:
+            series = load_series_points(session, instrument_key=instrument_id, series_type=module, range_key=range_key)
+    except SQLAlchemyError:
+        logger.exception(
+            "cache.restore_failed",
+            extra={"event": "cache.restore_failed", "module": module, "instrument_id": instrument_id},
+        )
+        return None
+    rows = series.get((instrument_id, module, range_key))
+    if not rows:
+        return None
+    return _cache_series(f"{prefix}:{instrument_id}:{range_key}", rows)
+
+
+def _hydrate(instruments: list[InstrumentConfig], *, overwrite: bool, restored: bool) -> tuple[int, int]:
+    summary_count = 0
+    series_count = 0
+    with session_scope() as session:
+        snapshots = latest_quote_snapshots(session)
+        series = load_series_points(session)
+
+        for module, cache_key in SUMMARY_CACHE_KEYS.items():
+            if not overwrite and cache.get(cache_key) is not None:
+                continue
+            module_instruments = [item for item in instruments if item.module == module]
+            if _cache_summary(module, module_instruments, snapshots, series, restored=restored) is not None:
+                summary_count += 1
+
+        known_ids = {(item.module, item.id) for item in instruments}
+        for (instrument_key, series_type, range_key), rows in series.items():
+            prefix = SERIES_CACHE_PREFIXES.get(series_type)
+            if prefix is None or (series_type, instrument_key) not in known_ids:
+                continue
+            cache_key = f"{prefix}:{instrument_key}:{range_key}"
+            if not overwrite and cache.get(cache_key) is not None:
+                continue
+            _cache_series(cache_key, rows, restored=restored)
+            series_count += 1
+    return summary_count, series_count
+
+
+def hydrate_cache_from_db(instruments: list[InstrumentConfig] | None = None) -> dict[str, object]:
+    """Rebuild summary and series cache entries from the latest persisted rows.
+
+    Entries keep their original fetched_at and are marked as restored. Modules that already have a
+    live cache entry are left untouched.
+    """
+    global _last_hydration
+    started = time.perf_counter()
+    instruments = instruments if instruments is not None else load_instruments()
+    summary_count, series_count = _hydrate(instruments, overwrite=False, restored=True)
+
+    _last_hydration = {
+        "summary_entries": summary_count,
+        "series_entries": series_count,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    return dict(_last_hydration)
+
+
+def sync_cache_from_db(
+    last_seen: datetime | None,
+    instruments: list[InstrumentConfig] | None = None,
+) -> datetime | None:
+    """Follower side of leader election: reload the cache once the leader commits a newer cycle.
+
+    Returns the finish time of the newest completed refresh cycle, which the caller passes back in
+    on the next poll. Loaded entries are live (not restored) because they come from a fresh cycle.
+    """
+    with session_scope() as session:
+        latest = _as_utc(latest_completed_job_run_at(session, "cache_refresh"))
+    if latest is None or (last_seen is not None and latest <= last_seen):
+        return last_seen
+    instruments = instruments if instruments is not None else load_instruments()
+    _hydrate(instruments, overwrite=True, restored=False)
+    return latest
+
+
+def last_hydration() -> dict[str, object] | None:
+    return dict(_last_hydration) if _last_hydration is not None else None
+
+
+def invalidate_instruments(changed: list[InstrumentConfig]) -> None:
+    """Drop the module summary and series entries that contain any of the changed instruments."""
+    for instrument in changed:
+        summary_key = SUMMARY_CACHE_KEYS.get(instrument.module)
+        if summary_key is not None:
+            cache.delete(summary_key)
+        prefix = SERIES_CACHE_PREFIXES.get(instrument.module)
+        if prefix is not None:
+            cache.delete_prefix(f"{prefix}:{instrument.id}:")
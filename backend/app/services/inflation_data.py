@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
 
 from app.core.config import InstrumentConfig
+from app.core.stage_timing import stage
 from app.models.summary import SparkPoint, SummaryItem
 from app.providers import fred
 from app.providers.yahoo_finance import HistoryPoint
+from app.services.last_good import with_last_good
 from app.services.market_data import calculate_metrics
 
 
@@ -65,54 +68,63 @@ def _filter_by_range(points: list[HistoryPoint], range_key: str) -> list[History
     return [point for point in points if point.t >= cutoff]
 
 
-def fetch_summary_for_instruments(
+def _summary_item(instrument: InstrumentConfig, raw_points: list[fred.FredPoint]) -> SummaryItem:
+    yoy_points = _to_yoy_points(raw_points)
+    if not yoy_points:
+        raise ValueError("No YoY data returned from source.")
+
+    latest = yoy_points[-1]
+    prev = yoy_points[-2].close if len(yoy_points) > 1 else None
+    metrics = calculate_metrics(last=latest.close, prev_close=prev, history=yoy_points)
+    sparkline_points = [
+        SparkPoint(t=point.t, v=_round_value(point.close, instrument.precision) or point.close)
+        for point in yoy_points[-30:]
+    ]
+    return SummaryItem(
+        id=instrument.id,
+        name=instrument.name_sv,
+        unit=instrument.unit_label,
+        price_type=instrument.price_type,
+        last=_round_value(latest.close, instrument.precision),
+        day_abs=_round_value(metrics["day_abs"], instrument.precision),
+        day_pct=_round_value(metrics["day_pct"], 2),
+        w1_pct=_round_value(metrics["w1_pct"], 2),
+        ytd_pct=_round_value(metrics["ytd_pct"], 2),
+        y1_pct=_round_value(metrics["y1_pct"], 2),
+        timestamp_local=latest.t,
+        is_stale=False,
+        sparkline=sparkline_points,
+    )
+
+
+async def fetch_summary_for_instruments(
     instruments: list[InstrumentConfig],
 ) -> tuple[list[SummaryItem], dict[str, str]]:
     ordered = sorted(instruments, key=lambda item: item.sort_order)
     items: list[SummaryItem] = []
     errors: dict[str, str] = {}
 
-    for instrument in ordered:
-        try:
-            raw_points = fred.fetch_series(series_id=instrument.ticker)
-            yoy_points = _to_yoy_points(raw_points)
-            if not yoy_points:
-                raise ValueError("No YoY data returned from source.")
-
-            latest = yoy_points[-1]
-            prev = yoy_points[-2].close if len(yoy_points) > 1 else None
-            metrics = calculate_metrics(last=latest.close, prev_close=prev, history=yoy_points)
-            sparkline_points = [
-                SparkPoint(t=point.t, v=_round_value(point.close, instrument.precision) or point.close)
-                for point in yoy_points[-30:]
-            ]
-
-            items.append(
-                SummaryItem(
-                    id=instrument.id,
-                    name=instrument.name_sv,
-                    unit=instrument.unit_label,
-                    price_type=instrument.price_type,
-                    last=_round_value(latest.close, instrument.precision),
-                    day_abs=_round_value(metrics["day_abs"], instrument.precision),
-                    day_pct=_round_value(metrics["day_pct"], 2),
-                    w1_pct=_round_value(metrics["w1_pct"], 2),
-                    ytd_pct=_round_value(metrics["ytd_pct"], 2),
-                    y1_pct=_round_value(metrics["y1_pct"], 2),
-                    timestamp_local=latest.t,
-                    is_stale=False,
-                    sparkline=sparkline_points,
-                )
-            )
-        except Exception as exc:
-            errors[instrument.ticker] = str(exc)
-            items.append(_empty_item(instrument))
-
-    return items, errors
-
-
-def fetch_series_for_instrument(instrument: InstrumentConfig, range_key: str) -> list[SparkPoint]:
-    raw_points = fred.fetch_series(series_id=instrument.ticker)
+    # Every series is requested at once; the shared client and the rate limiter bound the fan-out.
+    with stage("upstream"):
+        results = await asyncio.gather(
+            *(fred.fetch_series(series_id=instrument.ticker) for instrument in ordered),
+            return_exceptions=True,
+        )
+    with stage("metrics"):
+        for instrument, result in zip(ordered, results):
+            try:
+                if isinstance(result, BaseException):
+                    raise result
+                items.append(_summary_item(instrument, result))
+            except Exception as exc:
+                errors[instrument.ticker] = str(exc)
+                items.append(_empty_item(instrument))
+
+    return with_last_good(instruments, items, errors, fred.PROVIDER_NAME), errors
+
+
+async def fetch_series_for_instrument(instrument: InstrumentConfig, range_key: str) -> list[SparkPoint]:
+    raw_points = await fred.fetch_series(series_id=instrument.ticker)
     yoy_points = _to_yoy_points(raw_points)
     filtered_points = _filter_by_range(yoy_points, range_key)
     return [SparkPoint(t=point.t, v=round(point.close, instrument.precision)) for point in filtered_points]
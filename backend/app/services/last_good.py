@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from threading import Lock
+
+from app.core.cache import cache
+from app.core.config import InstrumentConfig
+from app.core.quarantine import ticker_quarantine
+from app.models.summary import SummaryItem
+from app.services.cache_hydration import SUMMARY_CACHE_KEYS
+
+STALE_QUARANTINED = "quarantined"
+STALE_PROVIDER_ERROR = "provider_error"
+
+
+class LastGoodItems:
+    """The latest summary item that had a value, per instrument id."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._items: dict[str, SummaryItem] = {}
+
+    def remember(self, item: SummaryItem) -> None:
+        with self._lock:
+            self._items[item.id] = item
+
+    def get(self, instrument_id: str) -> SummaryItem | None:
+        with self._lock:
+            return self._items.get(instrument_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+def _cached_item(instrument: InstrumentConfig) -> SummaryItem | None:
+    # After a restart the only earlier value is the summary restored from the database.
+    entry = cache.entries().get(SUMMARY_CACHE_KEYS.get(instrument.module, ""))
+    if entry is None:
+        return None
+    for item in entry.value:
+        if item.id == instrument.id and item.last is not None:
+            return item
+    return None
+
+
+def with_last_good(
+    instruments: list[InstrumentConfig],
+    items: list[SummaryItem],
+    errors: dict[str, str],
+    provider: str,
+) -> list[SummaryItem]:
+    """Remember fresh items; replace failed ones with the last good item, stale and with a reason."""
+    by_id = {instrument.id: instrument for instrument in instruments}
+    output: list[SummaryItem] = []
+    for item in items:
+        instrument = by_id.get(item.id)
+        if instrument is None or instrument.ticker not in errors:
+            if item.last is not None:
+                last_good_items.remember(item)
+            output.append(item)
+            continue
+        quarantined = ticker_quarantine.is_quarantined(provider, instrument.ticker)
+        reason = STALE_QUARANTINED if quarantined else STALE_PROVIDER_ERROR
+        previous = last_good_items.get(item.id) or _cached_item(instrument)
+        output.append((previous or item).model_copy(update={"is_stale": True, "stale_reason": reason}))
+    return output
+
+
+last_good_items = LastGoodItems()
@@ -3,9 +3,11 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 from app.core.config import InstrumentConfig
+from app.core.stage_timing import stage
 from app.models.summary import SparkPoint, SummaryItem
 from app.providers import yahoo_finance
 from app.providers.yahoo_finance import HistoryPoint, QuoteSnapshot
+from app.services.last_good import with_last_good
 
 
 def _round_value(value: float | None, precision: int) -> float | None:
@@ -111,8 +113,11 @@ def fetch_summary_for_instruments(
     instruments: list[InstrumentConfig],
 ) -> tuple[list[SummaryItem], dict[str, str]]:
     tickers = [item.ticker for item in instruments]
-    snapshots, errors = yahoo_finance.fetch_quotes_with_history(tickers=tickers, period="1y")
-    items = build_summary_items(instruments=instruments, snapshots=snapshots, errors=errors)
+    with stage("upstream"):
+        snapshots, errors = yahoo_finance.fetch_quotes_with_history(tickers=tickers, period="1y")
+    with stage("metrics"):
+        items = build_summary_items(instruments=instruments, snapshots=snapshots, errors=errors)
+        items = with_last_good(instruments, items, errors, yahoo_finance.PROVIDER_NAME)
     return items, errors
 
 
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+# Settings are read at import time, so these must be in place before any `app` module is imported.
+# setdefault: anything exported in the shell wins, e.g. to benchmark with production rate limits.
+BENCHMARK_DEFAULTS = {
+    "APP_DISABLE_SCHEDULER": "1",
+    "APP_YAHOO_MAX_CALLS": "1000000000",
+    "APP_FRED_MAX_CALLS": "1000000000",
+    "APP_UPSTREAM_RETRY_BASE_MS": "1",
+    "APP_REFRESH_CYCLE_BUDGET_SECONDS": "3600",
+    "APP_REQUEST_UPSTREAM_BUDGET_SECONDS": "600",
+}
+
+
+def configure(workdir: Path) -> None:
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("APP_DATABASE_URL", f"sqlite:///{workdir / 'benchmark.db'}")
+    for name, value in BENCHMARK_DEFAULTS.items():
+        os.environ.setdefault(name, value)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import random
+from threading import Lock
+import time
+from typing import Iterator
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+from app.providers import fred, yahoo_finance
+
+PERIOD_DAYS = {"1mo": 31, "3mo": 92, "6mo": 183, "1y": 366}
+# Fixed so series (and therefore results) do not drift with the wall clock between runs.
+ANCHOR = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+class FakeUpstreamError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class FakeProviderConfig:
+    latency_ms: float = 0.0
+    error_rate: float = 0.0
+    history_days: int = 400
+    seed: int = 0
+
+
+class _CallCounter:
+    def __init__(self, config: FakeProviderConfig) -> None:
+        self.config = config
+        self._lock = Lock()
+        self._rng = random.Random(config.seed)
+        self.calls = 0
+        self.errors = 0
+
+    def call(self, key: str) -> None:
+        # Latency and failures are drawn per call from one seeded stream, so a run is repeatable
+        # as long as calls happen in the same order (true for the sequential scheduler cycle).
+        with self._lock:
+            self.calls += 1
+            failed = self._rng.random() < self.config.error_rate
+            if failed:
+                self.errors += 1
+        if self.config.latency_ms:
+            time.sleep(self.config.latency_ms / 1000.0)
+        if failed:
+            raise FakeUpstreamError(f"Injected upstream failure for {key}.")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors}
+
+
+def _price_walk(key: str, seed: int, count: int, start: float = 100.0) -> list[float]:
+    rng = random.Random(f"{seed}:{key}")
+    values = [start * (0.5 + rng.random())]
+    for _ in range(count - 1):
+        values.append(max(0.01, values[-1] * (1 + rng.gauss(0, 0.01))))
+    return values
+
+
+class FakeYahoo(_CallCounter):
+    """Stands in for the yfinance module: `Ticker(symbol).history(...)` returns a Close DataFrame."""
+
+    def Ticker(self, ticker: str, session: object = None) -> _FakeTicker:  # noqa: N802 - mirrors yfinance.Ticker
+        return _FakeTicker(self, ticker)
+
+
+class _FakeTicker:
+    def __init__(self, owner: FakeYahoo, ticker: str) -> None:
+        self.owner = owner
+        self.ticker = ticker
+
+    def history(
+        self,
+        period: str = "1y",
+        interval: str = "1d",
+        auto_adjust: bool = False,
+        timeout: float | None = None,
+        raise_errors: bool = False,
+    ):
+        self.owner.call(self.ticker)
+        days = min(PERIOD_DAYS.get(period, 366), self.owner.config.history_days)
+        index = pd.bdate_range(end=ANCHOR, periods=max(1, days * 5 // 7), tz="UTC")
+        return pd.DataFrame({"Close": _price_walk(self.ticker, self.owner.config.seed, len(index))}, index=index)
+
+
+class FakeFred(_CallCounter):
+    """Replaces fred._download_payload with monthly observations rendered as FRED CSV."""
+
+    async def download(self, query: str, timeout: float) -> str:
+        series_id = parse_qs(query)["id"][0]
+        self.call(series_id)
+        months = max(13, self.config.history_days // 30)
+        values = _price_walk(series_id, self.config.seed, months, start=250.0)
+        lines = [f"observation_date,{series_id}"]
+        year, month = ANCHOR.year, ANCHOR.month
+        dates: list[str] = []
+        for _ in range(months):
+            dates.append(f"{year:04d}-{month:02d}-01")
+            month -= 1
+            if month == 0:
+                year, month = year - 1, 12
+        for observation_date, value in zip(reversed(dates), values):
+            lines.append(f"{observation_date},{value:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def install_fake_providers(yahoo: FakeYahoo, fred_fake: FakeFred) -> Iterator[None]:
+    previous_yf = yahoo_finance._yf_module
+    previous_download = fred._download_payload
+    yahoo_finance._yf_module = yahoo
+    fred._download_payload = fred_fake.download
+    # Cached tickers belong to whichever module created them.
+    yahoo_finance.yahoo_session.clear()
+    try:
+        yield
+    finally:
+        yahoo_finance._yf_module = previous_yf
+        fred._download_payload = previous_download
+        yahoo_finance.yahoo_session.clear()
+
@@ -0,0 +1,323 @@
+"""In-process HTTP load test of the API against fake providers.
+
+    cd backend && python -m benchmarks.loadtest --concurrency 32 --requests 2000 --save-baseline baseline.json
+    cd backend && python -m benchmarks.loadtest --concurrency 32 --requests 2000 --baseline baseline.json
+
+Requests go through httpx's ASGI transport, so routing, middleware, the threadpool that runs the
+sync handlers, the cache and the provider layer are all real; only the upstream calls are faked.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import json
+import os
+from pathlib import Path
+import random
+import sys
+import tempfile
+from threading import Event, Thread
+import time
+from typing import Callable
+
+from benchmarks.environment import configure
+
+SCENARIOS = ("warm", "expired", "during_refresh")
+DEFAULT_MIX = "commodities_summary=3,mag7_summary=3,inflation_summary=2,commodities_series=1,inflation_series=1,health=1"
+COMMODITY_SERIES_RANGES = ("1m", "3m", "1y")
+INFLATION_SERIES_RANGES = ("1m", "3m", "6m", "1y")
+DEFAULT_TOLERANCE = 0.25
+
+
+@dataclass(frozen=True)
+class Sample:
+    endpoint: str
+    status: int
+    seconds: float
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return round(ordered[index], 6)
+
+
+def _latency(values: list[float]) -> dict[str, float | None]:
+    return {
+        "p50": _percentile(values, 0.5),
+        "p95": _percentile(values, 0.95),
+        "p99": _percentile(values, 0.99),
+        "max": round(max(values), 6) if values else None,
+    }
+
+
+def parse_mix(raw: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for part in raw.split(","):
+        name, _separator, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def _request_plan(mix: dict[str, int], total: int, seed: int) -> list[tuple[str, str]]:
+    from app.core.config import instrument_registry
+
+    commodity_ids = [item.id for item in instrument_registry.by_module("commodities")]
+    inflation_ids = [item.id for item in instrument_registry.by_module("inflation")]
+    rng = random.Random(seed)
+    builders = {
+        "commodities_summary": lambda: "/api/commodities/summary",
+        "mag7_summary": lambda: "/api/mag7/summary",
+        "inflation_summary": lambda: "/api/inflation/summary",
+        "health": lambda: "/api/health",
+        "commodities_series": lambda: (
+            f"/api/commodities/series?id={rng.choice(commodity_ids)}&range={rng.choice(COMMODITY_SERIES_RANGES)}"
+        ),
+        "inflation_series": lambda: (
+            f"/api/inflation/series?id={rng.choice(inflation_ids)}&range={rng.choice(INFLATION_SERIES_RANGES)}"
+        ),
+    }
+    unknown = sorted(set(mix) - set(builders))
+    if unknown:
+        raise ValueError(f"unknown endpoints in mix: {', '.join(unknown)}")
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    return [(name, builders[name]()) for name in rng.choices(names, weights=weights, k=total)]
+
+
+async def _drive(app, plan: list[tuple[str, str]], concurrency: int) -> tuple[list[Sample], float]:
+    import httpx
+
+    samples: list[Sample] = []
+    pending = iter(plan)
+    transport = httpx.ASGITransport(app=app)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for endpoint, url in pending:
+            started = time.perf_counter()
+            response = await client.get(url)
+            samples.append(Sample(endpoint, response.status_code, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def _expire_cache() -> int:
+    # Re-insert every live entry with a fetched_at older than the TTL, so each key is in the cache but
+    # expired: the first requests for it miss and refill concurrently.
+    from app.core.cache import cache
+
+    backdated = datetime.now(timezone.utc) - timedelta(seconds=cache.ttl_seconds + 1)
+    entries = cache.entries()
+    for key, entry in entries.items():
+        cache.set(key, entry.value, fetched_at=backdated, update_last_update=False)
+    return len(entries)
+
+
+class _BackgroundRefresh:
+    """Runs scheduler cycles back to back (and lets the writer commit them) while load is applied."""
+
+    def __init__(self) -> None:
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="loadtest-refresh", daemon=True)
+        self.cycles = 0
+
+    def _run(self) -> None:
+        from app.core.scheduler import _refresh_once_sync
+        from app.db.write_behind import write_queue
+
+        while not self._stop.is_set():
+            _refresh_once_sync()
+            write_queue.flush()
+            self.cycles += 1
+
+    def __enter__(self) -> _BackgroundRefresh:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _cache_events(before: dict[tuple[str, str], int], after: dict[tuple[str, str], int]) -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for (namespace, event), value in after.items():
+        totals[event] = totals.get(event, 0) + value - before.get((namespace, event), 0)
+    return {event: totals.get(event, 0) for event in ("hits", "misses", "stale_serves", "sets")}
+
+
+def run_scenario(
+    name: str,
+    plan: list[tuple[str, str]],
+    concurrency: int,
+    upstream_calls: Callable[[], dict[str, int]],
+) -> dict[str, object]:
+    from app.core.cache import cache
+    from app.core.scheduler import _refresh_once_sync
+    from app.db.write_behind import write_queue
+    from app.main import app
+    from benchmarks.suite import reset_runtime_state
+
+    reset_runtime_state()
+    _refresh_once_sync()
+    write_queue.flush()
+    expired = _expire_cache() if name == "expired" else 0
+
+    calls_before = upstream_calls()
+    events_before = cache.event_counts()
+    refresh_cycles = None
+    if name == "during_refresh":
+        with _BackgroundRefresh() as refresher:
+            samples, elapsed = asyncio.run(_drive(app, plan, concurrency))
+        refresh_cycles = refresher.cycles
+    else:
+        samples, elapsed = asyncio.run(_drive(app, plan, concurrency))
+
+    by_endpoint: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample)
+    return {
+        "scenario": name,
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "errors": sum(1 for sample in samples if sample.status >= 500),
+        "latency_seconds": _latency([sample.seconds for sample in samples]),
+        "endpoints": {
+            endpoint: {
+                "requests": len(rows),
+                "statuses": dict(sorted(Counter(str(row.status) for row in rows).items())),
+                "latency_seconds": _latency([row.seconds for row in rows]),
+            }
+            for endpoint, rows in sorted(by_endpoint.items())
+        },
+        "upstream_calls": {source: count - calls_before.get(source, 0) for source, count in upstream_calls().items()},
+        "cache_events": _cache_events(events_before, cache.event_counts()),
+        "expired_entries": expired,
+        "refresh_cycles": refresh_cycles,
+    }
+
+
+def compare(results: list[dict[str, object]], baseline: list[dict[str, object]], tolerance: float) -> list[str]:
+    """Regressions against a stored run: p95 latency or throughput worse by more than `tolerance`."""
+    previous = {row["scenario"]: row for row in baseline}
+    regressions: list[str] = []
+    for row in results:
+        base = previous.get(row["scenario"])
+        if base is None:
+            continue
+        p95, base_p95 = row["latency_seconds"]["p95"], base["latency_seconds"]["p95"]
+        if p95 is not None and base_p95 and p95 > base_p95 * (1 + tolerance):
+            regressions.append(f"{row['scenario']}: p95 {base_p95:.4f}s -> {p95:.4f}s")
+        rps, base_rps = row["throughput_rps"], base["throughput_rps"]
+        if rps is not None and base_rps and rps < base_rps * (1 - tolerance):
+            regressions.append(f"{row['scenario']}: throughput {base_rps:.1f} -> {rps:.1f} req/s")
+        if row["errors"] > base["errors"]:
+            regressions.append(f"{row['scenario']}: errors {base['errors']} -> {row['errors']}")
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight pairs")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="fake (or replayed) upstream latency per call")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", type=Path, default=None, help="serve recorded payloads from this provider archive")
+    parser.add_argument("--workdir", type=Path, default=None)
+    parser.add_argument("--output", default="-", help="JSON output path, '-' for stdout")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="also write the results here")
+    parser.add_argument("--baseline", type=Path, default=None, help="fail (exit 1) on regressions against this")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.replay is not None:
+        # Recorded data instead of fakes; must be set before the provider modules are imported.
+        os.environ["APP_PROVIDER_MODE"] = "replay"
+        os.environ["APP_PROVIDER_ARCHIVE_DIR"] = str(args.replay)
+        os.environ["APP_REPLAY_LATENCY_MS"] = str(int(args.latency_ms))
+    configure(args.workdir or Path(tempfile.mkdtemp(prefix="ekonomi-loadtest-")))
+
+    from app.db.migrations import upgrade_to_head
+    from app.db.write_behind import write_queue
+    from app.providers.archive import provider_archive
+    from benchmarks.fakes import FakeFred, FakeProviderConfig, FakeYahoo, install_fake_providers
+
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown:
+        print(f"unknown scenarios: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    config = FakeProviderConfig(latency_ms=args.latency_ms, error_rate=args.error_rate, seed=args.seed)
+    if args.replay is not None:
+        providers = nullcontext()
+
+        def upstream_calls() -> dict[str, int]:
+            return {"replayed": provider_archive().stats()["replayed"]}
+
+    else:
+        yahoo, fred_fake = FakeYahoo(config), FakeFred(config)
+        providers = install_fake_providers(yahoo, fred_fake)
+
+        def upstream_calls() -> dict[str, int]:
+            return {"yahoo": yahoo.stats()["calls"], "fred": fred_fake.stats()["calls"]}
+
+    upgrade_to_head()
+    write_queue.start()
+    try:
+        with providers:
+            plan = _request_plan(parse_mix(args.mix), args.requests, args.seed)
+            results = [run_scenario(name, plan, max(1, args.concurrency), upstream_calls) for name in scenarios]
+    finally:
+        write_queue.stop()
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "mix": parse_mix(args.mix),
+            "replay_archive": str(args.replay) if args.replay is not None else None,
+            "fake_providers": {"latency_ms": config.latency_ms, "error_rate": config.error_rate, "seed": config.seed},
+        },
+        "results": results,
+    }
+    exit_code = 0
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline["results"], args.tolerance)
+        report["regressions"] = regressions
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(payload + "\n", encoding="utf-8")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
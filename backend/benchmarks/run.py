@@ -0,0 +1,103 @@
+"""Run the offline benchmark suite and write results as JSON.
+
+    cd backend && python -m benchmarks.run --sizes 10,100,1000 --output benchmarks/results/latest.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.environment import configure
+
+DEFAULT_SIZES = "10,100,1000"
+MAX_INSTRUMENTS = 5000
+
+
+def _git_revision() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _sizes(raw: str) -> list[int]:
+    sizes = [int(part) for part in raw.split(",") if part.strip()]
+    if not sizes or any(size < 1 or size > MAX_INSTRUMENTS for size in sizes):
+        raise argparse.ArgumentTypeError(f"sizes must be between 1 and {MAX_INSTRUMENTS}")
+    return sizes
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=_sizes, default=_sizes(DEFAULT_SIZES), help="instrument counts, comma separated")
+    parser.add_argument("--benchmarks", default="all", help="comma separated subset of the suite, or 'all'")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake upstream latency per call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake upstream calls that fail")
+    parser.add_argument("--history-days", type=int, default=400, help="history length the fakes return")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path, default=None, help="where the benchmark DB and configs go")
+    parser.add_argument("--output", default="-", help="JSON output path, '-' for stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="ekonomi-bench-"))
+    configure(workdir)
+
+    # Imported after configure(): app settings are read when the modules load.
+    from benchmarks.fakes import FakeProviderConfig
+    from benchmarks.suite import BENCHMARKS, run_suite
+
+    names = list(BENCHMARKS) if args.benchmarks == "all" else args.benchmarks.split(",")
+    unknown = sorted(set(names) - set(BENCHMARKS))
+    if unknown:
+        print(f"unknown benchmarks: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    config = FakeProviderConfig(
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        history_days=args.history_days,
+        seed=args.seed,
+    )
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+            "fake_providers": {
+                "latency_ms": config.latency_ms,
+                "error_rate": config.error_rate,
+                "history_days": config.history_days,
+                "seed": config.seed,
+            },
+        },
+        "results": run_suite(args.sizes, names, config, max(1, args.repeat), workdir),
+    }
+    payload = json.dumps(report, indent=2, default=str)
+    if args.output == "-":
+        print(payload)
+    else:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(payload + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import statistics
+import time
+from typing import Callable, Iterator
+
+from app.core import scheduler as scheduler_module
+from app.core.cache import cache
+from app.core.circuit_breaker import circuit_breakers
+from app.core.config import InstrumentRegistry
+from app.core.provider_monitor import provider_monitor
+from app.core.rate_limit import rate_limiter
+from app.core.scheduler import _persist_series, _persist_summary_items, _refresh_once_sync
+from app.core.stage_timing import cycle_history
+from app.db.migrations import upgrade_to_head
+from app.db.repository import upsert_instruments
+from app.db.session import session_scope
+from app.db.write_behind import write_queue
+from app.models.summary import SparkPoint
+from app.providers import fred, yahoo_finance
+from app.providers.yahoo_finance import QuoteSnapshot
+from app.services.inflation_data import _to_yoy_points
+from app.services.inflation_data import fetch_summary_for_instruments as fetch_inflation_summary
+from app.services.market_data import build_summary_items
+from benchmarks.fakes import FakeFred, FakeProviderConfig, FakeYahoo, install_fake_providers
+from benchmarks.universe import synthetic_instruments, write_instruments_file
+
+Result = dict[str, object]
+
+
+def _summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "min": round(min(samples), 6),
+        "median": round(statistics.median(samples), 6),
+        "mean": round(statistics.fmean(samples), 6),
+        "max": round(max(samples), 6),
+    }
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _result(name: str, size: int, samples: list[float], units: int, **extra: object) -> Result:
+    median = statistics.median(samples)
+    return {
+        "benchmark": name,
+        "instruments": size,
+        "repeat": len(samples),
+        "seconds": _summarize(samples),
+        "units": units,
+        "units_per_second": round(units / median, 2) if median else None,
+        **extra,
+    }
+
+
+def reset_runtime_state() -> None:
+    cache.clear()
+    circuit_breakers.clear()
+    provider_monitor.clear()
+    rate_limiter.clear()
+
+
+@contextmanager
+def _instrument_universe(size: int, workdir: Path) -> Iterator[list]:
+    # The scheduler reads instruments through the registry; point a private one at a synthetic file.
+    instruments = synthetic_instruments(size)
+    registry = InstrumentRegistry(path=write_instruments_file(instruments, workdir / f"instruments-{size}.yaml"))
+    previous = scheduler_module.load_instruments
+    scheduler_module.load_instruments = registry.instruments
+    try:
+        yield instruments
+    finally:
+        scheduler_module.load_instruments = previous
+
+
+def _market_snapshots(instruments: list, config: FakeProviderConfig) -> dict[str, QuoteSnapshot]:
+    fake = FakeYahoo(FakeProviderConfig(history_days=config.history_days, seed=config.seed))
+    snapshots = {}
+    for instrument in instruments:
+        history = yahoo_finance._extract_history_points(fake.Ticker(instrument.ticker).history(period="1y"))
+        snapshots[instrument.ticker] = QuoteSnapshot(
+            timestamp=history[-1].t,
+            last=history[-1].close,
+            prev_close=history[-2].close if len(history) > 1 else None,
+            history=history,
+        )
+    return snapshots
+
+
+def bench_refresh_cycle(size: int, config: FakeProviderConfig, repeat: int, workdir: Path) -> list[Result]:
+    """Full `_refresh_once_sync` against fake providers, including draining the write-behind queue."""
+    upgrade_to_head()
+    yahoo, fred_fake = FakeYahoo(config), FakeFred(config)
+    cycle_samples: list[float] = []
+    flush_samples: list[float] = []
+    write_queue.clear()
+    write_queue.start()
+    try:
+        with _instrument_universe(size, workdir), install_fake_providers(yahoo, fred_fake):
+            for _ in range(repeat):
+                reset_runtime_state()
+                started = time.perf_counter()
+                _refresh_once_sync()
+                cycle_samples.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                write_queue.flush()
+                flush_samples.append(time.perf_counter() - started)
+    finally:
+        write_queue.stop()
+    stages = cycle_history.snapshot()["last_cycle"]["stages"]
+    return [
+        _result(
+            "refresh_cycle",
+            size,
+            cycle_samples,
+            size,
+            flush_seconds=_summarize(flush_samples),
+            upstream={"yahoo": yahoo.stats(), "fred": fred_fake.stats()},
+            write_queue=write_queue.stats(),
+            last_cycle_stages=stages,
+        )
+    ]
+
+
+def bench_build_summary_items(size: int, config: FakeProviderConfig, repeat: int, workdir: Path) -> list[Result]:
+    instruments = [item.model_copy(update={"module": "commodities"}) for item in synthetic_instruments(size)]
+    snapshots = _market_snapshots(instruments, config)
+    samples = _measure(lambda: build_summary_items(instruments=instruments, snapshots=snapshots), repeat)
+    return [_result("build_summary_items", size, samples, size)]
+
+
+def bench_inflation_yoy(size: int, config: FakeProviderConfig, repeat: int, workdir: Path) -> list[Result]:
+    """YoY transform alone, and the whole inflation summary path (CSV parse + YoY + metrics)."""
+    instruments = [item.model_copy(update={"module": "inflation"}) for item in synthetic_instruments(size)]
+    fred_fake = FakeFred(FakeProviderConfig(history_days=config.history_days, seed=config.seed))
+    with install_fake_providers(FakeYahoo(config), fred_fake):
+        async def fetch_all() -> list[list[fred.FredPoint]]:
+            return await asyncio.gather(*(fred.fetch_series(item.ticker) for item in instruments))
+
+        raw = dict(zip((item.ticker for item in instruments), asyncio.run(fetch_all())))
+        transform = _measure(lambda: [_to_yoy_points(points) for points in raw.values()], repeat)
+
+        def summary() -> None:
+            reset_runtime_state()
+            asyncio.run(fetch_inflation_summary(instruments))
+
+        full = _measure(summary, repeat)
+    points_per_series = len(next(iter(raw.values()), []))
+    return [
+        _result("inflation.yoy_transform", size, transform, size, points_per_series=points_per_series),
+        _result("inflation.summary", size, full, size, upstream={"fred": fred_fake.stats()}),
+    ]
+
+
+def bench_persistence(size: int, config: FakeProviderConfig, repeat: int, workdir: Path) -> list[Result]:
+    """The functions the write-behind queue runs, each in its own transaction."""
+    upgrade_to_head()
+    instruments = synthetic_instruments(size)
+    market = [item for item in instruments if item.module != "inflation"]
+    items = build_summary_items(instruments=market, snapshots=_market_snapshots(market, config))
+    fetched_at = datetime.now(timezone.utc)
+    points_by_range = {
+        range_key: [SparkPoint(t=point.t, v=point.v) for point in items[0].sparkline] if items else []
+        for range_key in scheduler_module.COMMODITY_RANGES
+    }
+
+    def upsert() -> None:
+        with session_scope() as session:
+            upsert_instruments(session, instruments=instruments)
+
+    def summaries() -> None:
+        with session_scope() as session:
+            _persist_summary_items(session, items=items, fetched_at=fetched_at)
+
+    def series() -> None:
+        with session_scope() as session:
+            for item in items:
+                _persist_series(
+                    session,
+                    instrument_key=item.id,
+                    series_type="commodities",
+                    points_by_range=points_by_range,
+                    fetched_at=fetched_at,
+                )
+
+    points_per_instrument = sum(len(points) for points in points_by_range.values())
+    return [
+        _result("persist.upsert_instruments", size, _measure(upsert, repeat), len(instruments)),
+        _result("persist.summary_items", size, _measure(summaries, repeat), len(items)),
+        _result(
+            "persist.series",
+            size,
+            _measure(series, repeat),
+            len(items) * points_per_instrument,
+            points_per_instrument=points_per_instrument,
+        ),
+    ]
+
+
+BENCHMARKS: dict[str, Callable[[int, FakeProviderConfig, int, Path], list[Result]]] = {
+    "refresh_cycle": bench_refresh_cycle,
+    "build_summary_items": bench_build_summary_items,
+    "inflation_yoy": bench_inflation_yoy,
+    "persistence": bench_persistence,
+}
+
+
+def run_suite(
+    sizes: list[int],
+    names: list[str],
+    config: FakeProviderConfig,
+    repeat: int,
+    workdir: Path,
+) -> list[Result]:
+    results = []
+    for name in names:
+        for size in sizes:
+            results.extend(BENCHMARKS[name](size, config, repeat, workdir))
+    return results
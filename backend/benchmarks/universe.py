@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import yaml
+
+from app.core.config import InstrumentConfig
+
+# Roughly the shape of the shipped config: mostly market tickers, a few FRED series.
+MODULE_WEIGHTS = (("commodities", 0.45), ("mag7", 0.45), ("inflation", 0.10))
+
+
+def synthetic_instruments(count: int) -> list[InstrumentConfig]:
+    """`count` instruments split across modules; ids and tickers are stable for a given count."""
+    instruments: list[InstrumentConfig] = []
+    remaining = count
+    for position, (module, weight) in enumerate(MODULE_WEIGHTS):
+        module_count = remaining if position == len(MODULE_WEIGHTS) - 1 else max(1, round(count * weight))
+        module_count = min(module_count, remaining)
+        remaining -= module_count
+        for index in range(module_count):
+            instrument_id = f"{module}_{index:05d}"
+            instruments.append(
+                InstrumentConfig(
+                    id=instrument_id,
+                    name_sv=f"Syntetisk {module} {index}",
+                    ticker=f"SYN{module[:3].upper()}{index:05d}",
+                    unit_label="USD" if module != "inflation" else "%",
+                    price_type="Spot" if module != "inflation" else "YoY",
+                    badge_symbol=instrument_id[:3].upper(),
+                    precision=2,
+                    display_group="cards",
+                    sort_order=index,
+                    module=module,
+                )
+            )
+    return instruments
+
+
+def write_instruments_file(instruments: list[InstrumentConfig], path: Path) -> Path:
+    path.write_text(
+        yaml.safe_dump({"instruments": [item.model_dump() for item in instruments]}, sort_keys=False),
+        encoding="utf-8",
+    )
+    return path
@@ -6,7 +6,16 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.core.cache import cache
+from app.core.circuit_breaker import circuit_breakers
 from app.core.provider_monitor import provider_monitor
+from app.core.quarantine import ticker_quarantine
+from app.core.rate_limit import rate_limiter
+from app.core.request_metrics import request_metrics
+from app.core.stage_timing import cycle_history
+from app.core.upstream import upstream_executor
+from app.db.write_behind import write_queue
+from app.providers.yahoo_finance import yahoo_session
+from app.services.last_good import last_good_items
 
 os.environ.setdefault("APP_DISABLE_SCHEDULER", "1")
 os.environ.setdefault("APP_DATABASE_URL", "sqlite:///./data/test.db")
@@ -23,3 +32,12 @@ def client() -> TestClient:
 def clear_cache() -> None:
     cache.clear()
     provider_monitor.clear()
+    circuit_breakers.clear()
+    rate_limiter.clear()
+    write_queue.clear()
+    request_metrics.clear()
+    cycle_history.clear()
+    upstream_executor.clear()
+    yahoo_session.clear()
+    ticker_quarantine.clear()
+    last_good_items.clear()
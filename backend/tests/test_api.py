@@ -42,6 +42,7 @@ def test_health_payload(client: TestClient):
     assert payload["last_success_by_module"]["mag7"] is None
     assert payload["last_success_by_module"]["inflation"] is None
     assert isinstance(payload["provider_stats"], dict)
+    assert "phases_ms" in payload["startup"]
 
 
 def test_health_last_update_after_successful_fetch(client: TestClient, monkeypatch):
@@ -97,6 +98,52 @@ def test_commodities_summary_response_shape_and_cache(client: TestClient, monkey
     assert calls["count"] == 1
 
 
+def test_cache_counters_on_health_and_metrics(client: TestClient, monkeypatch):
+    def fake_fetch_summary(instruments):
+        return [_sample_item(i.id, i.name_sv) for i in instruments], {}
+
+    monkeypatch.setattr("app.routes.commodities.fetch_summary_for_instruments", fake_fetch_summary)
+    client.get("/api/commodities/summary")
+    client.get("/api/commodities/summary")
+
+    summary = client.get("/api/health").json()["cache"]["namespaces"]["summary"]
+    assert summary["misses"] == 1
+    assert summary["hits"] == 1
+    assert summary["sets"] == 1
+    assert summary["hit_ratio"] == 0.5
+    assert summary["miss_fill_seconds"]["count"] == 1
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'app_cache_hits_total{namespace="summary"} 1' in metrics.text
+    assert 'app_cache_miss_fill_seconds_count{namespace="summary"} 1' in metrics.text
+
+
+def test_request_metrics_by_route_and_cache_outcome(client: TestClient, monkeypatch):
+    def fake_fetch_summary(instruments):
+        return [_sample_item(i.id, i.name_sv) for i in instruments], {}
+
+    monkeypatch.setattr("app.routes.mag7.fetch_summary_for_instruments", fake_fetch_summary)
+    client.get("/api/mag7/summary")
+    client.get("/api/mag7/summary")
+    client.get("/api/does-not-exist")
+
+    routes = client.get("/api/health").json()["requests"]["routes"]
+    mag7 = routes["GET /api/mag7/summary"]
+    assert mag7["count"] == 2
+    assert mag7["by_cache"] == {"miss": 1, "hit": 1}
+    assert mag7["by_status"] == {"200": 2}
+    assert mag7["latency_seconds"]["p99"] is not None
+    assert mag7["avg_response_bytes"] > 0
+    assert routes["GET unmatched"]["by_status"] == {"404": 1}
+
+    metrics = client.get("/metrics").text
+    assert 'app_http_requests_total{method="GET",route="/api/mag7/summary",status="200",cache="hit"} 1' in metrics
+    assert "app_http_request_duration_seconds_bucket" in metrics
+    assert "app_http_requests_in_flight 1" in metrics
+
+
 def test_mag7_summary_partial_data_marks_stale(client: TestClient, monkeypatch):
     def fake_fetch_summary(instruments):
         output = []
@@ -196,7 +243,7 @@ def test_summary_marks_items_stale_when_global_stale(client: TestClient, monkeyp
 def test_inflation_summary_response_shape_and_cache(client: TestClient, monkeypatch):
     calls = {"count": 0}
 
-    def fake_fetch_summary(instruments):
+    async def fake_fetch_summary(instruments):
         calls["count"] += 1
         items = [_sample_item(i.id, i.name_sv) for i in instruments]
         return items, {}
@@ -226,7 +273,7 @@ def test_inflation_series_supports_6m_range(client: TestClient, monkeypatch):
     now = datetime.now(timezone.utc)
     calls = {"count": 0}
 
-    def fake_series(_instrument, _range):
+    async def fake_series(_instrument, _range):
         calls["count"] += 1
         return [SparkPoint(t=now - timedelta(days=1), v=2.0), SparkPoint(t=now, v=2.1)]
 
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.db.session import reset_database_engine
+from app.providers import fred, yahoo_finance
+from benchmarks import run
+from benchmarks.fakes import FakeFred, FakeProviderConfig, FakeUpstreamError, FakeYahoo, install_fake_providers
+from benchmarks.universe import synthetic_instruments
+
+
+def test_synthetic_universe_is_stable_and_split_by_module():
+    instruments = synthetic_instruments(20)
+
+    assert len(instruments) == 20
+    assert len({item.id for item in instruments}) == 20
+    assert {item.module for item in instruments} == {"commodities", "mag7", "inflation"}
+    assert [item.ticker for item in synthetic_instruments(20)] == [item.ticker for item in instruments]
+    assert len(synthetic_instruments(1)) == 1
+
+
+def test_fake_providers_are_deterministic_and_inject_errors():
+    config = FakeProviderConfig(history_days=60, seed=7)
+    first = FakeYahoo(config).Ticker("SYN").history(period="1y")
+    second = FakeYahoo(config).Ticker("SYN").history(period="1y")
+    assert first["Close"].tolist() == second["Close"].tolist()
+    assert len(first) == 60 * 5 // 7
+
+    failing = FakeFred(FakeProviderConfig(error_rate=1.0))
+    with pytest.raises(FakeUpstreamError):
+        asyncio.run(failing.download("id=CPI", timeout=1.0))
+    assert failing.stats() == {"calls": 1, "errors": 1}
+
+
+def test_install_fake_providers_restores_originals():
+    original_download = fred._download_payload
+    yahoo = FakeYahoo(FakeProviderConfig())
+    with install_fake_providers(yahoo, FakeFred(FakeProviderConfig())):
+        assert yahoo_finance._yf() is yahoo
+        points = asyncio.run(fred.fetch_series("CPIAUCSL"))
+    assert len(points) == 400 // 30
+    assert fred._download_payload is original_download
+
+
+def test_runner_writes_json_for_every_benchmark(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'bench.db'}")
+    reset_database_engine()
+    output = tmp_path / "results.json"
+    try:
+        assert run.main(["--sizes", "4", "--repeat", "1", "--workdir", str(tmp_path), "--output", str(output)]) == 0
+    finally:
+        reset_database_engine()
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    names = [result["benchmark"] for result in report["results"]]
+    assert names == [
+        "refresh_cycle",
+        "build_summary_items",
+        "inflation.yoy_transform",
+        "inflation.summary",
+        "persist.upsert_instruments",
+        "persist.summary_items",
+        "persist.series",
+    ]
+    refresh = report["results"][0]
+    assert refresh["upstream"]["yahoo"]["calls"] > 0
+    assert "summary.commodities" in refresh["last_cycle_stages"]
+    assert report["meta"]["fake_providers"]["history_days"] == 400
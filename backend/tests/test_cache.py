@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from threading import Thread
+
+from app.core import cache as cache_module
+from app.core.cache import InMemoryTTLCache, NamespaceQuota, approximate_size
+from app.models.summary import SparkPoint
+
+
+def test_readers_keep_their_generation_while_writers_publish():
+    local = InMemoryTTLCache(ttl_seconds=60)
+    local.set("mag7_summary", ["old"], module="mag7")
+    before = local.generation()
+
+    local.set("mag7_summary", ["new"], module="mag7")
+
+    assert before.entries["mag7_summary"].value == ["old"]
+    assert local.get("mag7_summary").value == ["new"]
+    assert local.generation().number == before.number + 1
+    assert local.last_success_by_module()["mag7"] is not None
+
+
+def test_expired_entries_are_hidden_but_only_purged_by_janitor():
+    local = InMemoryTTLCache(ttl_seconds=60)
+    long_ago = datetime.now(timezone.utc) - timedelta(minutes=5)
+    local.set("series:gold:1m", [], fetched_at=long_ago, update_last_update=False)
+    local.set("series:brent:1m", [], update_last_update=False)
+
+    assert local.get("series:gold:1m") is None
+    stats = local.stats()
+    assert stats["entries"] == 1
+    assert stats["expired_pending"] == 1
+
+    assert local.purge_expired() == 1
+    stats = local.stats()
+    assert stats["expired_pending"] == 0
+    assert stats["janitor_purged"] == 1
+    assert "series:gold:1m" not in local.generation().entries
+
+
+def test_series_quota_evicts_least_recently_read_and_spares_summaries():
+    local = InMemoryTTLCache(
+        ttl_seconds=60,
+        quotas={"summary": NamespaceQuota(max_entries=10)},
+        default_quota=NamespaceQuota(max_entries=2),
+    )
+    local.set("mag7_summary", [], module="mag7")
+    local.set("series:brent:1m", [], update_last_update=False)
+    local.set("series:gold:1m", [], update_last_update=False)
+    local.get("series:brent:1m")
+
+    local.set("series:silver:1m", [], update_last_update=False)
+
+    assert local.get("series:gold:1m") is None
+    assert local.get("series:brent:1m") is not None
+    assert local.get("mag7_summary") is not None
+    namespaces = local.stats()["namespaces"]
+    assert namespaces["series"]["entries"] == 2
+    assert namespaces["series"]["evictions"] == 1
+    assert namespaces["summary"]["evictions"] == 0
+
+
+def test_byte_quota_bounds_namespace_size():
+    points = [SparkPoint(t=datetime.now(timezone.utc), v=float(index)) for index in range(50)]
+    one_entry = approximate_size(points)
+    local = InMemoryTTLCache(ttl_seconds=60, default_quota=NamespaceQuota(max_bytes=one_entry * 2))
+    for instrument_id in ("brent", "gold", "silver", "copper"):
+        local.set(f"inflation_series:{instrument_id}:1y", points, update_last_update=False)
+
+    namespaces = local.stats()["namespaces"]
+    assert namespaces["inflation_series"]["bytes"] <= one_entry * 2
+    assert namespaces["inflation_series"]["evictions"] == 2
+
+
+def test_misses_that_never_fill_do_not_stop_fill_latency_tracking(monkeypatch):
+    monkeypatch.setattr(cache_module, "MAX_PENDING_FILLS", 2)
+    local = InMemoryTTLCache(ttl_seconds=60)
+    for key in ("series:never:1", "series:never:2", "series:never:3", "series:filled"):
+        assert local.get(key) is None
+
+    local.set("series:filled", [1])
+
+    assert list(local._miss_started) == ["series:never:3"]
+    assert local.namespace_stats()["series"]["miss_fill_seconds"]["count"] == 1
+
+
+def test_event_shards_of_finished_threads_are_folded_into_the_totals():
+    local = InMemoryTTLCache(ttl_seconds=60)
+    workers = [Thread(target=local.get, args=("series:brent:1m",)) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+        worker.join()
+
+    assert local.event_counts()[("series", "misses")] == 8
+    assert local._events._shards == {}
+    local.get("series:brent:1m")
+    assert local.event_counts()[("series", "misses")] == 9
+    assert len(local._events._shards) == 1
+
+
+def test_set_many_publishes_one_generation_and_keeps_quota_accounting():
+    local = InMemoryTTLCache(ttl_seconds=60, default_quota=NamespaceQuota(max_entries=3))
+    local.set("series:brent:1m", [], update_last_update=False)
+    local.delete("series:brent:1m")
+    before = local.generation().number
+
+    local.set_many({f"series:gold:{range_key}": [] for range_key in ("1m", "3m", "1y")}, update_last_update=False)
+
+    assert local.generation().number == before + 1
+    assert local.namespace_stats()["series"]["evictions"] == 0
+    local.set("series:silver:1m", [], update_last_update=False)
+    namespaces = local.stats()["namespaces"]
+    assert namespaces["series"]["entries"] == 3
+    assert namespaces["series"]["evictions"] == 1
+    assert namespaces["series"]["sets"] == 5
+
+
+def test_access_times_of_dropped_keys_do_not_leak():
+    local = InMemoryTTLCache(ttl_seconds=60)
+    local.set("series:brent:1m", [], update_last_update=False)
+    local.set("series:gold:1m", [], update_last_update=False)
+    local.delete("series:brent:1m")
+    # What a lock-free reader racing the delete can leave behind.
+    local._last_access["series:brent:1m"] = 1.0
+
+    local.purge_expired()
+
+    assert set(local._last_access) == {"series:gold:1m"}
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from app.core.cache import cache
+from app.core.config import InstrumentConfig
+from app.db.migrations import upgrade_to_head
+from app.db.repository import replace_series_points, store_summary_items, upsert_instruments
+from app.db.session import reset_database_engine, session_scope
+from app.models.summary import SparkPoint, SummaryItem
+from app.providers import yahoo_finance
+from app.providers.fred import FredPoint
+from app.services import inflation_data, market_data
+from app.services.cache_hydration import hydrate_cache_from_db
+
+
+def _instrument(item_id: str, module: str, ticker: str) -> InstrumentConfig:
+    return InstrumentConfig(id=item_id, name_sv=item_id, ticker=ticker, sort_order=1, module=module)
+
+
+def _summary_item(item_id: str, fetched_at: datetime) -> SummaryItem:
+    return SummaryItem(
+        id=item_id,
+        name=item_id,
+        last=101.0,
+        day_pct=1.0,
+        timestamp_local=fetched_at,
+        is_stale=False,
+        sparkline=[SparkPoint(t=fetched_at - timedelta(days=1), v=100.0), SparkPoint(t=fetched_at, v=101.0)],
+    )
+
+
+def test_hydrate_cache_restores_latest_rows(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'hydration-test.db'}")
+    reset_database_engine()
+    upgrade_to_head()
+
+    instruments = [
+        _instrument("brent", "commodities", "BZ=F"),
+        _instrument("aapl", "mag7", "AAPL"),
+        _instrument("inflation_us", "inflation", "CPIAUCSL"),
+    ]
+    latest = datetime.now(timezone.utc) - timedelta(minutes=1)
+    older = latest - timedelta(minutes=5)
+    with session_scope() as session:
+        instrument_ids = upsert_instruments(session, instruments)
+        for fetched_at in (older, latest):
+            store_summary_items(
+                session,
+                instrument_ids,
+                [_summary_item(item.id, fetched_at) for item in instruments],
+                fetched_at,
+            )
+        replace_series_points(
+            session,
+            instrument_id=instrument_ids["brent"],
+            series_type="commodities",
+            range_key="1y",
+            points=[SparkPoint(t=older - timedelta(days=1), v=80.0), SparkPoint(t=older, v=81.0)],
+            fetched_at=latest,
+        )
+
+    result = hydrate_cache_from_db(instruments)
+    assert result["summary_entries"] == 3
+    assert result["series_entries"] == 1
+
+    summary = cache.get("commodities_summary")
+    assert summary is not None
+    assert summary.restored is True
+    assert summary.fetched_at == latest
+    assert summary.value[0].last == 101.0
+    assert summary.value[0].sparkline == _summary_item("brent", latest).sparkline
+
+    series = cache.get("series:brent:1y")
+    assert series is not None
+    assert series.restored is True
+    assert cache.last_update() == latest
+    assert cache.is_globally_stale() is False
+
+    reset_database_engine()
+
+
+class _DailyTicker:
+    def __init__(self, _ticker: str, session: object = None) -> None:
+        pass
+
+    def history(self, **_kwargs):
+        index = pd.date_range("2025-01-01", periods=60, freq="D", tz="UTC")
+        return pd.DataFrame({"Close": [100.0 + index_number * 0.5 for index_number in range(60)]}, index=index)
+
+
+class _DailyYf:
+    Ticker = _DailyTicker
+
+
+def test_restored_summary_matches_the_live_one(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'hydration-live.db'}")
+    reset_database_engine()
+    upgrade_to_head()
+    monkeypatch.setattr(yahoo_finance, "_yf", lambda: _DailyYf)
+    monthly = [
+        FredPoint(t=datetime(2020 + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc), value=250.0 + month)
+        for month in range(60)
+    ]
+    async def fetch_series(series_id: str) -> list[FredPoint]:
+        return monthly
+
+    monkeypatch.setattr(inflation_data.fred, "fetch_series", fetch_series)
+    aapl = _instrument("aapl", "mag7", "AAPL")
+    cpi = _instrument("inflation_us", "inflation", "CPIAUCSL")
+
+    live_mag7, _errors = market_data.fetch_summary_for_instruments([aapl])
+    live_inflation, _errors = asyncio.run(inflation_data.fetch_summary_for_instruments([cpi]))
+    fetched_at = datetime.now(timezone.utc)
+    with session_scope() as session:
+        instrument_ids = upsert_instruments(session, [aapl, cpi])
+        store_summary_items(session, instrument_ids, live_mag7 + live_inflation, fetched_at)
+    cache.clear()
+
+    hydrate_cache_from_db([aapl, cpi])
+
+    assert len(live_mag7[0].sparkline) == 30
+    assert len(live_inflation[0].sparkline) == 30
+    assert cache.get("mag7_summary").value == live_mag7
+    assert cache.get("inflation_summary").value == live_inflation
+    reset_database_engine()
+
+
+def test_restored_entry_reported_in_route_meta(client):
+    cache.set(
+        "mag7_summary",
+        [SummaryItem(id="aapl", name="Apple", last=1.0, is_stale=False)],
+        fetched_at=datetime.now(timezone.utc) - timedelta(hours=2),
+        module="mag7",
+        restored=True,
+    )
+    response = client.get("/api/mag7/summary")
+    assert response.status_code == 200
+    meta = response.json()["meta"]
+    assert meta["cached"] is True
+    assert meta["restored"] is True
+    assert meta["stale_reason"] == "global_threshold"
+    assert meta["age_seconds"] >= 7200
+
+
+def _fail_upstream(*_args, **_kwargs):
+    raise AssertionError("upstream must not be called in cache-only mode")
+
+
+def test_cache_only_mode_serves_persisted_data_or_503(client, monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'cache-only-test.db'}")
+    monkeypatch.setenv("APP_CACHE_ONLY", "1")
+    reset_database_engine()
+    upgrade_to_head()
+    monkeypatch.setattr("app.routes.commodities.fetch_summary_for_instruments", _fail_upstream)
+    monkeypatch.setattr("app.routes.commodities.fetch_series_for_instrument", _fail_upstream)
+    monkeypatch.setattr("app.routes.mag7.fetch_summary_for_instruments", _fail_upstream)
+
+    assert client.get("/api/commodities/summary").status_code == 503
+    assert client.get("/api/commodities/series", params={"id": "brent", "range": "1m"}).status_code == 503
+    assert client.get("/api/commodities/series", params={"id": "unknown-id", "range": "1m"}).status_code == 404
+
+    fetched_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    with session_scope() as session:
+        instrument_ids = upsert_instruments(session, [_instrument("brent", "commodities", "BZ=F")])
+        store_summary_items(session, instrument_ids, [_summary_item("brent", fetched_at)], fetched_at)
+        replace_series_points(
+            session,
+            instrument_id=instrument_ids["brent"],
+            series_type="commodities",
+            range_key="1m",
+            points=[SparkPoint(t=fetched_at, v=81.0)],
+            fetched_at=fetched_at,
+        )
+
+    summary = client.get("/api/commodities/summary")
+    assert summary.status_code == 200
+    meta = summary.json()["meta"]
+    assert meta["cached"] is True
+    assert meta["restored"] is True
+    assert meta["stale_reason"] == "restored"
+    brent = next(item for item in summary.json()["items"] if item["id"] == "brent")
+    assert brent["last"] == 101.0
+
+    series = client.get("/api/commodities/series", params={"id": "brent", "range": "1m"})
+    assert series.status_code == 200
+    assert series.json()["points"][0]["v"] == 81.0
+    assert series.json()["meta"]["stale_reason"] == "restored"
+
+    assert client.get("/api/health").json()["serving"]["cache_only"] is True
+    reset_database_engine()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from app.core.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from app.providers import yahoo_finance
+
+
+class _FakeTime:
+    def __init__(self, clock: dict[str, float]) -> None:
+        self._clock = clock
+
+    def monotonic(self) -> float:
+        return self._clock["now"]
+
+
+def test_circuit_opens_after_threshold_and_allows_single_probe(monkeypatch):
+    clock = {"now": 100.0}
+    monkeypatch.setattr("app.core.circuit_breaker.time", _FakeTime(clock))
+    breakers = CircuitBreakerRegistry(failure_threshold=2, reset_timeout_seconds=10, per_key=False)
+
+    breakers.before_call("yahoo")
+    breakers.record_failure("yahoo")
+    breakers.before_call("yahoo")
+    breakers.record_failure("yahoo")
+
+    assert breakers.is_open("yahoo") is True
+    with pytest.raises(CircuitOpenError):
+        breakers.before_call("yahoo")
+
+    clock["now"] += 10
+    assert breakers.is_open("yahoo") is False
+    breakers.before_call("yahoo")
+    assert breakers.snapshot()["yahoo"]["state"] == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breakers.before_call("yahoo")
+
+    breakers.record_success("yahoo")
+    assert breakers.snapshot()["yahoo"]["state"] == "closed"
+    breakers.before_call("yahoo")
+
+
+def test_failed_probe_reopens_circuit(monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr("app.core.circuit_breaker.time", _FakeTime(clock))
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout_seconds=5, per_key=False)
+    breakers.record_failure("fred")
+    clock["now"] += 5
+    breakers.before_call("fred")
+    breakers.record_failure("fred")
+
+    snapshot = breakers.snapshot()["fred"]
+    assert snapshot["state"] == "open"
+    assert snapshot["times_opened"] == 2
+
+
+def test_released_probe_lets_the_next_caller_probe(monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr("app.core.circuit_breaker.time", _FakeTime(clock))
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout_seconds=5, per_key=False)
+    breakers.record_failure("fred")
+    clock["now"] += 5
+    breakers.before_call("fred")
+
+    # The probe's call was cancelled: no outcome, but the slot must not stay claimed.
+    breakers.release_probe("fred")
+    breakers.before_call("fred")
+    assert breakers.snapshot()["fred"]["state"] == "half_open"
+
+
+def test_per_ticker_circuit_isolates_bad_ticker():
+    breakers = CircuitBreakerRegistry(failure_threshold=2, reset_timeout_seconds=60, per_key=True)
+    breakers.record_failure("yahoo", "BAD")
+    breakers.record_success("yahoo", "GOOD")
+    breakers.record_failure("yahoo", "BAD")
+
+    assert breakers.is_open("yahoo", "BAD") is True
+    assert breakers.is_open("yahoo", "GOOD") is False
+
+
+def test_yahoo_fails_fast_while_circuit_open(monkeypatch):
+    calls = {"count": 0}
+
+    class _BrokenTicker:
+        def __init__(self, _ticker, session=None):
+            pass
+
+        def history(self, **_kwargs):
+            calls["count"] += 1
+            raise ConnectionError("upstream down")
+
+    class _FakeYf:
+        Ticker = _BrokenTicker
+
+    monkeypatch.setattr(yahoo_finance, "_yf", lambda: _FakeYf)
+    monkeypatch.setattr(yahoo_finance, "UPSTREAM_RETRY_BASE_MS", 1)
+    monkeypatch.setattr(
+        yahoo_finance,
+        "circuit_breakers",
+        CircuitBreakerRegistry(failure_threshold=2, reset_timeout_seconds=60, per_key=False),
+    )
+
+    _snapshots, errors = yahoo_finance.fetch_quotes_with_history(["AAA", "BBB", "CCC"])
+
+    assert set(errors) == {"AAA", "BBB", "CCC"}
+    assert calls["count"] == 2
+    assert "circuit open" in errors["CCC"]
+
+
+def test_yahoo_transport_errors_open_the_circuit(monkeypatch):
+    # Real yfinance down to its HTTP layer; by default it would swallow these and return an empty frame.
+    from yfinance import data
+
+    calls = {"count": 0}
+
+    def _unreachable(_self, *_args, **_kwargs):
+        calls["count"] += 1
+        raise ConnectionError("network down")
+
+    monkeypatch.setattr(data.YfData, "get", _unreachable)
+    monkeypatch.setattr(data.YfData, "cache_get", _unreachable)
+    monkeypatch.setattr(yahoo_finance, "UPSTREAM_RETRY_BASE_MS", 1)
+    monkeypatch.setattr(yahoo_finance, "UPSTREAM_RETRY_ATTEMPTS", 3)
+    breakers = CircuitBreakerRegistry(failure_threshold=3, reset_timeout_seconds=60, per_key=False)
+    monkeypatch.setattr(yahoo_finance, "circuit_breakers", breakers)
+
+    with pytest.raises(RuntimeError, match="network down"):
+        yahoo_finance.fetch_history("GC=F", "1m")
+    with pytest.raises(RuntimeError, match="circuit open"):
+        yahoo_finance.fetch_history("GC=F", "1m")
+
+    assert breakers.snapshot()["yahoo_finance"]["state"] == "open"
+    assert calls["count"] > 0
+
+
+def test_yahoo_missing_data_is_not_retried_or_counted_against_circuit(monkeypatch):
+    calls = {"count": 0}
+
+    class _EmptyTicker:
+        def __init__(self, _ticker, session=None):
+            pass
+
+        def history(self, **_kwargs):
+            calls["count"] += 1
+            return pd.DataFrame({"Close": []})
+
+    class _FakeYf:
+        Ticker = _EmptyTicker
+
+    monkeypatch.setattr(yahoo_finance, "_yf", lambda: _FakeYf)
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout_seconds=60, per_key=False)
+    monkeypatch.setattr(yahoo_finance, "circuit_breakers", breakers)
+
+    assert yahoo_finance.fetch_history("DELISTED", "1m") == []
+    _snapshots, errors = yahoo_finance.fetch_quotes_with_history(["DELISTED"])
+
+    assert calls["count"] == 2
+    assert "No data returned" in errors["DELISTED"]
+    assert breakers.snapshot()["yahoo_finance"]["state"] == "closed"
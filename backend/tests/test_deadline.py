@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.deadline import DeadlineExceeded, call_timeout, current_deadline, deadline_scope
+from app.core.provider_monitor import provider_monitor
+from app.providers import yahoo_finance
+
+
+def test_nested_scope_never_extends_outer_budget():
+    assert current_deadline() is None
+    with deadline_scope(1) as outer:
+        with deadline_scope(60) as inner:
+            assert inner is outer
+            assert call_timeout(30) <= 1
+        with deadline_scope(0.5) as tighter:
+            assert tighter.expires_at < outer.expires_at
+    assert current_deadline() is None
+    assert call_timeout(30) == 30
+
+
+def test_call_timeout_raises_when_budget_exhausted():
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded):
+            call_timeout(10)
+
+
+def test_yahoo_skips_retries_budget_cannot_cover(monkeypatch):
+    timeouts: list[float] = []
+
+    class _SlowTicker:
+        def __init__(self, _ticker, session=None):
+            pass
+
+        def history(self, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            raise TimeoutError("read timed out")
+
+    class _FakeYf:
+        Ticker = _SlowTicker
+
+    monkeypatch.setattr(yahoo_finance, "_yf", lambda: _FakeYf)
+    monkeypatch.setattr(yahoo_finance, "UPSTREAM_RETRY_BASE_MS", 5000)
+
+    with deadline_scope(2):
+        with pytest.raises(RuntimeError):
+            yahoo_finance.fetch_history("AAPL", "1m")
+
+    assert len(timeouts) == 1
+    assert timeouts[0] <= 2
+    stats = provider_monitor.snapshot()[yahoo_finance.PROVIDER_NAME]
+    assert stats["timeouts"] == 1
+    assert stats["retries"] == 0
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import time
+
+import pandas as pd
+import pytest
+
+from app.core.circuit_breaker import MissingDataError, circuit_breakers
+from app.core.provider_monitor import provider_monitor
+from app.core.rate_limit import is_throttle_error
+from app.providers import fred, yahoo_finance
+from app.providers.http_pool import AsyncKeepAliveClient, UpstreamHTTPError
+from app.providers.yahoo_finance import YahooSession
+
+CSV = "observation_date,CPIAUCSL\n2026-01-01,310.1\n2026-02-01,311.0\n"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self.server.paths.append(self.path)
+        time.sleep(self.server.delay)
+        status, body, headers = self.server.responses.get(self.path.split("?")[0], (200, CSV.encode(), {}))
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_after_response:
+            # Close without telling the client, like a server timing out an idle keep-alive socket.
+            self.close_connection = True
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@pytest.fixture()
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.paths = []
+    server.responses = {}
+    server.drop_after_response = False
+    server.delay = 0.0
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def test_fred_reuses_one_connection_across_calls(monkeypatch, stub_server):
+    client = AsyncKeepAliveClient(_base_url(stub_server), fred.PROVIDER_NAME)
+    monkeypatch.setattr(fred, "fred_client", client)
+
+    async def scenario():
+        try:
+            return await fred.fetch_series("CPIAUCSL"), await fred.fetch_series("CPIAUCSL")
+        finally:
+            await client.aclose()
+
+    first, second = asyncio.run(scenario())
+
+    assert [point.value for point in first] == [310.1, 311.0]
+    assert first == second
+    assert stub_server.connections == 1
+    assert stub_server.paths == ["/graph/fredgraph.csv?id=CPIAUCSL"] * 2
+    connections = provider_monitor.snapshot()[fred.PROVIDER_NAME]["connections"]
+    assert connections["opened"] == 1
+    assert connections["reused"] == 1
+    assert connections["setup_seconds"]["count"] == 1
+
+
+def test_fred_series_are_fetched_concurrently(monkeypatch, stub_server):
+    client = AsyncKeepAliveClient(_base_url(stub_server), fred.PROVIDER_NAME)
+    monkeypatch.setattr(fred, "fred_client", client)
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(fred.fetch_series("CPIAUCSL") for _ in range(3)))
+        finally:
+            await client.aclose()
+
+    stub_server.delay = 0.3
+    started = time.perf_counter()
+    results = asyncio.run(scenario())
+
+    assert [len(points) for points in results] == [2, 2, 2]
+    # Three overlapping requests: one connection each, in about the time of one.
+    assert time.perf_counter() - started < 0.8
+    assert client.stats()["opened"] == 3
+
+
+def _get(client: AsyncKeepAliveClient, *paths: str, pause: float = 0.0) -> list[bytes]:
+    async def scenario() -> list[bytes]:
+        bodies = []
+        try:
+            for path in paths:
+                bodies.append(await client.get(path, timeout=2))
+                await asyncio.sleep(pause)
+        finally:
+            await client.aclose()
+        return bodies
+
+    return asyncio.run(scenario())
+
+
+def test_connection_closed_by_the_server_is_not_reused(stub_server):
+    stub_server.drop_after_response = True
+    client = AsyncKeepAliveClient(_base_url(stub_server), fred.PROVIDER_NAME)
+
+    assert _get(client, "/a", "/b", pause=0.05) == [CSV.encode()] * 2
+
+    stats = client.stats()
+    assert stats["opened"] == 2
+    assert stats["reused"] == 0
+    assert stub_server.connections == 2
+
+
+def test_idle_connections_past_the_limit_are_not_reused(stub_server):
+    client = AsyncKeepAliveClient(_base_url(stub_server), fred.PROVIDER_NAME, idle_seconds=0)
+
+    _get(client, "/a", "/a")
+
+    stats = client.stats()
+    assert stats["opened"] == 2
+    assert stats["reused"] == 0
+
+
+def test_error_status_raises_and_keeps_connection(stub_server):
+    stub_server.responses["/limited"] = (429, b"slow down", {})
+    stub_server.responses["/moved"] = (302, b"", {"Location": "/a"})
+    client = AsyncKeepAliveClient(_base_url(stub_server), fred.PROVIDER_NAME)
+
+    with pytest.raises(UpstreamHTTPError) as raised:
+        _get(client, "/limited")
+    assert raised.value.status == 429
+    assert is_throttle_error(raised.value)
+
+    assert _get(client, "/moved") == [CSV.encode()]
+    assert stub_server.paths == ["/limited", "/moved", "/a"]
+
+
+def test_redirect_to_another_origin_is_refused(stub_server):
+    stub_server.responses["/away"] = (302, b"", {"Location": "http://example.invalid/a"})
+    client = AsyncKeepAliveClient(_base_url(stub_server), fred.PROVIDER_NAME)
+
+    with pytest.raises(UpstreamHTTPError, match="another origin"):
+        _get(client, "/away")
+
+
+class _RecordingTicker:
+    created: list[tuple[str, object]] = []
+    failures: list[Exception] = []
+
+    def __init__(self, ticker: str, session: object = None) -> None:
+        self.ticker = ticker
+        self.created.append((ticker, session))
+
+    def history(self, **_kwargs):
+        if self.failures:
+            raise self.failures.pop(0)
+        index = pd.date_range("2026-01-01", periods=3, freq="D", tz="UTC")
+        return pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+
+
+class _RecordingYf:
+    Ticker = _RecordingTicker
+
+
+@pytest.fixture()
+def recording_yahoo(monkeypatch):
+    _RecordingTicker.created = []
+    _RecordingTicker.failures = []
+    sessions: list[object] = []
+
+    def _factory() -> object:
+        sessions.append(object())
+        return sessions[-1]
+
+    session = YahooSession(max_age_seconds=3600, session_factory=_factory)
+    monkeypatch.setattr(yahoo_finance, "_yf", lambda: _RecordingYf)
+    monkeypatch.setattr(yahoo_finance, "yahoo_session", session)
+    monkeypatch.setattr(yahoo_finance, "UPSTREAM_RETRY_BASE_MS", 1)
+    return session, sessions
+
+
+def test_yahoo_calls_share_session_and_ticker(recording_yahoo):
+    session, sessions = recording_yahoo
+
+    yahoo_finance.fetch_history("AAPL", "1m")
+    yahoo_finance.fetch_history("AAPL", "3m")
+    yahoo_finance.fetch_history("MSFT", "1m")
+
+    assert len(sessions) == 1
+    assert _RecordingTicker.created == [("AAPL", sessions[0]), ("MSFT", sessions[0])]
+    assert session.stats()["ticker_reuses"] == 1
+    connections = provider_monitor.snapshot()[yahoo_finance.PROVIDER_NAME]["connections"]
+    assert connections["opened"] == 1
+    assert connections["reused"] == 3
+
+
+def test_yahoo_session_refreshes_when_expired(recording_yahoo):
+    session, sessions = recording_yahoo
+
+    yahoo_finance.fetch_history("AAPL", "1m")
+    session._created_at -= 3601
+    yahoo_finance.fetch_history("AAPL", "1m")
+
+    assert len(sessions) == 2
+    assert len(_RecordingTicker.created) == 2
+    assert session.stats()["expired"] == 1
+
+
+def test_yahoo_auth_error_drops_session_before_retrying(recording_yahoo):
+    session, sessions = recording_yahoo
+    _RecordingTicker.failures = [RuntimeError("401 Client Error: Unauthorized, Invalid Crumb")]
+
+    points = yahoo_finance.fetch_history("AAPL", "1m")
+
+    assert [point.close for point in points] == [1.0, 2.0, 3.0]
+    assert len(sessions) == 2
+    assert session.stats()["auth_refreshes"] == 1
+
+
+def test_fred_unknown_series_fails_once_without_tripping_circuit(monkeypatch, stub_server):
+    stub_server.responses["/graph/fredgraph.csv"] = (404, b"not found", {})
+    client = AsyncKeepAliveClient(_base_url(stub_server), fred.PROVIDER_NAME)
+    monkeypatch.setattr(fred, "fred_client", client)
+    monkeypatch.setattr(fred, "UPSTREAM_RETRY_BASE_MS", 1)
+
+    async def scenario() -> None:
+        try:
+            await fred.fetch_series("NOSUCHSERIES")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(MissingDataError):
+        asyncio.run(scenario())
+
+    assert len(stub_server.paths) == 1
+    assert circuit_breakers.snapshot()[fred.PROVIDER_NAME]["consecutive_failures"] == 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 
 from app.core.config import InstrumentConfig
@@ -22,6 +23,13 @@ def _instrument() -> InstrumentConfig:
     )
 
 
+def _returning(points: list[FredPoint]):
+    async def fetch_series(series_id: str) -> list[FredPoint]:
+        return points
+
+    return fetch_series
+
+
 def test_inflation_summary_computes_yoy(monkeypatch):
     instrument = _instrument()
     data = [
@@ -29,9 +37,9 @@ def test_inflation_summary_computes_yoy(monkeypatch):
         FredPoint(t=datetime(2025, 1, 1, tzinfo=timezone.utc), value=306.0),
         FredPoint(t=datetime(2026, 1, 1, tzinfo=timezone.utc), value=312.0),
     ]
-    monkeypatch.setattr("app.services.inflation_data.fred.fetch_series", lambda series_id: data)
+    monkeypatch.setattr("app.services.inflation_data.fred.fetch_series", _returning(data))
 
-    items, errors = fetch_summary_for_instruments([instrument])
+    items, errors = asyncio.run(fetch_summary_for_instruments([instrument]))
     assert errors == {}
     assert len(items) == 1
     assert items[0].is_stale is False
@@ -49,8 +57,36 @@ def test_inflation_series_respects_range(monkeypatch):
         FredPoint(t=datetime(2026, 1, 1, tzinfo=timezone.utc), value=309.0),
         FredPoint(t=datetime(2026, 7, 1, tzinfo=timezone.utc), value=312.0),
     ]
-    monkeypatch.setattr("app.services.inflation_data.fred.fetch_series", lambda series_id: data)
+    monkeypatch.setattr("app.services.inflation_data.fred.fetch_series", _returning(data))
 
-    points = fetch_series_for_instrument(instrument, "6m")
+    points = asyncio.run(fetch_series_for_instrument(instrument, "6m"))
     assert len(points) == 2
     assert points[-1].v == 1.96
+
+
+def test_inflation_summary_fetches_series_concurrently(monkeypatch):
+    us = _instrument()
+    se = us.model_copy(update={"id": "inflation_se", "ticker": "SWECPI", "sort_order": 2})
+    data = [
+        FredPoint(t=datetime(2025, 1, 1, tzinfo=timezone.utc), value=306.0),
+        FredPoint(t=datetime(2026, 1, 1, tzinfo=timezone.utc), value=312.0),
+    ]
+    in_flight = {"now": 0, "peak": 0}
+
+    async def fetch_series(series_id: str) -> list[FredPoint]:
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if series_id == "SWECPI":
+            raise RuntimeError("FRED request failed for SWECPI")
+        return data
+
+    monkeypatch.setattr("app.services.inflation_data.fred.fetch_series", fetch_series)
+
+    items, errors = asyncio.run(fetch_summary_for_instruments([se, us]))
+    assert in_flight["peak"] == 2
+    assert [item.id for item in items] == ["inflation_us", "inflation_se"]
+    assert items[0].last == 1.96
+    assert items[1].is_stale is True
+    assert errors == {"SWECPI": "FRED request failed for SWECPI"}
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+
+from app.core.cache import cache
+from app.core.config import InstrumentRegistry
+from app.services.cache_hydration import invalidate_instruments
+
+
+CONFIG_TEMPLATE = """
+instruments:
+  - id: brent
+    name_sv: {brent_name}
+    ticker: BZ=F
+    module: commodities
+  - id: gold
+    name_sv: Guld
+    ticker: GC=F
+    module: commodities
+  - id: aapl
+    name_sv: Apple
+    ticker: AAPL
+    module: mag7
+"""
+
+
+def _write_config(path, brent_name: str, mtime_ns: int) -> None:
+    path.write_text(CONFIG_TEMPLATE.format(brent_name=brent_name), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_registry_indexes_instruments(tmp_path):
+    config_file = tmp_path / "instruments.yaml"
+    _write_config(config_file, "Brent", 1_000_000_000)
+    registry = InstrumentRegistry(path=config_file, check_interval_seconds=0)
+
+    assert [item.id for item in registry.by_module("commodities")] == ["brent", "gold"]
+    assert registry.get("aapl", module="mag7").ticker == "AAPL"
+    assert registry.get("aapl", module="commodities") is None
+    assert registry.by_ticker("GC=F")[0].id == "gold"
+    assert registry.snapshot() is registry.snapshot()
+
+
+def test_registry_reloads_and_reports_only_changed_instruments(tmp_path):
+    config_file = tmp_path / "instruments.yaml"
+    _write_config(config_file, "Brent", 1_000_000_000)
+    registry = InstrumentRegistry(path=config_file, check_interval_seconds=0)
+    changes: list[list[str]] = []
+    registry.add_listener(lambda changed: changes.append(sorted({item.id for item in changed})))
+    first = registry.snapshot()
+
+    _write_config(config_file, "Brent", 2_000_000_000)
+    assert registry.snapshot().instruments == first.instruments
+    assert changes == []
+
+    _write_config(config_file, "Brentolja", 3_000_000_000)
+    assert registry.get("brent").name_sv == "Brentolja"
+    assert changes == [["brent"]]
+
+
+def test_registry_keeps_last_valid_config_on_parse_error(tmp_path):
+    config_file = tmp_path / "instruments.yaml"
+    _write_config(config_file, "Brent", 1_000_000_000)
+    registry = InstrumentRegistry(path=config_file, check_interval_seconds=0)
+    registry.snapshot()
+
+    config_file.write_text("instruments: [", encoding="utf-8")
+    os.utime(config_file, ns=(2_000_000_000, 2_000_000_000))
+    assert registry.get("brent") is not None
+
+
+def test_registry_keeps_last_valid_config_while_file_is_missing(tmp_path):
+    config_file = tmp_path / "instruments.yaml"
+    _write_config(config_file, "Brent", 1_000_000_000)
+    registry = InstrumentRegistry(path=config_file, check_interval_seconds=0)
+    registry.snapshot()
+
+    # An atomic rename leaves a short window where the path does not exist.
+    config_file.unlink()
+    assert registry.get("brent") is not None
+
+    _write_config(config_file, "Brentolja", 2_000_000_000)
+    assert registry.get("brent").name_sv == "Brentolja"
+
+
+def test_invalidate_instruments_drops_only_affected_keys(tmp_path):
+    config_file = tmp_path / "instruments.yaml"
+    _write_config(config_file, "Brent", 1_000_000_000)
+    registry = InstrumentRegistry(path=config_file, check_interval_seconds=0)
+    cache.set("commodities_summary", [])
+    cache.set("mag7_summary", [])
+    cache.set("series:brent:1m", [])
+    cache.set("series:gold:1m", [])
+
+    invalidate_instruments([registry.get("brent")])
+
+    assert cache.get("commodities_summary") is None
+    assert cache.get("series:brent:1m") is None
+    assert cache.get("series:gold:1m") is not None
+    assert cache.get("mag7_summary") is not None
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.cache import InMemoryTTLCache
+from app.core.l2_cache import L2SnapshotCache
+from app.models.summary import SparkPoint, SummaryItem
+
+
+def test_snapshot_round_trip_and_atomic_swap(tmp_path):
+    writer = L2SnapshotCache(tmp_path, check_interval_seconds=0)
+    reader = L2SnapshotCache(tmp_path, check_interval_seconds=0)
+    fetched_at = datetime.now(timezone.utc)
+    assert reader.get("mag7_summary") is None
+
+    writer.publish(
+        {
+            "mag7_summary": ([SummaryItem(id="aapl", name="Apple", last=190.0)], fetched_at),
+            "series:brent:1m": ([SparkPoint(t=fetched_at, v=81.0)], fetched_at),
+        },
+        last_update=fetched_at,
+        last_success_by_module={"mag7": fetched_at},
+    )
+    first = reader.current()
+    summary = reader.get("mag7_summary")
+    assert summary.value[0].last == 190.0
+    assert summary.fetched_at == fetched_at
+    assert reader.get("series:brent:1m").value[0].v == 81.0
+
+    writer.publish(
+        {"mag7_summary": ([SummaryItem(id="aapl", name="Apple", last=191.0)], fetched_at)},
+        last_update=fetched_at,
+        last_success_by_module={"mag7": fetched_at},
+    )
+    assert reader.get("mag7_summary").value[0].last == 191.0
+    assert reader.current() is not first
+    assert first.get("mag7_summary").value[0].last == 190.0
+    assert reader.stats()["swaps"] == 2
+
+
+def test_old_snapshots_are_pruned(tmp_path):
+    writer = L2SnapshotCache(tmp_path, check_interval_seconds=0)
+    fetched_at = datetime.now(timezone.utc)
+    for _ in range(5):
+        writer.publish({"series:gold:1m": ([], fetched_at)}, last_update=None, last_success_by_module={})
+    assert len(list(tmp_path.glob("snapshot-*.bin"))) == 3
+
+
+def test_local_cache_fills_from_l2_on_miss(tmp_path):
+    shared = L2SnapshotCache(tmp_path, check_interval_seconds=0)
+    fresh = datetime.now(timezone.utc)
+    expired = fresh - timedelta(minutes=10)
+    shared.publish(
+        {
+            "mag7_summary": ([SummaryItem(id="aapl", name="Apple", last=190.0)], fresh),
+            "series:brent:1m": ([SparkPoint(t=expired, v=81.0)], expired),
+        },
+        last_update=fresh,
+        last_success_by_module={"mag7": fresh},
+    )
+    local = InMemoryTTLCache(ttl_seconds=60)
+    local.attach_l2(shared)
+
+    entry = local.get("mag7_summary")
+    assert entry is not None
+    assert entry.value[0].last == 190.0
+    assert local.last_update() == fresh
+    assert local.last_success_by_module()["mag7"] == fresh
+    assert local.get("series:brent:1m") is None
+    assert local.stats()["entries"] == 1
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.cache import cache
+from app.core.config import InstrumentConfig
+from app.core.leader import LeaderLease
+from app.db.migrations import upgrade_to_head
+from app.db.repository import (
+    complete_job_run,
+    create_job_run,
+    store_summary_items,
+    try_acquire_lease,
+    upsert_instruments,
+)
+from app.db.session import reset_database_engine, session_scope
+from app.models.summary import SummaryItem
+from app.services.cache_hydration import sync_cache_from_db
+
+
+def _use_temp_database(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'leader-test.db'}")
+    reset_database_engine()
+    upgrade_to_head()
+
+
+def test_only_one_holder_gets_lease_until_it_expires(monkeypatch, tmp_path):
+    _use_temp_database(monkeypatch, tmp_path)
+    first = LeaderLease("cache_refresh", lease_seconds=60)
+    second = LeaderLease("cache_refresh", lease_seconds=60)
+
+    assert first.try_acquire() is True
+    assert second.try_acquire() is False
+    assert first.try_acquire() is True
+
+    now = datetime.now(timezone.utc)
+    with session_scope() as session:
+        assert try_acquire_lease(session, "cache_refresh", second.holder, now, now + timedelta(seconds=60)) is False
+        later = now + timedelta(seconds=120)
+        assert try_acquire_lease(session, "cache_refresh", second.holder, later, later + timedelta(seconds=60)) is True
+
+    assert first.try_acquire() is False
+    assert first.is_leader is False
+    reset_database_engine()
+
+
+def test_released_lease_is_free_for_next_holder(monkeypatch, tmp_path):
+    _use_temp_database(monkeypatch, tmp_path)
+    first = LeaderLease("cache_refresh", lease_seconds=60)
+    second = LeaderLease("cache_refresh", lease_seconds=60)
+
+    assert first.try_acquire() is True
+    first.release()
+    assert second.try_acquire() is True
+    assert second.snapshot()["is_leader"] is True
+    reset_database_engine()
+
+
+def test_follower_loads_each_committed_cycle_once(monkeypatch, tmp_path):
+    _use_temp_database(monkeypatch, tmp_path)
+    instruments = [InstrumentConfig(id="aapl", name_sv="Apple", ticker="AAPL", sort_order=1, module="mag7")]
+    fetched_at = datetime.now(timezone.utc) - timedelta(seconds=5)
+
+    assert sync_cache_from_db(None, instruments) is None
+
+    with session_scope() as session:
+        instrument_ids = upsert_instruments(session, instruments)
+        store_summary_items(
+            session,
+            instrument_ids,
+            [SummaryItem(id="aapl", name="Apple", last=190.0, is_stale=False)],
+            fetched_at,
+        )
+        job = create_job_run(session, "cache_refresh", fetched_at)
+        complete_job_run(session, job, finished_at=fetched_at, status="ok", ok_count=1, fail_count=0, notes=None)
+
+    last_seen = sync_cache_from_db(None, instruments)
+    assert last_seen is not None
+    entry = cache.get("mag7_summary")
+    assert entry is not None
+    assert entry.restored is False
+    assert entry.value[0].last == 190.0
+
+    cache.delete("mag7_summary")
+    assert sync_cache_from_db(last_seen, instruments) == last_seen
+    assert cache.get("mag7_summary") is None
+    reset_database_engine()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+
+from app.db.session import reset_database_engine
+from benchmarks import loadtest
+
+
+def _row(scenario: str, p95: float, rps: float, errors: int = 0) -> dict[str, object]:
+    return {"scenario": scenario, "latency_seconds": {"p95": p95}, "throughput_rps": rps, "errors": errors}
+
+
+def test_compare_flags_latency_throughput_and_error_regressions():
+    baseline = [_row("warm", 0.100, 200.0), _row("expired", 0.200, 100.0)]
+    results = [_row("warm", 0.120, 190.0), _row("expired", 0.300, 60.0, errors=2), _row("during_refresh", 1.0, 1.0)]
+
+    regressions = loadtest.compare(results, baseline, tolerance=0.25)
+
+    assert regressions == [
+        "expired: p95 0.2000s -> 0.3000s",
+        "expired: throughput 100.0 -> 60.0 req/s",
+        "expired: errors 0 -> 2",
+    ]
+
+
+def test_parse_mix_defaults_weight_to_one():
+    assert loadtest.parse_mix("health,mag7_summary=3") == {"health": 1, "mag7_summary": 3}
+
+
+def test_loadtest_runs_scenarios_and_checks_baseline(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'loadtest.db'}")
+    reset_database_engine()
+    output = tmp_path / "run.json"
+    baseline = tmp_path / "baseline.json"
+    common = ["--requests", "30", "--concurrency", "4", "--latency-ms", "0", "--workdir", str(tmp_path)]
+    try:
+        assert loadtest.main([*common, "--scenarios", "warm,expired", "--output", str(output), "--save-baseline", str(baseline)]) == 0
+        report = json.loads(output.read_text(encoding="utf-8"))
+
+        warm, expired = report["results"]
+        assert warm["requests"] == expired["requests"] == 30
+        assert warm["errors"] == 0
+        assert warm["upstream_calls"] == {"yahoo": 0, "fred": 0}
+        assert expired["expired_entries"] > 0
+        assert expired["cache_events"]["misses"] > 0
+        assert expired["upstream_calls"]["yahoo"] > 0
+        assert sum(row["requests"] for row in warm["endpoints"].values()) == 30
+
+        # A baseline that claims ten times the throughput must be reported as a regression.
+        inflated = json.loads(baseline.read_text(encoding="utf-8"))
+        for row in inflated["results"]:
+            row["throughput_rps"] *= 10
+        baseline.write_text(json.dumps(inflated), encoding="utf-8")
+        assert loadtest.main([*common, "--scenarios", "warm", "--output", str(output), "--baseline", str(baseline)]) == 1
+        assert json.loads(output.read_text(encoding="utf-8"))["regressions"]
+    finally:
+        reset_database_engine()
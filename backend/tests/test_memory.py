@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import tracemalloc
+
+from app.core import settings
+from app.core.cache import approximate_size, cache
+from app.core.memory import AllocationTracker, cache_footprint, deep_size, object_counts
+from app.models.summary import SparkPoint, SummaryItem
+
+
+def _points(count: int) -> list[SparkPoint]:
+    now = datetime.now(timezone.utc)
+    return [SparkPoint(t=now, v=float(index)) for index in range(count)]
+
+
+def test_deep_size_follows_nested_models():
+    item = SummaryItem(id="brent", name="Brent", sparkline=_points(50))
+    shallow = SummaryItem(id="brent", name="Brent")
+
+    assert deep_size([item]) > deep_size([shallow]) + deep_size(item.sparkline[0]) * 10
+    assert deep_size([item]) > approximate_size([item])
+
+
+def test_cache_footprint_groups_by_namespace_and_ranks_keys():
+    now = datetime.now(timezone.utc)
+    cache.set("series:brent:1y", _points(200), fetched_at=now, update_last_update=False)
+    cache.set("series:brent:1m", _points(20), fetched_at=now, update_last_update=False)
+    cache.set("commodities_summary", [SummaryItem(id="brent", name="Brent")], fetched_at=now, module="commodities")
+
+    footprint = cache_footprint(top_keys=2)
+
+    assert footprint["namespaces"]["series"]["entries"] == 2
+    assert footprint["namespaces"]["summary"]["entries"] == 1
+    assert [row["key"] for row in footprint["top_keys"]] == ["series:brent:1y", "series:brent:1m"]
+    assert footprint["total_bytes"] == sum(row["bytes"] for row in footprint["namespaces"].values())
+
+
+def test_object_counts_include_cached_models():
+    points = _points(7)
+    counts = object_counts()
+
+    assert counts["SparkPoint"] >= len(points)
+    assert set(counts) >= {"SummaryItem", "SparkPoint", "CacheEntry", "db.SeriesPoint"}
+
+
+def test_allocation_tracker_diffs_consecutive_cycles():
+    tracker = AllocationTracker(enabled=True)
+    tracker.start()
+    try:
+        tracker.record_cycle()
+        retained = [bytearray(4096) for _ in range(64)]
+        tracker.record_cycle()
+        report = tracker.snapshot()
+    finally:
+        tracker.stop()
+
+    assert retained
+    assert report["enabled"] is True
+    assert report["cycles_seen"] == 2
+    assert report["top_allocation_sites"]
+    assert any(row["size_diff_bytes"] >= 4096 * 64 for row in report["top_allocation_sites"])
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_endpoint(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    cache.set("series:brent:1y", _points(10), fetched_at=datetime.now(timezone.utc), update_last_update=False)
+
+    response = client.get("/api/admin/memory?top_keys=5", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cache"]["top_keys"][0]["key"] == "series:brent:1y"
+    assert body["objects"]["SparkPoint"] >= 10
+    assert body["tracing"] == {"enabled": False}
+    assert set(body["process"]) == {"rss_bytes", "peak_rss_bytes"}
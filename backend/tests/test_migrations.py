@@ -4,7 +4,7 @@ from pathlib import Path
 
 from sqlalchemy import create_engine, inspect, text
 
-from app.db.migrations import upgrade_to_head
+from app.db.migrations import head_revisions, is_at_head, upgrade_to_head
 from app.db.session import reset_database_engine
 
 
@@ -27,8 +27,27 @@ def test_upgrade_to_head_creates_schema(monkeypatch, tmp_path):
 
     with engine.connect() as connection:
         version = connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
-    assert version == "20260214_0001"
+    assert version == "20261019_0004"
 
     engine.dispose()
     if Path(db_file).exists():
         Path(db_file).unlink()
+
+
+def test_upgrade_to_head_skips_alembic_when_at_head(monkeypatch, tmp_path):
+    db_file = tmp_path / "migration-fast-path.db"
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{db_file}")
+    reset_database_engine()
+
+    assert is_at_head() is False
+    assert upgrade_to_head() is True
+    assert is_at_head() is True
+    assert head_revisions() == {"20261019_0004"}
+
+    def _fail_upgrade(*_args, **_kwargs):
+        raise AssertionError("alembic upgrade should be skipped at head")
+
+    monkeypatch.setattr("alembic.command.upgrade", _fail_upgrade)
+    assert upgrade_to_head() is False
+
+    reset_database_engine()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import profiling, settings
+from app.core.profiling import CycleProfiler, ProfilingMiddleware, cycle_profiler
+
+
+def _profiled_app() -> FastAPI:
+    inner = FastAPI()
+
+    @inner.get("/work")
+    def work():
+        return {"total": sum(range(20000))}
+
+    inner.add_middleware(ProfilingMiddleware, token="secret")
+    return inner
+
+
+def test_request_is_profiled_only_with_flag_and_token(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    client = TestClient(_profiled_app())
+
+    plain = client.get("/work", headers={"X-Profile": "1"})
+    assert plain.status_code == 200
+    assert "x-profile-report" not in plain.headers
+
+    wrong = client.get("/work?profile=1", headers={"X-Admin-Token": "nope"})
+    assert "x-profile-report" not in wrong.headers
+    assert list(tmp_path.iterdir()) == []
+
+    profiled = client.get("/work?profile=1", headers={"X-Admin-Token": "secret"})
+    assert profiled.status_code == 200
+    assert profiled.json()["total"] == sum(range(20000))
+    report = tmp_path / profiled.headers["x-profile-report"]
+    assert report.name.startswith("request-") and report.name.endswith("-work.txt")
+    assert report.read_text(encoding="utf-8").startswith("# sampling profile:")
+
+
+def test_cycle_profiler_profiles_only_armed_cycles(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    profiler = CycleProfiler()
+
+    with profiler.maybe_profile("cache_refresh"):
+        sum(range(1000))
+    assert list(tmp_path.iterdir()) == []
+
+    assert profiler.arm(1) == 1
+    for _ in range(3):
+        with profiler.maybe_profile("cache_refresh"):
+            sum(range(1000))
+
+    assert profiler.remaining() == 0
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert len(names) == 2
+    assert names[0].endswith("-cache_refresh.prof") and names[1].endswith("-cache_refresh.txt")
+    assert sorted(profiler.reports()) == names
+    assert "function calls" in (tmp_path / names[1]).read_text(encoding="utf-8")
+
+
+def test_admin_profiling_endpoints_require_token(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    assert client.post("/api/admin/profile/cycles").status_code == 404
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    assert client.post("/api/admin/profile/cycles", headers={"X-Admin-Token": "nope"}).status_code == 403
+
+    try:
+        armed = client.post("/api/admin/profile/cycles?count=2", headers={"X-Admin-Token": "secret"})
+        assert armed.status_code == 200
+        assert armed.json()["armed_cycles"] == 2
+
+        reports = client.get("/api/admin/profile/reports", headers={"X-Admin-Token": "secret"})
+        assert reports.json() == {"directory": str(tmp_path), "armed_cycles": 2, "reports": []}
+    finally:
+        cycle_profiler.arm(0)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.providers import archive, fred, yahoo_finance
+from app.providers.archive import ProviderArchive, ReplayMissError
+from benchmarks.fakes import FakeFred, FakeProviderConfig, FakeYahoo, install_fake_providers
+
+
+def test_replay_walks_recordings_in_order_then_repeats_the_newest(tmp_path):
+    store = ProviderArchive(tmp_path)
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    store.save("fred", "CPIAUCSL", b"first", recorded_at=start)
+    store.save("fred", "CPIAUCSL", b"second", recorded_at=start + timedelta(minutes=1))
+
+    assert [store.replay("fred", "CPIAUCSL") for _ in range(3)] == [b"first", b"second", b"second"]
+    store.rewind()
+    assert store.replay("fred", "CPIAUCSL") == b"first"
+
+    with pytest.raises(ReplayMissError):
+        store.replay("fred", "UNKNOWN")
+    assert store.stats() == {"directory": str(tmp_path), "recorded": 2, "replayed": 4, "missing": 1}
+
+
+def test_recorded_provider_payloads_replay_without_upstream(monkeypatch, tmp_path):
+    store = ProviderArchive(tmp_path)
+    monkeypatch.setattr(archive, "_archive", store)
+    yahoo, fred_fake = FakeYahoo(FakeProviderConfig(history_days=60)), FakeFred(FakeProviderConfig())
+
+    monkeypatch.setattr(archive, "PROVIDER_MODE", "record")
+    with install_fake_providers(yahoo, fred_fake):
+        recorded_history = yahoo_finance.fetch_history("BZ=F", "1m")
+        recorded_series = asyncio.run(fred.fetch_series("CPIAUCSL"))
+    assert store.stats()["recorded"] == 2
+
+    monkeypatch.setattr(archive, "PROVIDER_MODE", "replay")
+    failing = FakeProviderConfig(error_rate=1.0)
+    with install_fake_providers(FakeYahoo(failing), FakeFred(failing)):
+        replayed_history = yahoo_finance.fetch_history("BZ=F", "1m")
+        replayed_series = asyncio.run(fred.fetch_series("CPIAUCSL"))
+
+    assert replayed_history == recorded_history
+    assert replayed_series == recorded_series
+    assert yahoo.stats()["calls"] == fred_fake.stats()["calls"] == 1
+    assert store.stats()["replayed"] == 2
+
+
+def test_unknown_mode_falls_back_to_live(monkeypatch):
+    monkeypatch.setattr(archive, "PROVIDER_MODE", "bogus")
+    assert archive.provider_mode() == "live"
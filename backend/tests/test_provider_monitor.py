@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from app.core.provider_monitor import CALL_RING_SIZE, ProviderMonitor, provider_monitor
+from app.db.migrations import upgrade_to_head
+from app.db.models import ProviderEvent
+from app.db.repository import record_provider_stats_snapshot
+from app.db.session import reset_database_engine, session_scope
+from app.providers import fred
+
+
+def test_calls_are_kept_per_key_in_bounded_rings():
+    monitor = ProviderMonitor()
+    for _ in range(CALL_RING_SIZE + 5):
+        monitor.record_call("yahoo_finance", "AAPL", duration_seconds=0.2, outcome="ok", payload_bytes=100)
+    monitor.record_call("yahoo_finance", "BZ=F", duration_seconds=3.0, outcome="timeout", error="read timed out")
+    monitor.record_rate_limit_wait("yahoo_finance", 0.5, granted=True)
+
+    keys = monitor.key_snapshot()["yahoo_finance"]
+    assert keys["AAPL"]["calls"] == CALL_RING_SIZE
+    assert keys["AAPL"]["outcomes"] == {"ok": CALL_RING_SIZE}
+    assert keys["BZ=F"]["last"]["error"] == "read timed out"
+
+    row = monitor.snapshot()["yahoo_finance"]
+    assert row["latency_seconds"]["count"] == CALL_RING_SIZE + 6
+    assert row["payload_bytes"] == 100 * (CALL_RING_SIZE + 5)
+    assert row["rate_limit_wait_seconds"]["count"] == 1
+
+
+def test_fred_call_recorded_and_persisted_as_columns(monkeypatch, tmp_path):
+    payload = "observation_date,CPIAUCSL\n2025-01-01,310.0\n"
+    async def download(_query: str, _timeout: float) -> str:
+        return payload
+
+    monkeypatch.setattr(fred, "_download_payload", download)
+    assert asyncio.run(fred.fetch_series("CPIAUCSL"))[0].value == 310.0
+
+    calls = provider_monitor.key_snapshot()["fred"]["CPIAUCSL"]
+    assert calls["outcomes"] == {"ok": 1}
+    assert calls["last"]["payload_bytes"] == len(payload)
+
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'provider-stats.db'}")
+    reset_database_engine()
+    upgrade_to_head()
+    with session_scope() as session:
+        record_provider_stats_snapshot(session, created_at=datetime.now(timezone.utc))
+    with session_scope() as session:
+        event = session.query(ProviderEvent).filter(ProviderEvent.provider == "fred").one()
+        assert event.attempts == 1
+        assert event.successes == 1
+        assert event.payload_bytes == len(payload)
+        assert event.latency_p50_ms is not None
+        assert event.message is None
+    reset_database_engine()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import InstrumentConfig
+from app.core.provider_monitor import provider_monitor
+from app.core.quarantine import QuarantinedError, TickerQuarantine, ticker_quarantine
+from app.providers import yahoo_finance
+from app.services.market_data import fetch_summary_for_instruments
+
+
+class _FakeTime:
+    def __init__(self, clock: dict[str, float]) -> None:
+        self._clock = clock
+
+    def monotonic(self) -> float:
+        return self._clock["now"]
+
+
+def test_quarantine_escalates_and_lets_one_probe_through(monkeypatch):
+    clock = {"now": 100.0}
+    monkeypatch.setattr("app.core.quarantine.time", _FakeTime(clock))
+    quarantine = TickerQuarantine(failure_threshold=2, base_seconds=10, max_seconds=25)
+
+    quarantine.record_failure("yahoo", "ZN=F", "delisted")
+    assert quarantine.allow("yahoo", "ZN=F") is True
+    quarantine.record_failure("yahoo", "ZN=F", "delisted")
+    assert quarantine.allow("yahoo", "ZN=F") is False
+
+    clock["now"] = 110.0
+    assert quarantine.allow("yahoo", "ZN=F") is True
+    assert quarantine.allow("yahoo", "ZN=F") is False
+    quarantine.record_failure("yahoo", "ZN=F", "delisted")
+
+    clock["now"] = 129.0
+    assert quarantine.allow("yahoo", "ZN=F") is False
+    clock["now"] = 130.0
+    assert quarantine.allow("yahoo", "ZN=F") is True
+    quarantine.record_failure("yahoo", "ZN=F", "delisted")
+    assert quarantine.window_seconds(3) == 25
+
+    row = quarantine.snapshot()["yahoo:ZN=F"]
+    assert row["strikes"] == 3
+    assert row["skipped"] == 3
+
+    clock["now"] = 155.0
+    assert quarantine.allow("yahoo", "ZN=F") is True
+    quarantine.record_success("yahoo", "ZN=F")
+    assert quarantine.snapshot() == {}
+    assert quarantine.allow("yahoo", "ZN=F") is True
+
+
+def test_provider_side_errors_do_not_count_and_release_the_probe(monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr("app.core.quarantine.time", _FakeTime(clock))
+    quarantine = TickerQuarantine(failure_threshold=1, base_seconds=10, max_seconds=60)
+    quarantine.record_failure("yahoo", "AAA", "not found")
+
+    clock["now"] = 10.0
+    assert quarantine.allow("yahoo", "AAA") is True
+    quarantine.record_error("yahoo", "AAA", RuntimeError("Yahoo Finance rate limit reached."))
+    quarantine.record_error("yahoo", "AAA", CircuitOpenError("Circuit open for yahoo."))
+    timed_out = RuntimeError("Yahoo request failed for AAA")
+    timed_out.__cause__ = TimeoutError("read timed out")
+    quarantine.record_error("yahoo", "AAA", timed_out)
+    quarantine.record_error("yahoo", "AAA", ConnectionError("network down"))
+
+    assert quarantine.snapshot()["yahoo:AAA"]["strikes"] == 1
+    assert quarantine.allow("yahoo", "AAA") is True
+
+
+class _DelistedTicker:
+    calls: list[str] = []
+
+    def __init__(self, ticker: str, session: object = None) -> None:
+        self.ticker = ticker
+
+    def history(self, **_kwargs):
+        self.calls.append(self.ticker)
+        if self.ticker == "ZN=F":
+            return pd.DataFrame({"Close": []})
+        index = pd.date_range("2026-01-01", periods=3, freq="D", tz="UTC")
+        return pd.DataFrame({"Close": [10.0, 11.0, 12.0]}, index=index)
+
+
+class _FakeYf:
+    Ticker = _DelistedTicker
+
+
+@pytest.fixture()
+def delisted_yahoo(monkeypatch):
+    _DelistedTicker.calls = []
+    monkeypatch.setattr(yahoo_finance, "_yf", lambda: _FakeYf)
+    monkeypatch.setattr(yahoo_finance, "UPSTREAM_RETRY_ATTEMPTS", 1)
+    monkeypatch.setattr(ticker_quarantine, "failure_threshold", 2)
+
+
+def test_quarantined_ticker_is_skipped_without_spending_retries(delisted_yahoo):
+    for _ in range(2):
+        yahoo_finance.fetch_quotes_with_history(["ZN=F", "GC=F"])
+    assert _DelistedTicker.calls.count("ZN=F") == 2
+
+    snapshots, errors = yahoo_finance.fetch_quotes_with_history(["ZN=F", "GC=F"])
+
+    assert _DelistedTicker.calls.count("ZN=F") == 2
+    assert set(snapshots) == {"GC=F"}
+    assert "quarantined" in errors["ZN=F"]
+    assert provider_monitor.snapshot()[yahoo_finance.PROVIDER_NAME]["quarantined"] == 1
+    with pytest.raises(QuarantinedError):
+        yahoo_finance.fetch_history("ZN=F", "1m")
+
+
+def test_provider_outage_does_not_quarantine_tickers(monkeypatch):
+    class _DownTicker:
+        def __init__(self, _ticker: str, session: object = None) -> None:
+            pass
+
+        def history(self, **_kwargs):
+            raise ConnectionError("network down")
+
+    class _DownYf:
+        Ticker = _DownTicker
+
+    monkeypatch.setattr(yahoo_finance, "_yf", lambda: _DownYf)
+    monkeypatch.setattr(yahoo_finance, "UPSTREAM_RETRY_ATTEMPTS", 1)
+    monkeypatch.setattr(ticker_quarantine, "failure_threshold", 1)
+
+    _snapshots, errors = yahoo_finance.fetch_quotes_with_history(["ZN=F", "GC=F"])
+    with pytest.raises(RuntimeError, match="network down"):
+        yahoo_finance.fetch_history("ZN=F", "1m")
+
+    assert set(errors) == {"ZN=F", "GC=F"}
+    assert ticker_quarantine.snapshot() == {}
+
+
+def test_empty_history_counts_against_the_ticker(delisted_yahoo):
+    assert yahoo_finance.fetch_history("ZN=F", "1m") == []
+    assert yahoo_finance.fetch_history("ZN=F", "1m") == []
+
+    assert "yahoo_finance:ZN=F" in ticker_quarantine.snapshot()
+    with pytest.raises(QuarantinedError):
+        yahoo_finance.fetch_history("ZN=F", "1m")
+
+
+def test_quarantined_instrument_serves_last_good_item(delisted_yahoo, client):
+    zinc = InstrumentConfig(id="zinc", name_sv="Zink", ticker="ZN=F", sort_order=1)
+    gold = InstrumentConfig(id="gold", name_sv="Guld", ticker="GC=F", sort_order=2)
+    good = InstrumentConfig(id="zinc", name_sv="Zink", ticker="GC=F", sort_order=1)
+    fetch_summary_for_instruments([good])
+
+    first, _errors = fetch_summary_for_instruments([zinc, gold])
+    assert first[0].last == 12.0
+    assert first[0].stale_reason == "provider_error"
+
+    fetch_summary_for_instruments([zinc, gold])
+    items, errors = fetch_summary_for_instruments([zinc, gold])
+
+    assert "quarantined" in errors["ZN=F"]
+    assert items[0].last == 12.0
+    assert items[0].is_stale is True
+    assert items[0].stale_reason == "quarantined"
+    assert items[1].is_stale is False
+    assert items[1].stale_reason is None
+    assert "yahoo_finance:ZN=F" in client.get("/api/health").json()["quarantine"]
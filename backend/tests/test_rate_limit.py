@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from app.core.rate_limit import SlidingWindowRateLimiter
+import threading
+import time
+
+from app.core.rate_limit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    SlidingWindowRateLimiter,
+    TokenBucketRateLimiter,
+)
 
 
 def test_sliding_window_rate_limiter_blocks_after_threshold():
@@ -9,3 +17,47 @@ def test_sliding_window_rate_limiter_blocks_after_threshold():
     assert limiter.allow(key, max_calls=2, period_seconds=60) is True
     assert limiter.allow(key, max_calls=2, period_seconds=60) is True
     assert limiter.allow(key, max_calls=2, period_seconds=60) is False
+
+
+def test_token_bucket_blocks_until_token_refills():
+    limiter = TokenBucketRateLimiter()
+    key = "provider:bucket"
+    assert limiter.acquire(key, max_calls=2, period_seconds=1, timeout=0) is True
+    assert limiter.acquire(key, max_calls=2, period_seconds=1, timeout=0) is True
+    assert limiter.allow(key, max_calls=2, period_seconds=1) is False
+
+    started = time.monotonic()
+    assert limiter.acquire(key, max_calls=2, period_seconds=1, timeout=2) is True
+    assert 0.3 <= time.monotonic() - started < 1.5
+    assert limiter.snapshot()[key]["timed_out"] == 1
+
+
+def test_token_bucket_serves_interactive_before_background():
+    limiter = TokenBucketRateLimiter()
+    key = "provider:priority"
+    assert limiter.acquire(key, max_calls=1, period_seconds=1, timeout=0) is True
+    order: list[str] = []
+
+    def _worker(name: str, priority: int) -> None:
+        limiter.acquire(key, max_calls=1, period_seconds=1, timeout=5, priority=priority)
+        order.append(name)
+
+    background = threading.Thread(target=_worker, args=("background", PRIORITY_BACKGROUND))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=_worker, args=("interactive", PRIORITY_INTERACTIVE))
+    interactive.start()
+    background.join()
+    interactive.join()
+    assert order == ["interactive", "background"]
+
+
+def test_token_bucket_adapts_rate_on_throttling():
+    limiter = TokenBucketRateLimiter()
+    key = "provider:aimd"
+    limiter.allow(key, max_calls=10, period_seconds=10)
+    limiter.record_throttle(key)
+    assert limiter.snapshot()[key]["rate_factor"] == 0.5
+    limiter.record_success(key)
+    assert limiter.snapshot()[key]["rate_factor"] == 0.55
+    assert limiter.snapshot()[key]["throttles"] == 1
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 import os
 
+from app.core.cache import cache
 from app.core.config import InstrumentConfig
+from app.core.quarantine import QuarantinedError
 from app.core.scheduler import _refresh_once_sync
 from app.db.migrations import upgrade_to_head
 from app.db.session import reset_database_engine
@@ -44,6 +47,14 @@ def _summary_item(item_id: str) -> SummaryItem:
     )
 
 
+async def _inflation_summary(items: list[InstrumentConfig]) -> tuple[list[SummaryItem], dict[str, str]]:
+    return [_summary_item(item.id) for item in items], {}
+
+
+async def _inflation_series(_instrument: InstrumentConfig, _range: str) -> list[SparkPoint]:
+    return [SparkPoint(t=datetime.now(timezone.utc), v=2.1)]
+
+
 def _setup_scheduler_db(monkeypatch, tmp_path) -> str:
     db_file = tmp_path / "scheduler-logging-test.db"
     monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{db_file}")
@@ -79,7 +90,7 @@ def test_scheduler_logs_structured_success(monkeypatch, tmp_path):
     )
     monkeypatch.setattr(
         "app.core.scheduler.fetch_inflation_summary_for_instruments",
-        lambda items: ([_summary_item(item.id) for item in items], {}),
+        _inflation_summary,
     )
     monkeypatch.setattr(
         "app.core.scheduler.fetch_market_series_for_instrument",
@@ -87,7 +98,7 @@ def test_scheduler_logs_structured_success(monkeypatch, tmp_path):
     )
     monkeypatch.setattr(
         "app.core.scheduler.fetch_inflation_series_for_instrument",
-        lambda _instrument, _range: [SparkPoint(t=datetime.now(timezone.utc), v=2.1)],
+        _inflation_series,
     )
 
     _refresh_once_sync()
@@ -128,7 +139,7 @@ def test_scheduler_logs_structured_series_failures(monkeypatch, tmp_path):
     )
     monkeypatch.setattr(
         "app.core.scheduler.fetch_inflation_summary_for_instruments",
-        lambda items: ([_summary_item(item.id) for item in items], {}),
+        _inflation_summary,
     )
 
     def _broken_market_series(_instrument, _range):
@@ -137,7 +148,7 @@ def test_scheduler_logs_structured_series_failures(monkeypatch, tmp_path):
     monkeypatch.setattr("app.core.scheduler.fetch_market_series_for_instrument", _broken_market_series)
     monkeypatch.setattr(
         "app.core.scheduler.fetch_inflation_series_for_instrument",
-        lambda _instrument, _range: [SparkPoint(t=datetime.now(timezone.utc), v=2.1)],
+        _inflation_series,
     )
 
     _refresh_once_sync()
@@ -155,3 +166,54 @@ def test_scheduler_logs_structured_series_failures(monkeypatch, tmp_path):
     reset_database_engine()
     if os.path.exists(db_file):
         os.remove(db_file)
+
+
+def test_scheduler_fetches_inflation_series_concurrently(monkeypatch, tmp_path):
+    db_file = _setup_scheduler_db(monkeypatch, tmp_path)
+    instruments = [
+        _instrument("inflation_us", "inflation", "CPIAUCSL"),
+        _instrument("inflation_se", "inflation", "SWECPI"),
+    ]
+    info_events: list[tuple[str, dict[str, object]]] = []
+    error_events: list[tuple[str, dict[str, object]]] = []
+    in_flight = {"now": 0, "peak": 0}
+    broken = RuntimeError("forced inflation error")
+
+    async def _series(instrument: InstrumentConfig, range_key: str) -> list[SparkPoint]:
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if instrument.id == "inflation_us" and range_key == "3m":
+            raise broken
+        if instrument.id == "inflation_se" and range_key != "1y":
+            raise QuarantinedError("quarantined")
+        return [SparkPoint(t=datetime.now(timezone.utc), v=2.1)]
+
+    monkeypatch.setattr("app.core.scheduler._log_info", lambda event, **fields: info_events.append((event, fields)))
+    monkeypatch.setattr(
+        "app.core.scheduler._log_exception",
+        lambda event, **fields: error_events.append((event, fields)),
+    )
+    monkeypatch.setattr("app.core.scheduler.load_instruments", lambda: instruments)
+    monkeypatch.setattr("app.core.scheduler.fetch_inflation_summary_for_instruments", _inflation_summary)
+    monkeypatch.setattr("app.core.scheduler.fetch_inflation_series_for_instrument", _series)
+
+    _refresh_once_sync()
+
+    # Both instruments x four ranges were in flight together.
+    assert in_flight["peak"] == 8
+    assert [(event, fields["instrument_id"], fields["range_key"], fields["exc_info"]) for event, fields in error_events] == [
+        ("scheduler.refresh.series_failed", "inflation_us", "3m", broken)
+    ]
+    quarantined = [fields for event, fields in info_events if event == "scheduler.refresh.series_quarantined"]
+    assert quarantined == [{"module": "inflation", "instrument_id": "inflation_se"}]
+    # The range that got through is published; the refused ones keep their persisted series.
+    assert cache.get("inflation_series:inflation_se:1y") is not None
+    assert cache.get("inflation_series:inflation_se:1m") is None
+    completion = [fields for event, fields in info_events if event == "scheduler.refresh.completed"][0]
+    assert completion["fail_count"] == 2
+
+    reset_database_engine()
+    if os.path.exists(db_file):
+        os.remove(db_file)
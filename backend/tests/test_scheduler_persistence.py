@@ -6,8 +6,9 @@ import os
 from app.core.config import InstrumentConfig
 from app.core.scheduler import _refresh_once_sync
 from app.db.migrations import upgrade_to_head
-from app.db.models import JobRun, ProviderEvent, QuoteSnapshot, SeriesPoint
+from app.db.models import JobRun, JobStage, ProviderEvent, QuoteSnapshot, SeriesPoint
 from app.db.session import reset_database_engine, session_scope
+from app.db.write_behind import write_queue
 from app.models.summary import SparkPoint, SummaryItem
 
 
@@ -45,6 +46,14 @@ def _summary_item(item_id: str) -> SummaryItem:
     )
 
 
+async def _inflation_summary(items: list[InstrumentConfig]) -> tuple[list[SummaryItem], dict[str, str]]:
+    return [_summary_item(item.id) for item in items], {}
+
+
+async def _inflation_series(_instrument: InstrumentConfig, _range: str) -> list[SparkPoint]:
+    return [SparkPoint(t=datetime.now(timezone.utc), v=2.1)]
+
+
 def test_refresh_persists_scheduler_data(monkeypatch, tmp_path):
     db_file = tmp_path / "scheduler-test.db"
     monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{db_file}")
@@ -64,7 +73,7 @@ def test_refresh_persists_scheduler_data(monkeypatch, tmp_path):
     )
     monkeypatch.setattr(
         "app.core.scheduler.fetch_inflation_summary_for_instruments",
-        lambda items: ([_summary_item(item.id) for item in items], {}),
+        _inflation_summary,
     )
     monkeypatch.setattr(
         "app.core.scheduler.fetch_market_series_for_instrument",
@@ -72,17 +81,60 @@ def test_refresh_persists_scheduler_data(monkeypatch, tmp_path):
     )
     monkeypatch.setattr(
         "app.core.scheduler.fetch_inflation_series_for_instrument",
-        lambda _instrument, _range: [SparkPoint(t=datetime.now(timezone.utc), v=2.1)],
+        _inflation_series,
     )
 
     _refresh_once_sync()
+    write_queue.flush()
 
     with session_scope() as session:
         assert session.query(JobRun).count() == 1
         assert session.query(ProviderEvent).count() >= 0
         assert session.query(QuoteSnapshot).count() == len(instruments)
         assert session.query(SeriesPoint).count() > 0
+        stage_names = {row.name for row in session.query(JobStage)}
+        assert {"config_load", "summary.commodities", "series.inflation", "persist.summary.mag7"} <= stage_names
 
     reset_database_engine()
     if os.path.exists(db_file):
         os.remove(db_file)
+
+
+def test_scheduler_stats_endpoint_reports_last_cycle(client, monkeypatch):
+    monkeypatch.setattr("app.core.scheduler.load_instruments", lambda: [_instrument("aapl", "mag7", "AAPL")])
+    monkeypatch.setattr(
+        "app.core.scheduler.fetch_market_summary_for_instruments",
+        lambda items: ([_summary_item(item.id) for item in items], {}),
+    )
+    monkeypatch.setattr("app.core.scheduler.write_queue.submit", lambda _label, _apply: True)
+
+    _refresh_once_sync()
+    _refresh_once_sync()
+
+    payload = client.get("/api/scheduler/stats").json()
+    assert payload["source"] == "memory"
+    assert payload["cycles"] == 2
+    assert "summary.mag7" in payload["last_cycle"]["stages"]
+    assert payload["stages"]["config_load"]["samples"] == 2
+    assert payload["cycle_duration_ms"]["p95"] >= payload["cycle_duration_ms"]["p50"]
+
+
+def test_running_cycle_is_not_reported_as_last_cycle(client, monkeypatch):
+    seen: list[dict] = []
+
+    def _summary(items):
+        # Runs mid-cycle: the stats must still describe only finished cycles.
+        seen.append(client.get("/api/scheduler/stats").json())
+        return [_summary_item(item.id) for item in items], {}
+
+    monkeypatch.setattr("app.core.scheduler.load_instruments", lambda: [_instrument("aapl", "mag7", "AAPL")])
+    monkeypatch.setattr("app.core.scheduler.fetch_market_summary_for_instruments", _summary)
+    monkeypatch.setattr("app.core.scheduler.write_queue.submit", lambda _label, _apply: True)
+
+    _refresh_once_sync()
+
+    assert seen[0]["cycles"] == 0
+    assert seen[0]["last_cycle"] is None
+    payload = client.get("/api/scheduler/stats").json()
+    assert payload["cycles"] == 1
+    assert payload["last_cycle"]["duration_ms"] is not None
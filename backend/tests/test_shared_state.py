@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from app.core.provider_monitor import ProviderMonitor
+from app.core.rate_limit import PRIORITY_BACKGROUND, SharedTokenBucketRateLimiter
+from app.core.shared_state import SharedStateStore
+
+
+def test_shared_limiter_enforces_one_budget_across_instances(tmp_path):
+    path = tmp_path / "shared.db"
+    worker_a = SharedTokenBucketRateLimiter(SharedStateStore(path))
+    worker_b = SharedTokenBucketRateLimiter(SharedStateStore(path))
+
+    granted = [
+        limiter.allow("yahoo_finance", max_calls=4, period_seconds=3600)
+        for limiter in (worker_a, worker_b, worker_a, worker_b, worker_a, worker_b)
+    ]
+    assert granted.count(True) == 4
+    assert worker_a.snapshot()["yahoo_finance"]["tokens"] < 1
+
+
+def test_shared_limiter_keeps_reserve_for_interactive_callers(tmp_path):
+    limiter = SharedTokenBucketRateLimiter(SharedStateStore(tmp_path / "shared.db"))
+    background = [
+        limiter.acquire("fred", max_calls=10, period_seconds=3600, timeout=0, priority=PRIORITY_BACKGROUND)
+        for _ in range(10)
+    ]
+    assert background.count(True) == 9
+    assert limiter.allow("fred", max_calls=10, period_seconds=3600) is True
+
+
+def test_shared_limiter_adapts_rate_for_all_workers(tmp_path):
+    path = tmp_path / "shared.db"
+    worker_a = SharedTokenBucketRateLimiter(SharedStateStore(path))
+    worker_b = SharedTokenBucketRateLimiter(SharedStateStore(path))
+    worker_a.allow("yahoo_finance", max_calls=10, period_seconds=60)
+    worker_a.record_throttle("yahoo_finance")
+    assert worker_b.snapshot()["yahoo_finance"]["rate_factor"] == 0.5
+
+
+def test_shared_provider_monitor_aggregates_workers(tmp_path):
+    path = tmp_path / "shared.db"
+    worker_a = ProviderMonitor(store=SharedStateStore(path))
+    worker_b = ProviderMonitor(store=SharedStateStore(path))
+    worker_a.record_attempt("fred")
+    worker_b.record_attempt("fred")
+    worker_b.record_failure("fred", "boom")
+
+    stats = worker_a.snapshot()["fred"]
+    assert stats["attempts"] == 2
+    assert stats["fail"] == 1
+    assert stats["last_error"] == "boom"
+    assert stats["retries"] == 0
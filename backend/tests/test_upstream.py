@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from threading import Event
+import time
+
+import httpx
+import pytest
+
+from app.core.cache import cache
+from app.core.config import instrument_registry
+from app.core.deadline import current_deadline, deadline_scope
+from app.core.rate_limit import rate_limiter
+from app.core.upstream import UpstreamExecutor, UpstreamTimeout, upstream_executor
+from app.main import app
+from app.models.summary import SparkPoint, SummaryItem
+
+
+def test_concurrent_fills_for_one_key_share_a_single_call():
+    executor = UpstreamExecutor(max_workers=4)
+    release = Event()
+    calls = []
+
+    def fill(value: int) -> int:
+        calls.append(value)
+        release.wait(2)
+        return value * 2
+
+    async def scenario() -> list[int]:
+        waiters = [asyncio.create_task(executor.run("key", fill, 21)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    try:
+        assert asyncio.run(scenario()) == [42] * 5
+    finally:
+        executor.shutdown()
+    assert calls == [21]
+    assert executor.stats()["fills"] == 1
+    assert executor.stats()["coalesced"] == 4
+    assert executor.stats()["in_flight"] == 0
+
+
+def test_fill_sees_caller_context_and_times_out():
+    executor = UpstreamExecutor(max_workers=1)
+    release = Event()
+
+    async def scenario() -> None:
+        with deadline_scope(30):
+            assert await executor.run("ctx", lambda: current_deadline() is not None)
+        with pytest.raises(UpstreamTimeout):
+            await executor.run("slow", release.wait, 5, timeout=0.05)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
+    assert executor.stats()["timeouts"] == 1
+
+
+def test_concurrent_coroutine_fills_share_a_single_task():
+    executor = UpstreamExecutor(max_workers=1)
+    calls = []
+
+    async def fill(value: int) -> int:
+        calls.append(current_deadline())
+        await asyncio.sleep(0.05)
+        return value * 2
+
+    async def scenario() -> list[int]:
+        with deadline_scope(30):
+            waiters = [asyncio.create_task(executor.run_async("key", fill, 21)) for _ in range(5)]
+        results = await asyncio.gather(*waiters)
+        with pytest.raises(UpstreamTimeout):
+            await executor.run_async("slow", asyncio.sleep, 5, timeout=0.05)
+        return results
+
+    assert asyncio.run(scenario()) == [42] * 5
+    assert len(calls) == 1 and calls[0] is not None
+    assert executor.stats()["fills"] == 2
+    assert executor.stats()["coalesced"] == 4
+    assert executor.stats()["timeouts"] == 1
+    assert executor._executor is None
+
+
+def test_series_routes_resolve_the_instrument_once_off_the_event_loop(client, monkeypatch):
+    lookups: list[bool] = []
+    original = instrument_registry.get
+
+    def tracking_get(instrument_id, module=None):
+        try:
+            asyncio.get_running_loop()
+            lookups.append(True)
+        except RuntimeError:
+            lookups.append(False)
+        return original(instrument_id, module)
+
+    async def fake_series(_instrument, _range):
+        return [SparkPoint(t=datetime.now(timezone.utc), v=2.0)]
+
+    monkeypatch.setattr(instrument_registry, "get", tracking_get)
+    monkeypatch.setattr("app.routes.inflation.fetch_series_for_instrument", fake_series)
+    cache.set("series:brent:1m", [SparkPoint(t=datetime.now(timezone.utc), v=80.0)], fetched_at=datetime.now(timezone.utc))
+
+    assert client.get("/api/commodities/series", params={"id": "brent", "range": "1m"}).status_code == 200
+    assert client.get("/api/inflation/series", params={"id": "inflation_se", "range": "1y"}).status_code == 200
+    assert client.get("/api/inflation/series", params={"id": "inflation_se", "range": "1y"}).json()["meta"]["cached"]
+
+    # One lookup per request, none of them on the event loop.
+    assert lookups == [False, False, False]
+
+
+def test_cache_hits_are_served_while_upstream_fills_are_blocked(monkeypatch):
+    release = Event()
+
+    def blocked_fetch(instruments):
+        release.wait(5)
+        return [SummaryItem(id=item.id, name=item.name_sv) for item in instruments], {}
+
+    monkeypatch.setattr("app.routes.commodities.fetch_summary_for_instruments", blocked_fetch)
+    cache.set("mag7_summary", [SummaryItem(id="aapl", name="Apple")], fetched_at=datetime.now(timezone.utc), module="mag7")
+
+    async def scenario() -> tuple[int, int, int]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            misses = [asyncio.create_task(client.get("/api/commodities/summary")) for _ in range(20)]
+            await asyncio.sleep(0.05)
+            hit = await asyncio.wait_for(client.get("/api/mag7/summary"), timeout=2)
+            release.set()
+            responses = await asyncio.gather(*misses)
+            return hit.status_code, len({response.status_code for response in responses}), responses[0].status_code
+
+    try:
+        assert asyncio.run(scenario()) == (200, 1, 200)
+    finally:
+        release.set()
+    assert upstream_executor.stats()["fills"] == 1
+    assert upstream_executor.stats()["coalesced"] == 19
+
+
+def test_upstream_timeout_maps_to_gateway_timeout(client, monkeypatch):
+    async def timing_out(*_args, **_kwargs):
+        raise UpstreamTimeout("Upstream fill for commodities_summary did not finish within 10s.")
+
+    monkeypatch.setattr(upstream_executor, "run", timing_out)
+    response = client.get("/api/commodities/summary")
+
+    assert response.status_code == 504
+    assert "did not finish" in response.json()["detail"]
+
+
+def test_slow_health_snapshot_does_not_block_cache_hits(monkeypatch):
+    release = Event()
+    original = rate_limiter.snapshot
+
+    def blocked_snapshot():
+        # Stands in for a shared-state snapshot waiting on a SQLite write lock.
+        release.wait(5)
+        return original()
+
+    monkeypatch.setattr(rate_limiter, "snapshot", blocked_snapshot)
+    cache.set("mag7_summary", [SummaryItem(id="aapl", name="Apple")], fetched_at=datetime.now(timezone.utc), module="mag7")
+
+    async def scenario() -> tuple[int, float, int]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            started = time.perf_counter()
+            health = asyncio.create_task(client.get("/api/health"))
+            await asyncio.sleep(0.05)
+            hit = await client.get("/api/mag7/summary")
+            elapsed = time.perf_counter() - started
+            release.set()
+            return hit.status_code, elapsed, (await health).status_code
+
+    try:
+        status, elapsed, health_status = asyncio.run(scenario())
+        assert (status, health_status) == (200, 200)
+        assert elapsed < 1
+    finally:
+        release.set()
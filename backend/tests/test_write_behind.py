@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from threading import Event
+
+from app.db.migrations import upgrade_to_head
+from app.db.models import JobRun
+from app.db.repository import create_job_run
+from app.db.session import reset_database_engine, session_scope
+from app.db import write_behind
+from app.db.write_behind import WriteBehindQueue
+
+
+def _setup_db(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("APP_DATABASE_URL", f"sqlite:///{tmp_path / 'write-behind-test.db'}")
+    reset_database_engine()
+    upgrade_to_head()
+
+
+def _add_job(name: str):
+    return lambda session: create_job_run(session, name, datetime.now(timezone.utc))
+
+
+def test_write_behind_flushes_batched_writes(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    queue = WriteBehindQueue(max_pending=10, batch_size=2)
+    queue.start()
+    try:
+        for index in range(5):
+            assert queue.submit(f"job-{index}", _add_job(f"job-{index}")) is True
+        assert queue.flush(timeout=5) is True
+    finally:
+        queue.stop()
+
+    with session_scope() as session:
+        assert session.query(JobRun).count() == 5
+    stats = queue.stats()
+    assert stats["written"] == 5
+    assert stats["pending"] == 0
+    assert stats["running"] is False
+    reset_database_engine()
+
+
+def test_write_behind_isolates_failing_write(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    queue = WriteBehindQueue(max_pending=10, batch_size=10)
+
+    def _broken(_session):
+        raise RuntimeError("forced write error")
+
+    queue.submit("ok-1", _add_job("ok-1"))
+    queue.submit("broken", _broken)
+    queue.submit("ok-2", _add_job("ok-2"))
+    queue.flush()
+
+    with session_scope() as session:
+        assert session.query(JobRun).count() == 2
+    stats = queue.stats()
+    assert stats["failed_batches"] == 1
+    assert stats["failed"] == 1
+    assert stats["written"] == 2
+    reset_database_engine()
+
+
+def test_write_behind_drops_when_full():
+    queue = WriteBehindQueue(max_pending=1, batch_size=1, put_timeout_seconds=0.01)
+    assert queue.submit("first", lambda _session: None) is True
+    assert queue.submit("second", lambda _session: None) is False
+    stats = queue.stats()
+    assert stats["dropped"] == 1
+    assert stats["blocked_submits"] == 1
+    assert stats["high_water"] == 1
+    queue.clear()
+
+
+def test_write_behind_stop_timeout_leaves_the_writer_alone(monkeypatch, tmp_path):
+    _setup_db(monkeypatch, tmp_path)
+    warnings: list[tuple[str, dict]] = []
+    monkeypatch.setattr(write_behind.logger, "warning", lambda event, extra: warnings.append((event, extra)))
+    queue = WriteBehindQueue(max_pending=10, batch_size=1)
+    started = Event()
+    release = Event()
+    applied: list[str] = []
+
+    def _slow(_session):
+        started.set()
+        release.wait(5)
+        applied.append("slow")
+
+    queue.start()
+    queue.submit("slow", _slow)
+    assert started.wait(5)
+    queue.submit("next", lambda _session: applied.append("next"))
+
+    queue.stop(timeout=0.05)
+
+    assert applied == []
+    assert queue.stats()["running"] is True
+    assert warnings == [("write_behind.stop_timeout", {"event": "write_behind.stop_timeout", "pending": 1})]
+
+    release.set()
+    assert queue.flush(timeout=5) is True
+    queue.stop()
+    assert applied == ["slow", "next"]
+    reset_database_engine()
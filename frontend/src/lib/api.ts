@@ -16,6 +16,7 @@ export type SummaryItem = {
   y1_pct: number | null;
   timestamp_local: string | null;
   is_stale: boolean;
+  stale_reason?: "provider_error" | "quarantined" | null;
   sparkline: SparkPoint[];
 };
 
@@ -23,7 +24,7 @@ export type ApiMeta = {
   source: string;
   cached: boolean;
   fetched_at: string;
-  stale_reason?: "none" | "global_threshold" | "provider_error" | "no_recent_success";
+  stale_reason?: "none" | "global_threshold" | "provider_error" | "quarantined" | "no_recent_success";
   age_seconds?: number;
 };
 